@@ -0,0 +1,34 @@
+"""Download tiktoken encoding files into the vendored tokenizer cache directory."""
+
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+# Import after path is set
+from src.services.tokenizer_service import tokenizer_service
+
+
+def vendor_tokenizer():
+    """Populate tokenizer_cache_dir so runtime never needs network access."""
+    print("🔤 Vendoring tiktoken encodings")
+    print("=" * 40)
+
+    if not tokenizer_service.cache_dir:
+        print("❌ TOKENIZER_CACHE_DIR is not set - nothing to vendor into")
+        return False
+
+    Path(tokenizer_service.cache_dir).mkdir(parents=True, exist_ok=True)
+    print(f"📁 Cache directory: {tokenizer_service.cache_dir}")
+
+    results = tokenizer_service.preload()
+    for name, loaded in results.items():
+        print(f"{'✅' if loaded else '❌'} {name}")
+
+    return all(results.values())
+
+
+if __name__ == "__main__":
+    sys.exit(0 if vendor_tokenizer() else 1)
@@ -5,7 +5,7 @@ Handles CRUD operations for contacts, audiences, and their relationships
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update, delete, func
+from sqlalchemy import select, update, delete, func, literal_column
 from sqlalchemy.orm import selectinload
 from typing import List, Optional
 from pydantic import BaseModel, Field
@@ -13,7 +13,7 @@ from datetime import datetime
 import logging
 
 from src.core.database import get_db
-from src.models.audiences import AdvisorContact, AdvisorAudience, audience_contacts
+from src.models.audiences import AdvisorContact, AdvisorAudience, audience_contacts, CONTACT_SEARCH_LABEL_SQL
 
 logger = logging.getLogger(__name__)
 
@@ -59,6 +59,14 @@ class ContactResponse(BaseModel):
     class Config:
         from_attributes = True
 
+class ContactSuggestion(BaseModel):
+    id: int
+    first_name: str
+    last_name: str
+    company: Optional[str]
+    email: Optional[str]
+    score: float
+
 class AudienceCreate(BaseModel):
     name: str = Field(..., min_length=1, max_length=255)
     description: Optional[str] = None
@@ -180,6 +188,57 @@ async def list_contacts(
         logger.error(f"Full traceback: {traceback.format_exc()}")
         raise HTTPException(status_code=500, detail=f"Error retrieving contacts: {str(e)}")
 
+@router.get("/contacts/autocomplete", response_model=List[ContactSuggestion], summary="Autocomplete contacts")
+async def autocomplete_contacts(
+    q: str = Query(..., min_length=1, max_length=100, description="Partial name or company"),
+    advisor_id: str = Query("demo_advisor_001", description="Advisor ID to filter contacts"),
+    limit: int = Query(10, ge=1, le=50, description="Maximum number of suggestions"),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Suggest contacts whose name or company matches a partial query.
+    
+    - **q**: Text typed so far
+    - **limit**: Maximum number of suggestions, most similar first
+    
+    Results are read in trigram word-similarity order from the
+    (advisor_id, label) GiST index.
+    """
+    try:
+        # Must match the indexed expression exactly for the KNN index scan
+        label = literal_column(f"({CONTACT_SEARCH_LABEL_SQL})")
+        distance = label.op('<->>')(q)
+        
+        query = select(
+            AdvisorContact.id,
+            AdvisorContact.first_name,
+            AdvisorContact.last_name,
+            AdvisorContact.company,
+            AdvisorContact.email,
+            distance.label('distance')
+        ).where(
+            AdvisorContact.advisor_id == advisor_id,
+            label.op('%>')(q)
+        ).order_by(distance).limit(limit)
+        
+        result = await db.execute(query)
+        
+        return [
+            ContactSuggestion(
+                id=row.id,
+                first_name=row.first_name,
+                last_name=row.last_name,
+                company=row.company,
+                email=row.email,
+                score=round(1 - float(row.distance), 4)
+            )
+            for row in result.all()
+        ]
+        
+    except Exception as e:
+        logger.error(f"Error autocompleting contacts: {e}")
+        raise HTTPException(status_code=500, detail=f"Error autocompleting contacts: {str(e)}")
+
 @router.get("/contacts/{contact_id}", response_model=ContactResponse, summary="Get a specific contact")
 async def get_contact(
     contact_id: int,
@@ -19,6 +19,7 @@ from datetime import datetime
 from src.services.compliance_service import compliance_service
 from src.services.token_manager import TokenValidationError
 from src.services.warren import enhanced_warren_service
+from src.services.llm_scheduler import LLMPriority
 from src.middleware.compliance_auth import (
     ComplianceAuthContext,
     validate_token_from_path_param,
@@ -305,7 +306,9 @@ async def analyze_violation_with_ai(
             user_request=analysis_prompt,
             content_type="compliance_analysis",
             audience_type="compliance_officer",
-            session_id=f"compliance_{auth_context.content_id}"
+            user_id=auth_context.cco_email,
+            session_id=f"compliance_{auth_context.content_id}",
+            llm_priority=LLMPriority.COMPLIANCE_REVIEW
         )
         
         # Parse Warren's response into structured format
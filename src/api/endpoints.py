@@ -1,12 +1,17 @@
 from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import Optional
+from typing import Optional, Tuple
+import json
 import logging
 from src.services.claude_service import claude_service
 from src.services.warren_database_service import warren_db_service
 from src.services.warren import enhanced_warren_service
+from src.services.warren.semantic_response_cache import semantic_response_cache
 from src.services.embedding_service import embedding_service
 from src.services.vector_search_service import vector_search_service
+from src.services.search_result_cache import search_result_cache
+from src.services.vector_index_service import vector_index_service
 from src.services.content_vectorization_service import content_vectorization_service
 from src.services.content_management_service import content_management_service
 from src.services.youtube_transcript_service import youtube_transcript_service
@@ -31,6 +36,24 @@ async def test_claude():
     return result
 
 
+@router.get("/claude/prompt-cache-stats")
+async def get_claude_prompt_cache_stats():
+    """Get Claude prompt cache hit and cached-token metrics."""
+    try:
+        return {"status": "success", "prompt_cache": claude_service.get_prompt_cache_stats()}
+    except Exception as e:
+        return {"status": "error", "error": str(e)}
+
+
+@router.get("/claude/scheduler-stats")
+async def get_claude_scheduler_stats():
+    """Get Claude call scheduler queue depth and wait times per priority class."""
+    try:
+        return {"status": "success", "scheduler": claude_service.get_scheduler_stats()}
+    except Exception as e:
+        return {"status": "error", "error": str(e)}
+
+
 @router.get("/test-database")
 async def test_database():
     """Test database connection"""
@@ -79,6 +102,58 @@ async def warren_generate_content_v2(request: dict):
 
 # ===== VECTOR SEARCH ENDPOINTS =====
 
+async def _load_youtube_context(youtube_url: Optional[str]) -> Tuple[Optional[dict], Optional[dict]]:
+    """Fetch a YouTube transcript as Warren context. Returns (youtube_context, error_response)."""
+    if not youtube_url:
+        return None, None
+    
+    try:
+        logger.info(f"Processing YouTube URL: {youtube_url}")
+        transcript_result = await youtube_transcript_service.get_transcript_from_url(youtube_url)
+        
+        if transcript_result["success"]:
+            # Create context from transcript
+            transcript_text = transcript_result["transcript"]
+            metadata = transcript_result.get("metadata", {})
+            stats = transcript_result.get("stats", {})
+            
+            # DEBUG: Log transcript info
+            logger.info(f"YouTube transcript fetched: {len(transcript_text)} characters")
+            logger.info(f"Transcript preview: {transcript_text[:200]}...")
+            
+            youtube_context = {
+                "transcript": transcript_text,
+                "video_url": youtube_url,
+                "video_id": transcript_result.get("video_id"),
+                "metadata": metadata,
+                "stats": stats
+            }
+            
+            logger.info(f"YouTube transcript processed: {stats.get('character_count', 0)} characters")
+            return youtube_context, None
+        
+        logger.warning(f"YouTube transcript failed: {transcript_result['error']}")
+        return None, {
+            "status": "error",
+            "error": f"Could not process YouTube video: {transcript_result['error']}",
+            "youtube_url": youtube_url
+        }
+        
+    except Exception as youtube_error:
+        logger.error(f"YouTube processing exception: {str(youtube_error)}")
+        return None, {
+            "status": "error", 
+            "error": f"YouTube processing failed: {str(youtube_error)}",
+            "youtube_url": youtube_url
+        }
+
+
+def _sse_event(event: dict) -> str:
+    """Frame a Warren stream event as a Server-Sent Event."""
+    payload = {key: value for key, value in event.items() if key != "event"}
+    return f"event: {event['event']}\ndata: {json.dumps(payload, default=str)}\n\n"
+
+
 @router.post("/warren/generate-v3")
 async def warren_generate_content_v3(request: dict):
     """
@@ -109,46 +184,9 @@ async def warren_generate_content_v3(request: dict):
     
     try:
         # NEW: Process YouTube URL if provided
-        youtube_context = None
-        if youtube_url:
-            try:
-                logger.info(f"Processing YouTube URL: {youtube_url}")
-                transcript_result = await youtube_transcript_service.get_transcript_from_url(youtube_url)
-                
-                if transcript_result["success"]:
-                    # Create context from transcript
-                    transcript_text = transcript_result["transcript"]
-                    metadata = transcript_result.get("metadata", {})
-                    stats = transcript_result.get("stats", {})
-                    
-                    # DEBUG: Log transcript info
-                    logger.info(f"YouTube transcript fetched: {len(transcript_text)} characters")
-                    logger.info(f"Transcript preview: {transcript_text[:200]}...")
-                    
-                    youtube_context = {
-                        "transcript": transcript_text,
-                        "video_url": youtube_url,
-                        "video_id": transcript_result.get("video_id"),
-                        "metadata": metadata,
-                        "stats": stats
-                    }
-                    
-                    logger.info(f"YouTube transcript processed: {stats.get('character_count', 0)} characters")
-                else:
-                    logger.warning(f"YouTube transcript failed: {transcript_result['error']}")
-                    return {
-                        "status": "error",
-                        "error": f"Could not process YouTube video: {transcript_result['error']}",
-                        "youtube_url": youtube_url
-                    }
-                    
-            except Exception as youtube_error:
-                logger.error(f"YouTube processing exception: {str(youtube_error)}")
-                return {
-                    "status": "error", 
-                    "error": f"YouTube processing failed: {str(youtube_error)}",
-                    "youtube_url": youtube_url
-                }
+        youtube_context, youtube_error = await _load_youtube_context(youtube_url)
+        if youtube_error:
+            return youtube_error
         
         # Use the enhanced Warren service with refinement support and YouTube context
         result = await enhanced_warren_service.generate_content_with_enhanced_context(
@@ -177,6 +215,69 @@ async def warren_generate_content_v3(request: dict):
         return {"status": "error", "error": str(e)}
 
 
+@router.post("/warren/generate-v3/stream")
+async def warren_generate_content_v3_stream(request: dict):
+    """
+    Warren V3 generation streamed as Server-Sent Events
+    
+    Same request body as /warren/generate-v3. Events:
+    - retrieval_complete: search finished (result counts, strategy)
+    - context_assembled: prompt built by the selected generation strategy
+    - token: generated text as it arrives
+    - complete: the full /warren/generate-v3 response
+    - error: generation failed
+    """
+    user_request = request.get("request", "")
+    content_type = request.get("content_type", "linkedin_post")
+    audience_type = request.get("audience_type", "general_education")
+    youtube_url = request.get("youtube_url")
+    
+    if not user_request:
+        return {"error": "Content request is required"}
+    
+    youtube_context, youtube_error = await _load_youtube_context(youtube_url)
+    if youtube_error:
+        return youtube_error
+    
+    async def event_stream():
+        try:
+            async for event in enhanced_warren_service.stream_content_with_enhanced_context(
+                user_request=user_request,
+                content_type=content_type,
+                audience_type=audience_type,
+                user_id=request.get("user_id"),
+                session_id=request.get("session_id"),
+                current_content=request.get("current_content"),
+                is_refinement=request.get("is_refinement", False),
+                youtube_context=youtube_context,
+                use_conversation_context=True
+            ):
+                if event["event"] == "complete" and youtube_context:
+                    event["response"]["youtube_info"] = {
+                        "url": youtube_url,
+                        "video_id": youtube_context["video_id"],
+                        "transcript_stats": youtube_context["stats"]
+                    }
+                yield _sse_event(event)
+        except Exception as e:
+            logger.error(f"Warren stream failed: {str(e)}")
+            yield _sse_event({"event": "error", "error": str(e)})
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.get("/warren/response-cache")
+async def get_warren_response_cache_stats():
+    """Get Warren semantic response cache hit-rate metrics."""
+    try:
+        return {"status": "success", "response_cache": semantic_response_cache.get_stats()}
+    except Exception as e:
+        return {"status": "error", "error": str(e)}
+
+
 @router.post("/embeddings/test")
 async def test_embedding_service():
     """Test OpenAI embedding service connection and functionality."""
@@ -187,6 +288,19 @@ async def test_embedding_service():
         return {"status": "error", "error": str(e)}
 
 
+@router.get("/embeddings/cache-stats")
+async def get_embedding_cache_stats():
+    """Get embedding cache hit/miss and request batching metrics."""
+    try:
+        return {
+            "status": "success",
+            "embedding_cache": embedding_service.get_cache_stats(),
+            "request_batching": embedding_service.get_batching_stats()
+        }
+    except Exception as e:
+        return {"status": "error", "error": str(e)}
+
+
 @router.post("/embeddings/vectorize-content")
 async def vectorize_existing_content(force_update: bool = False):
     """
@@ -340,6 +454,81 @@ async def get_vector_search_stats():
         return {"status": "error", "error": str(e)}
 
 
+@router.get("/vector-search/indexes")
+async def get_vector_index_report():
+    """Report ANN indexes (HNSW / IVFFlat) on all embedding columns."""
+    try:
+        return await vector_index_service.get_index_report()
+    except Exception as e:
+        return {"status": "error", "error": str(e)}
+
+
+@router.post("/vector-search/indexes/{target}")
+async def create_vector_index(
+    target: str,
+    method: Optional[str] = Query(None, description="hnsw or ivfflat"),
+    m: Optional[int] = Query(None, description="HNSW max connections per layer"),
+    ef_construction: Optional[int] = Query(None, description="HNSW build candidate list size"),
+    lists: Optional[int] = Query(None, description="IVFFlat number of lists")
+):
+    """
+    Create an ANN index on an embedding column.
+    Target is 'marketing_content' or 'compliance_rules'.
+    """
+    try:
+        return await vector_index_service.create_index(
+            target, method=method, m=m, ef_construction=ef_construction, lists=lists
+        )
+    except Exception as e:
+        return {"status": "error", "error": str(e)}
+
+
+@router.post("/vector-search/indexes/{target}/rebuild")
+async def rebuild_vector_index(
+    target: str,
+    method: Optional[str] = Query(None, description="hnsw or ivfflat"),
+    m: Optional[int] = Query(None, description="HNSW max connections per layer"),
+    ef_construction: Optional[int] = Query(None, description="HNSW build candidate list size"),
+    lists: Optional[int] = Query(None, description="IVFFlat number of lists")
+):
+    """
+    Rebuild an ANN index. Passing new build parameters drops and recreates it.
+    """
+    try:
+        return await vector_index_service.rebuild_index(
+            target, method=method, m=m, ef_construction=ef_construction, lists=lists
+        )
+    except Exception as e:
+        return {"status": "error", "error": str(e)}
+
+
+@router.get("/vector-search/memory-index")
+async def get_vector_memory_index_stats():
+    """Report the in-process marketing content vector index."""
+    try:
+        return vector_search_service.get_memory_index_stats()
+    except Exception as e:
+        return {"status": "error", "error": str(e)}
+
+
+@router.get("/vector-search/result-cache")
+async def get_search_result_cache_stats():
+    """Get search result cache hit-rate metrics."""
+    try:
+        return {"status": "success", "search_result_cache": search_result_cache.get_stats()}
+    except Exception as e:
+        return {"status": "error", "error": str(e)}
+
+
+@router.post("/vector-search/memory-index/reload")
+async def reload_vector_memory_index():
+    """Reload the in-process marketing content vector index from the database."""
+    try:
+        return await vector_search_service.load_memory_index()
+    except Exception as e:
+        return {"status": "error", "error": str(e)}
+
+
 # ===== CONTENT MANAGEMENT CRUD ENDPOINTS =====
 
 @router.get("/content")
@@ -436,6 +625,28 @@ async def get_content_statistics():
         return {"status": "error", "error": str(e)}
 
 
+@router.get("/content/autocomplete")
+async def autocomplete_content_titles(
+    q: str = Query(..., min_length=1, max_length=200, description="Partial content title"),
+    limit: int = Query(10, ge=1, le=50, description="Maximum number of suggestions"),
+    approval_status: Optional[str] = Query(None, description="Only suggest content with this approval status")
+):
+    """Suggest marketing content titles matching a partial query (trigram similarity)."""
+    try:
+        approval_status_enum = None
+        if approval_status:
+            try:
+                approval_status_enum = ApprovalStatus(approval_status.upper())
+            except ValueError:
+                return {"status": "error", "error": f"Invalid approval_status: {approval_status}"}
+        
+        return await content_management_service.autocomplete_titles(
+            q, limit=limit, approval_status=approval_status_enum
+        )
+    except Exception as e:
+        return {"status": "error", "error": str(e)}
+
+
 @router.post("/content")
 async def create_content(request: dict):
     """
@@ -10,7 +10,12 @@ logger = logging.getLogger(__name__)
 engine = create_async_engine(
     settings.database_url,
     echo=settings.debug,  # Log SQL queries in debug mode
-    future=True
+    future=True,
+    # Parameterized queries (e.g. pgvector similarity searches) keep a constant
+    # statement text, so asyncpg can reuse prepared statements per connection
+    connect_args={
+        "prepared_statement_cache_size": settings.database_prepared_statement_cache_size
+    }
 )
 
 # Create async session factory
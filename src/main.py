@@ -5,6 +5,10 @@ from src.api.endpoints import router
 from src.api.advisor_workflow_endpoints import advisor_router
 from src.api.audience_endpoints import router as audience_router
 from src.api.compliance_endpoints import compliance_router
+from src.services.tokenizer_service import tokenizer_service
+from src.services.vector_search_service import vector_search_service
+from src.services.claude_service import claude_service
+import asyncio
 import logging
 
 # Configure logging
@@ -34,6 +38,25 @@ app.include_router(advisor_router, prefix=settings.api_v1_str)  # Advisor workfl
 app.include_router(audience_router, prefix=settings.api_v1_str)  # Audience CRUD endpoints
 app.include_router(compliance_router, prefix=settings.api_v1_str)  # NEW: Compliance portal endpoints
 
+@app.on_event("startup")
+async def preload_tokenizer():
+    """Load tiktoken encodings once at startup instead of on the first request."""
+    await asyncio.to_thread(tokenizer_service.preload)
+
+
+@app.on_event("startup")
+async def load_vector_memory_index():
+    """Warm the in-process marketing content index when it is enabled."""
+    if settings.vector_memory_index_enabled:
+        await vector_search_service.load_memory_index()
+
+
+@app.on_event("shutdown")
+async def close_claude_client():
+    """Release pooled Anthropic connections."""
+    await claude_service.close()
+
+
 # Root endpoint
 @app.get("/")
 async def root():
@@ -5,6 +5,8 @@ This package contains database migrations for the compliance portal.
 Migration files:
 - advisor_content_compliance_fields.py: Adds compliance fields to advisor_content table
 - create_compliance_tables.py: Creates new compliance portal tables  
+- add_marketing_content_search_vector.py: Adds full-text search column and GIN index to marketing_content
+- create_trigram_indexes.py: Creates pg_trgm indexes for substring and autocomplete search
 - sample_data_compliance.py: Creates sample data for testing
 
 Usage:
@@ -0,0 +1,55 @@
+# Migration: Add Full-Text Search Vector to Marketing Content
+"""
+Migration script to add a generated tsvector column to marketing_content and
+index it with GIN, so keyword search uses a ranked index scan instead of
+unindexed LIKE '%...%' predicates.
+
+The document weights title (A), tags (B) and content_text (C); see
+MARKETING_CONTENT_SEARCH_DOCUMENT in src.models.refactored_database.
+
+Usage:
+    python -m src.migrations.add_marketing_content_search_vector
+"""
+
+from sqlalchemy import text
+from src.core.database import engine
+from src.models.refactored_database import MARKETING_CONTENT_SEARCH_DOCUMENT
+import logging
+
+logger = logging.getLogger(__name__)
+
+MIGRATION_SQL = [
+    # Generated column is filled for existing rows and maintained by Postgres on write
+    f"""
+    ALTER TABLE marketing_content
+    ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS ({MARKETING_CONTENT_SEARCH_DOCUMENT}) STORED
+    """,
+]
+
+INDEX_SQL = [
+    "CREATE INDEX IF NOT EXISTS idx_marketing_content_search_vector ON marketing_content USING gin(search_vector)",
+]
+
+async def add_marketing_content_search_vector():
+    """
+    Add the full-text search column and GIN index to marketing_content.
+    Safe to run multiple times - uses IF NOT EXISTS clauses.
+    """
+    async with engine.begin() as conn:
+        logger.info("Starting marketing_content search vector migration...")
+        
+        for i, sql_statement in enumerate(MIGRATION_SQL + INDEX_SQL, 1):
+            try:
+                await conn.execute(text(sql_statement))
+                logger.info(f"✅ Migration step {i}/{len(MIGRATION_SQL) + len(INDEX_SQL)} completed")
+            except Exception as e:
+                logger.error(f"❌ Migration step {i} failed: {e}")
+                raise
+        
+        logger.info("🎉 Marketing content search vector migration completed successfully!")
+
+if __name__ == "__main__":
+    import asyncio
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(add_marketing_content_search_vector())
@@ -0,0 +1,71 @@
+# Migration: Create Trigram Indexes
+"""
+Migration script to create pg_trgm indexes for substring and autocomplete search.
+
+GIN (gin_trgm_ops) indexes serve the ILIKE '%...%' filters in the content
+admin list and contact list. GiST (gist_trgm_ops) indexes serve autocomplete,
+where the top N suggestions are read in word-similarity order straight from
+the index (KNN scan), keeping lookups in the low milliseconds on large tables.
+
+Requires the pg_trgm and btree_gist contrib extensions.
+
+Usage:
+    python -m src.migrations.create_trigram_indexes
+"""
+
+from sqlalchemy import text
+from src.core.database import engine
+from src.models.audiences import CONTACT_SEARCH_LABEL_SQL
+import logging
+
+logger = logging.getLogger(__name__)
+
+EXTENSION_SQL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    # Lets the contact autocomplete index lead with the advisor_id equality column
+    "CREATE EXTENSION IF NOT EXISTS btree_gist",
+]
+
+# Substring search (ILIKE '%term%')
+INDEX_SQL = [
+    "CREATE INDEX IF NOT EXISTS idx_marketing_content_title_trgm ON marketing_content USING gin(title gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS idx_marketing_content_content_text_trgm ON marketing_content USING gin(content_text gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS idx_marketing_content_tags_trgm ON marketing_content USING gin(tags gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS idx_advisor_contacts_first_name_trgm ON advisor_contacts USING gin(first_name gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS idx_advisor_contacts_last_name_trgm ON advisor_contacts USING gin(last_name gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS idx_advisor_contacts_company_trgm ON advisor_contacts USING gin(company gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS idx_advisor_contacts_email_trgm ON advisor_contacts USING gin(email gin_trgm_ops)",
+]
+
+# Autocomplete (ORDER BY column <->> term LIMIT n)
+AUTOCOMPLETE_INDEX_SQL = [
+    "CREATE INDEX IF NOT EXISTS idx_marketing_content_title_trgm_gist ON marketing_content USING gist(title gist_trgm_ops)",
+    f"""
+    CREATE INDEX IF NOT EXISTS idx_advisor_contacts_label_trgm_gist
+    ON advisor_contacts USING gist(advisor_id, ({CONTACT_SEARCH_LABEL_SQL}) gist_trgm_ops)
+    """,
+]
+
+async def create_trigram_indexes():
+    """
+    Create pg_trgm indexes for content and contact search.
+    Safe to run multiple times - uses IF NOT EXISTS clauses.
+    """
+    async with engine.begin() as conn:
+        logger.info("Starting trigram index creation...")
+        
+        statements = EXTENSION_SQL + INDEX_SQL + AUTOCOMPLETE_INDEX_SQL
+        for i, sql_statement in enumerate(statements, 1):
+            try:
+                await conn.execute(text(sql_statement))
+                logger.info(f"✅ Migration step {i}/{len(statements)} completed")
+            except Exception as e:
+                logger.error(f"❌ Migration step {i} failed: {e}")
+                raise
+        
+        logger.info("🎉 Trigram indexes created successfully!")
+
+if __name__ == "__main__":
+    import asyncio
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(create_trigram_indexes())
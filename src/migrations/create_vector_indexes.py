@@ -0,0 +1,56 @@
+# Migration: Create Vector Indexes
+"""
+Migration script to create ANN indexes on pgvector embedding columns.
+Replaces brute-force similarity scans with HNSW (default) or IVFFlat index scans.
+
+Indexes created:
+- marketing_content.embedding (vector_cosine_ops)
+- compliance_rules.embedding (vector_cosine_ops)
+- marketing_content.embedding partial indexes over APPROVED rows: one for all
+  content types and one per content type (VECTOR_PARTIAL_INDEXES_ENABLED)
+
+Index method and build parameters come from settings
+(VECTOR_INDEX_METHOD, VECTOR_INDEX_HNSW_M, VECTOR_INDEX_HNSW_EF_CONSTRUCTION,
+VECTOR_INDEX_IVFFLAT_LISTS). HNSW requires pgvector >= 0.5.0.
+
+Usage:
+    python -m src.migrations.create_vector_indexes
+"""
+
+import logging
+from config.settings import settings
+from src.services.vector_index_service import vector_index_service, VECTOR_INDEX_TARGETS
+
+logger = logging.getLogger(__name__)
+
+async def create_vector_indexes():
+    """
+    Create ANN indexes for all embedding columns.
+    Safe to run multiple times - existing indexes are left untouched.
+    """
+    logger.info("Starting vector index creation...")
+    
+    for target in VECTOR_INDEX_TARGETS:
+        result = await vector_index_service.create_index(target)
+        
+        if result["status"] != "success":
+            logger.error(f"❌ Failed to create vector index for {target}: {result['error']}")
+            raise RuntimeError(result["error"])
+        
+        logger.info(f"✅ Index '{result['index_name']}' ready ({result['method']})")
+    
+    if settings.vector_partial_indexes_enabled:
+        result = await vector_index_service.create_partial_indexes()
+        
+        if result["status"] != "success":
+            logger.error(f"❌ Failed to create partial vector indexes: {result['error']}")
+            raise RuntimeError(result["error"])
+        
+        logger.info(f"✅ {len(result['index_names'])} partial indexes ready ({result['method']})")
+    
+    logger.info("🎉 All vector indexes created successfully!")
+
+if __name__ == "__main__":
+    import asyncio
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(create_vector_indexes())
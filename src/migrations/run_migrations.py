@@ -6,7 +6,10 @@ This ensures database schema is properly set up for development and testing.
 Migration Order:
 1. Add compliance fields to advisor_content table
 2. Create new compliance tables
-3. Create sample data for testing
+3. Create vector indexes on embedding columns
+4. Add full-text search vector to marketing_content
+5. Create trigram indexes for substring and autocomplete search
+6. Create sample data for testing
 
 Usage:
     python -m src.migrations.run_migrations
@@ -18,6 +21,9 @@ import logging
 # Import migration functions using clean file names
 from src.migrations.advisor_content_compliance_fields import migrate_advisor_content_compliance_fields
 from src.migrations.create_compliance_tables import create_compliance_tables
+from src.migrations.create_vector_indexes import create_vector_indexes
+from src.migrations.add_marketing_content_search_vector import add_marketing_content_search_vector
+from src.migrations.create_trigram_indexes import create_trigram_indexes
 from src.migrations.seed_data.seed_database import seed_database
 
 # Set up logging
@@ -44,11 +50,26 @@ async def run_all_migrations(include_seed_data=False):
         await create_compliance_tables()
         logger.info("✅ Step 2 completed successfully!")
         
-        # Optional Step 3: Seed sample data
+        # Migration 3: Create vector indexes
+        logger.info("📝 Step 3: Creating vector indexes on embedding columns...")
+        await create_vector_indexes()
+        logger.info("✅ Step 3 completed successfully!")
+        
+        # Migration 4: Full-text search vector
+        logger.info("📝 Step 4: Adding full-text search vector to marketing_content...")
+        await add_marketing_content_search_vector()
+        logger.info("✅ Step 4 completed successfully!")
+        
+        # Migration 5: Trigram indexes
+        logger.info("📝 Step 5: Creating trigram indexes for substring and autocomplete search...")
+        await create_trigram_indexes()
+        logger.info("✅ Step 5 completed successfully!")
+        
+        # Optional Step 6: Seed sample data
         if include_seed_data:
-            logger.info("🌱 Step 3: Seeding database with sample data...")
+            logger.info("🌱 Step 6: Seeding database with sample data...")
             await seed_database()
-            logger.info("✅ Step 3 completed successfully!")
+            logger.info("✅ Step 6 completed successfully!")
         
         logger.info("=" * 60)
         logger.info("🎉 ALL MIGRATIONS COMPLETED SUCCESSFULLY!")
@@ -85,6 +106,21 @@ async def run_migrations_only():
         await create_compliance_tables()
         logger.info("✅ Step 2 completed successfully!")
         
+        # Migration 3: Create vector indexes
+        logger.info("📝 Step 3: Creating vector indexes on embedding columns...")
+        await create_vector_indexes()
+        logger.info("✅ Step 3 completed successfully!")
+        
+        # Migration 4: Full-text search vector
+        logger.info("📝 Step 4: Adding full-text search vector to marketing_content...")
+        await add_marketing_content_search_vector()
+        logger.info("✅ Step 4 completed successfully!")
+        
+        # Migration 5: Trigram indexes
+        logger.info("📝 Step 5: Creating trigram indexes for substring and autocomplete search...")
+        await create_trigram_indexes()
+        logger.info("✅ Step 5 completed successfully!")
+        
         logger.info("=" * 60)
         logger.info("🎉 SCHEMA MIGRATIONS COMPLETED SUCCESSFULLY!")
         logger.info("📊 Database schema is ready for compliance portal")
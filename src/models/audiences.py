@@ -9,6 +9,9 @@ from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from src.models.refactored_database import Base
 
+# Text matched by contact autocomplete; the trigram GiST index is built on exactly this expression
+CONTACT_SEARCH_LABEL_SQL = "first_name || ' ' || last_name || ' ' || coalesce(company, '')"
+
 # Association table for many-to-many relationship between audiences and contacts
 audience_contacts = Table(
     'audience_contacts',
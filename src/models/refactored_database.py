@@ -1,14 +1,22 @@
 # Refactored Database Models for Content Management System
 
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, Float, Enum, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, Float, Enum, ForeignKey, Computed, Index
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.sql import func
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred
 from pgvector.sqlalchemy import Vector
 import enum
 
 Base = declarative_base()
 
+# Weighted full-text document for marketing content: title (A), tags (B), body (C)
+MARKETING_CONTENT_SEARCH_DOCUMENT = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(tags, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(content_text, '')), 'C')"
+)
+
 # Enums for controlled vocabularies
 class ContentType(enum.Enum):
     WEBSITE_BLOG = "WEBSITE_BLOG"
@@ -85,8 +93,15 @@ class MarketingContent(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     
-    # Vector embedding for semantic search (future)
-    embedding = Column(Vector(1536), nullable=True)
+    # Vector embedding for semantic search (future); deferred so ORM reads skip ~6 KB per row
+    embedding = deferred(Column(Vector(1536), nullable=True))
+    
+    # Full-text search document (generated by Postgres, GIN indexed; never loaded by default)
+    search_vector = deferred(Column(TSVECTOR, Computed(MARKETING_CONTENT_SEARCH_DOCUMENT, persisted=True)))
+    
+    __table_args__ = (
+        Index("idx_marketing_content_search_vector", "search_vector", postgresql_using="gin"),
+    )
 
 
 class ComplianceRules(Base):
@@ -112,8 +127,8 @@ class ComplianceRules(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     
-    # Vector embedding for semantic search
-    embedding = Column(Vector(1536), nullable=True)
+    # Vector embedding for semantic search; deferred so ORM reads skip ~6 KB per row
+    embedding = deferred(Column(Vector(1536), nullable=True))
 
 
 class UserContentQueue(Base):
@@ -205,6 +220,16 @@ class ContentTags(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
 
+class VectorizationCheckpoint(Base):
+    """Resume point for bulk embedding jobs"""
+    __tablename__ = "vectorization_checkpoints"
+
+    job_name = Column(String(100), primary_key=True)
+    last_processed_id = Column(Integer, nullable=False, default=0)  # Every row with id <= this is done
+    processed_count = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
 # Conversation tracking (from original schema - still useful)
 class Conversation(Base):
     """User conversations with Warren"""
@@ -1,28 +1,155 @@
-import asyncio
-from anthropic import Anthropic
+from typing import Any, AsyncIterator, Dict, Optional
+
+import httpx
+from anthropic import AsyncAnthropic, DefaultAsyncHttpxClient
 from config.settings import settings
+from src.services.llm_scheduler import LLMScheduler, LLMPriority
+from src.services.prompt_service import CacheablePrompt
+from src.services.tokenizer_service import TokenizerService
+
+# Usage fields reported by the Messages API (cache fields are absent when nothing was cached)
+_USAGE_FIELDS = ("input_tokens", "output_tokens", "cache_creation_input_tokens", "cache_read_input_tokens")
 
 
 class ClaudeService:
     def __init__(self):
-        self.client = Anthropic(api_key=settings.anthropic_api_key)
+        # Shared keep-alive pool: concurrent generations wait on sockets, not executor threads
+        self.http_client = DefaultAsyncHttpxClient(
+            limits=httpx.Limits(
+                max_connections=settings.anthropic_max_connections,
+                max_keepalive_connections=settings.anthropic_max_keepalive_connections,
+                keepalive_expiry=settings.anthropic_keepalive_expiry_seconds
+            ),
+            timeout=httpx.Timeout(
+                settings.anthropic_read_timeout_seconds,
+                connect=settings.anthropic_connect_timeout_seconds,
+                pool=settings.anthropic_pool_timeout_seconds
+            )
+        )
+        self.client = AsyncAnthropic(
+            api_key=settings.anthropic_api_key,
+            http_client=self.http_client,
+            max_retries=settings.anthropic_max_retries
+        )
+        self.model = "claude-3-5-sonnet-20241022"
+        self.prompt_caching_enabled = settings.anthropic_prompt_caching_enabled
+        
+        # Every call is admitted by priority class and advisor within a concurrency cap and token budget
+        self.scheduler = LLMScheduler(
+            max_concurrent=settings.anthropic_max_concurrent_requests,
+            tokens_per_minute=settings.anthropic_tokens_per_minute,
+            enabled=settings.anthropic_scheduler_enabled
+        )
+        
+        # Prompt cache metrics
+        self._requests = 0
+        self._cache_hits = 0  # Requests that read a cached prefix
+        self._cache_writes = 0  # Requests that wrote a prefix to the cache
+        self._input_tokens = 0  # Uncached input tokens
+        self._cache_read_tokens = 0
+        self._cache_creation_tokens = 0
     
-    async def generate_content(self, prompt: str, max_tokens: int = 1000) -> str:
-        """Generate content using Claude AI"""
+    async def generate_content(
+        self,
+        prompt: str,
+        max_tokens: int = 1000,
+        usage: Optional[Dict[str, Any]] = None,
+        priority: LLMPriority = LLMPriority.INTERACTIVE,
+        advisor_id: Optional[str] = None
+    ) -> str:
+        """
+        Generate content using Claude AI
+        
+        A CacheablePrompt's stable blocks are sent as cache-marked system blocks.
+        When a usage dict is passed it receives the request's token usage. The
+        call waits for the scheduler, which serves priority classes in order and
+        advisors round-robin.
+        """
         try:
-            # Run the synchronous API call in a thread pool
-            message = await asyncio.to_thread(
-                self.client.messages.create,
-                model="claude-3-5-sonnet-20241022",
-                max_tokens=max_tokens,
-                messages=[
-                    {"role": "user", "content": prompt}
-                ]
-            )
+            estimated_tokens = TokenizerService.approximate_tokens(str(prompt))
+            async with self.scheduler.slot(priority, advisor_id, estimated_tokens):
+                message = await self.client.messages.create(**self._request_params(prompt, max_tokens))
+            self._settle_usage(getattr(message, "usage", None), usage, estimated_tokens)
             return message.content[0].text
         except Exception as e:
             raise Exception(f"Claude API error: {str(e)}")
     
+    async def stream_content(
+        self,
+        prompt: str,
+        max_tokens: int = 1000,
+        usage: Optional[Dict[str, Any]] = None,
+        priority: LLMPriority = LLMPriority.INTERACTIVE,
+        advisor_id: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """Generate content using Claude AI, yielding text as it arrives (usage is filled at the end)"""
+        try:
+            estimated_tokens = TokenizerService.approximate_tokens(str(prompt))
+            async with self.scheduler.slot(priority, advisor_id, estimated_tokens):
+                async with self.client.messages.stream(**self._request_params(prompt, max_tokens)) as stream:
+                    async for text in stream.text_stream:
+                        yield text
+                    message = await stream.get_final_message()
+            self._settle_usage(getattr(message, "usage", None), usage, estimated_tokens)
+        except Exception as e:
+            raise Exception(f"Claude API error: {str(e)}")
+    
+    def _request_params(self, prompt: str, max_tokens: int) -> Dict[str, Any]:
+        """Messages API parameters; stable prompt blocks go first, marked for prompt caching."""
+        params = {"model": self.model, "max_tokens": max_tokens}
+        
+        if isinstance(prompt, CacheablePrompt) and prompt.stable_blocks and self.prompt_caching_enabled:
+            params["system"] = [
+                {"type": "text", "text": block, "cache_control": {"type": "ephemeral"}}
+                for block in prompt.stable_blocks
+            ]
+            params["messages"] = [{"role": "user", "content": prompt.request}]
+        else:
+            params["messages"] = [{"role": "user", "content": str(prompt)}]
+        
+        return params
+    
+    def _settle_usage(self, message_usage: Any, usage: Optional[Dict[str, Any]], estimated_tokens: int) -> None:
+        """Record a response's token usage and charge the scheduler for tokens beyond the estimate."""
+        counts = self._record_usage(message_usage, usage)
+        self.scheduler.charge(sum(counts.values()) - estimated_tokens)
+    
+    def _record_usage(self, message_usage: Any, usage: Optional[Dict[str, Any]]) -> Dict[str, int]:
+        """Add a response's token usage to the cache metrics and the caller's usage dict."""
+        counts = {}
+        for field in _USAGE_FIELDS:
+            value = getattr(message_usage, field, None)
+            counts[field] = value if isinstance(value, int) else 0
+        
+        self._requests += 1
+        self._input_tokens += counts["input_tokens"]
+        self._cache_read_tokens += counts["cache_read_input_tokens"]
+        self._cache_creation_tokens += counts["cache_creation_input_tokens"]
+        if counts["cache_read_input_tokens"]:
+            self._cache_hits += 1
+        if counts["cache_creation_input_tokens"]:
+            self._cache_writes += 1
+        
+        if usage is not None:
+            usage.update(counts)
+            usage["cache_hit"] = counts["cache_read_input_tokens"] > 0
+        return counts
+    
+    def get_prompt_cache_stats(self) -> Dict[str, Any]:
+        """Prompt cache hit and cached-token metrics."""
+        total_input = self._input_tokens + self._cache_read_tokens + self._cache_creation_tokens
+        return {
+            "enabled": self.prompt_caching_enabled,
+            "requests": self._requests,
+            "cache_hits": self._cache_hits,
+            "cache_writes": self._cache_writes,
+            "hit_rate_percent": round(self._cache_hits / self._requests * 100, 2) if self._requests else 0.0,
+            "input_tokens": self._input_tokens,
+            "cache_read_input_tokens": self._cache_read_tokens,
+            "cache_creation_input_tokens": self._cache_creation_tokens,
+            "cached_input_percent": round(self._cache_read_tokens / total_input * 100, 2) if total_input else 0.0
+        }
+    
     async def test_connection(self) -> dict:
         """Test Claude API connection"""
         try:
@@ -30,6 +157,14 @@ class ClaudeService:
             return {"status": "success", "response": response}
         except Exception as e:
             return {"status": "error", "error": str(e)}
+    
+    def get_scheduler_stats(self) -> Dict[str, Any]:
+        """Queue depth, wait time and token budget metrics of the call scheduler."""
+        return self.scheduler.get_stats()
+    
+    async def close(self) -> None:
+        """Close pooled connections (application shutdown)."""
+        await self.client.close()
 
 
 # Global instance
@@ -0,0 +1,279 @@
+# Compliance Rules Registry
+"""
+In-memory copy of the compliance_rules table. All rules and their embeddings
+are loaded once into a normalized NumPy matrix, with an inverted index from
+content type to applicable rules built from applies_to_content_types.
+Similarity, text and disclaimer lookups are answered without touching
+Postgres; a cheap version stamp (row count + latest updated_at) is checked
+periodically and triggers a reload when the rules change.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from typing import List, Dict, Any, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.sql import func
+
+from config.settings import settings
+from src.models.refactored_database import ComplianceRules
+from src.core.database import AsyncSessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+def parse_content_types(value: Optional[str]) -> Optional[List[str]]:
+    """
+    Normalize an applies_to_content_types value.
+
+    Accepts a JSON array, a single type or a comma-separated list. Returns
+    lowercase content types, or None for rules that apply to everything.
+    """
+    if value is None:
+        return None
+    try:
+        parsed = json.loads(value)
+    except (TypeError, ValueError):
+        parsed = value.split(",")
+    if isinstance(parsed, str):
+        parsed = [parsed]
+    if not isinstance(parsed, list):
+        return None
+
+    content_types = sorted({str(item).strip().lower() for item in parsed if str(item).strip()})
+    if not content_types or "all" in content_types:
+        return None
+    return content_types
+
+
+class ComplianceRulesRegistry:
+    """Process-wide, version-checked in-memory compliance rules index."""
+
+    def __init__(self, version_check_interval: float = 60.0):
+        """
+        Initialize an empty registry.
+
+        Args:
+            version_check_interval: Seconds between version stamp checks
+        """
+        self.version_check_interval = version_check_interval
+
+        self._rules: List[Dict[str, Any]] = []
+        self._matrix = np.zeros((0, 0), dtype=np.float32)  # unit-length rule embeddings
+        self._has_embedding = np.zeros(0, dtype=bool)
+        self._universal = np.zeros(0, dtype=bool)
+        self._by_content_type: Dict[str, np.ndarray] = {}  # content type -> row mask
+
+        self._version: Optional[Tuple] = None
+        self._checked_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+
+        self.loaded = False
+        self.loaded_at: Optional[float] = None
+        self._reloads = 0
+
+    async def ensure_current(self) -> bool:
+        """
+        Load the rules, or reload them if the version stamp changed.
+
+        The stamp is checked at most once per version_check_interval.
+
+        Returns:
+            Whether rules are available in memory
+        """
+        if self._is_fresh():
+            return self.loaded
+
+        async with self._lock:
+            if self._is_fresh():
+                return self.loaded
+            try:
+                async with AsyncSessionLocal() as db:
+                    # Read the stamp before the rules: a write in between only causes an extra reload
+                    version = await self._fetch_version(db)
+                    if not self.loaded or version != self._version:
+                        result = await db.execute(
+                            select(
+                                ComplianceRules.id,
+                                ComplianceRules.regulation_name,
+                                ComplianceRules.rule_section,
+                                ComplianceRules.requirement_text,
+                                ComplianceRules.required_disclaimers,
+                                ComplianceRules.prohibition_type,
+                                ComplianceRules.applies_to_content_types,
+                                ComplianceRules.applicability_scope,
+                                ComplianceRules.embedding
+                            ).order_by(ComplianceRules.id)
+                        )
+                        self.build(result.all())
+                        self._version = version
+                        logger.info(f"Compliance rules registry loaded {len(self._rules)} rules")
+
+            except Exception as e:
+                logger.error(f"Error loading compliance rules registry: {str(e)}")
+
+            # Failures are also retried only after the interval, falling back to Postgres meanwhile
+            self._checked_at = time.monotonic()
+            return self.loaded
+
+    def invalidate(self) -> None:
+        """Force a version check on the next lookup (call after writing rules)."""
+        self._checked_at = None
+        self._version = None
+
+    def build(self, rows: List[Any]) -> None:
+        """Rebuild the in-memory index from compliance rule rows."""
+        rules = []
+        embeddings = []
+        has_embedding = []
+        universal = []
+        rows_by_content_type: Dict[str, List[int]] = {}
+
+        for index, row in enumerate(rows):
+            rules.append({
+                "id": row.id,
+                "regulation_name": row.regulation_name,
+                "rule_section": row.rule_section,
+                "requirement_text": row.requirement_text,
+                "required_disclaimers": row.required_disclaimers,
+                "prohibition_type": row.prohibition_type,
+                "applies_to_content_types": row.applies_to_content_types,
+                "applicability_scope": row.applicability_scope
+            })
+
+            content_types = parse_content_types(row.applies_to_content_types)
+            universal.append(content_types is None)
+            for content_type in content_types or []:
+                rows_by_content_type.setdefault(content_type, []).append(index)
+
+            has_embedding.append(row.embedding is not None)
+            embeddings.append(row.embedding)
+
+        dimensions = next((len(e) for e in embeddings if e is not None), 0)
+        matrix = np.zeros((len(rows), dimensions), dtype=np.float32)
+        for index, embedding in enumerate(embeddings):
+            if embedding is not None:
+                matrix[index] = np.asarray(embedding, dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1)
+        norms[norms == 0] = 1.0
+
+        self._rules = rules
+        self._matrix = matrix / norms[:, None]
+        self._has_embedding = np.array(has_embedding, dtype=bool)
+        self._universal = np.array(universal, dtype=bool)
+        self._by_content_type = {}
+        for content_type, indexes in rows_by_content_type.items():
+            mask = np.zeros(len(rows), dtype=bool)
+            mask[indexes] = True
+            self._by_content_type[content_type] = mask
+
+        self.loaded = True
+        self.loaded_at = time.time()
+        self._reloads += 1
+
+    def search(
+        self,
+        query_embedding: List[float],
+        content_type: Optional[str] = None,
+        similarity_threshold: float = 0.0,
+        limit: int = 5
+    ) -> List[Dict[str, Any]]:
+        """
+        Cosine similarity search over rules applicable to a content type.
+
+        Returns:
+            Rule dicts with similarity_score, most similar first
+        """
+        candidates = self._has_embedding & self._applicable(content_type)
+        if not candidates.any() or limit <= 0:
+            return []
+
+        query = np.asarray(query_embedding, dtype=np.float32)
+        query_norm = float(np.linalg.norm(query))
+        if query_norm == 0 or query.shape[0] != self._matrix.shape[1]:
+            return []
+
+        scores = self._matrix @ (query / query_norm)
+        rows = np.flatnonzero(candidates & (scores > similarity_threshold))
+        rows = rows[np.argsort(-scores[rows], kind="stable")][:limit]
+
+        return [
+            {**self._rules[row], "similarity_score": float(scores[row]), "search_method": "vector"}
+            for row in rows
+        ]
+
+    def text_search(
+        self,
+        query: str,
+        content_type: Optional[str] = None,
+        limit: int = 5
+    ) -> List[Dict[str, Any]]:
+        """Case-insensitive substring match on requirement, regulation and disclaimer text."""
+        needle = query.lower()
+        applicable = self._applicable(content_type)
+        matches = []
+        for row in np.flatnonzero(applicable):
+            rule = self._rules[row]
+            fields = (rule["requirement_text"], rule["regulation_name"], rule["required_disclaimers"])
+            if any(field and needle in field.lower() for field in fields):
+                matches.append(rule)
+                if len(matches) == limit:
+                    break
+        return matches
+
+    def get_required_disclaimers(self, content_type: str, limit: int = 3) -> List[Dict[str, Any]]:
+        """
+        Rules with required disclaimers that apply to a content type.
+
+        Rules targeting the content type come before universal rules.
+        """
+        specific = self._by_content_type.get(content_type.lower()) if content_type else None
+        with_disclaimers = np.array(
+            [bool(rule["required_disclaimers"]) for rule in self._rules], dtype=bool
+        )
+
+        rows = []
+        if specific is not None:
+            rows.extend(np.flatnonzero(specific & with_disclaimers))
+        rows.extend(np.flatnonzero(self._universal & with_disclaimers))
+        return [self._rules[row] for row in rows[:limit]]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Registry size and freshness."""
+        return {
+            "loaded": self.loaded,
+            "rules": len(self._rules),
+            "rules_with_embeddings": int(self._has_embedding.sum()),
+            "universal_rules": int(self._universal.sum()),
+            "content_types": sorted(self._by_content_type),
+            "loaded_at": self.loaded_at,
+            "reloads": self._reloads,
+            "version_check_interval": self.version_check_interval
+        }
+
+    def _applicable(self, content_type: Optional[str]) -> np.ndarray:
+        if not content_type:
+            return np.ones(len(self._rules), dtype=bool)
+        specific = self._by_content_type.get(content_type.lower())
+        return self._universal if specific is None else (self._universal | specific)
+
+    def _is_fresh(self) -> bool:
+        return (
+            self._checked_at is not None
+            and time.monotonic() - self._checked_at < self.version_check_interval
+        )
+
+    async def _fetch_version(self, db) -> Tuple:
+        result = await db.execute(
+            select(func.count(ComplianceRules.id), func.max(ComplianceRules.updated_at))
+        )
+        return tuple(result.one())
+
+
+# Process-wide registry shared by vector search and the Warren database service
+compliance_rules_registry = ComplianceRulesRegistry(
+    version_check_interval=settings.compliance_rules_version_check_seconds
+)
@@ -7,6 +7,7 @@ from sqlalchemy import func, or_, and_, select
 from src.models.refactored_database import MarketingContent, ContentType, AudienceType, ApprovalStatus, SourceType
 from src.core.database import AsyncSessionLocal
 from src.services.embedding_service import embedding_service
+from src.services.vector_search_service import vector_search_service
 import logging
 
 logger = logging.getLogger(__name__)
@@ -15,6 +16,35 @@ logger = logging.getLogger(__name__)
 class ContentManagementService:
     """Service for managing marketing content CRUD operations with auto-vectorization."""
     
+    def _content_columns(self, detail: bool = False):
+        """Columns read by the content list/detail views (has_embedding instead of the vector)."""
+        columns = [
+            MarketingContent.id,
+            MarketingContent.title,
+            MarketingContent.content_text,
+            MarketingContent.content_type,
+            MarketingContent.audience_type,
+            MarketingContent.tone,
+            MarketingContent.topic_focus,
+            MarketingContent.target_demographics,
+            MarketingContent.approval_status,
+            MarketingContent.compliance_score,
+            MarketingContent.source_type,
+            MarketingContent.original_source,
+            MarketingContent.usage_count,
+            MarketingContent.effectiveness_score,
+            MarketingContent.tags,
+            MarketingContent.created_at,
+            MarketingContent.updated_at,
+        ]
+        if detail:
+            columns += [
+                MarketingContent.fiducia_approved_by,
+                MarketingContent.fiducia_approved_at,
+                MarketingContent.contributed_by_user_id,
+            ]
+        return columns + [MarketingContent.embedding.isnot(None).label('has_embedding')]
+    
     async def get_all_content(
         self,
         skip: int = 0,
@@ -42,8 +72,8 @@ class ContentManagementService:
         """
         try:
             async with AsyncSessionLocal() as db:
-                # Build query with filters
-                query = select(MarketingContent)
+                # Build query with filters (explicit columns: the embedding itself is never read)
+                query = select(*self._content_columns())
                 
                 # Apply filters
                 if content_type:
@@ -70,7 +100,7 @@ class ContentManagementService:
                 # Apply pagination and ordering
                 query = query.order_by(MarketingContent.updated_at.desc()).offset(skip).limit(limit)
                 result = await db.execute(query)
-                content_items = result.scalars().all()
+                content_items = result.all()
                 
                 # Convert to dict format
                 content_list = []
@@ -93,7 +123,7 @@ class ContentManagementService:
                         "tags": item.tags.split(",") if item.tags else [],
                         "created_at": item.created_at.isoformat() if item.created_at else None,
                         "updated_at": item.updated_at.isoformat() if item.updated_at else None,
-                        "has_embedding": item.embedding is not None
+                        "has_embedding": item.has_embedding
                     }
                     content_list.append(content_dict)
                 
@@ -120,13 +150,66 @@ class ContentManagementService:
             logger.error(f"Error getting content: {str(e)}")
             return {"status": "error", "error": str(e)}
     
+    async def autocomplete_titles(
+        self,
+        query: str,
+        limit: int = 10,
+        approval_status: Optional[ApprovalStatus] = None
+    ) -> Dict[str, Any]:
+        """
+        Suggest content titles for a partial query, most similar first.
+        
+        Uses pg_trgm word similarity; the ORDER BY distance / LIMIT is served
+        by a KNN scan of the title GiST index (see create_trigram_indexes).
+        
+        Args:
+            query: Partial title typed by the user
+            limit: Maximum suggestions to return
+            approval_status: Restrict suggestions to this approval status
+            
+        Returns:
+            Dict with suggestions (id, title, content_type, score)
+        """
+        try:
+            async with AsyncSessionLocal() as db:
+                distance = MarketingContent.title.op('<->>')(query)
+                
+                suggestion_query = select(
+                    MarketingContent.id,
+                    MarketingContent.title,
+                    MarketingContent.content_type,
+                    distance.label('distance')
+                ).where(MarketingContent.title.op('%>')(query))
+                
+                if approval_status:
+                    suggestion_query = suggestion_query.where(MarketingContent.approval_status == approval_status)
+                
+                suggestion_query = suggestion_query.order_by(distance).limit(limit)
+                result = await db.execute(suggestion_query)
+                
+                suggestions = [
+                    {
+                        "id": row.id,
+                        "title": row.title,
+                        "content_type": row.content_type.value if row.content_type else None,
+                        "score": round(1 - float(row.distance), 4)
+                    }
+                    for row in result.all()
+                ]
+                
+                return {"status": "success", "query": query, "suggestions": suggestions}
+                
+        except Exception as e:
+            logger.error(f"Error autocompleting content titles: {str(e)}")
+            return {"status": "error", "error": str(e)}
+    
     async def get_content_by_id(self, content_id: int) -> Dict[str, Any]:
         """Get a specific content item by ID."""
         try:
             async with AsyncSessionLocal() as db:
-                query = select(MarketingContent).where(MarketingContent.id == content_id)
+                query = select(*self._content_columns(detail=True)).where(MarketingContent.id == content_id)
                 result = await db.execute(query)
-                content_item = result.scalar_one_or_none()
+                content_item = result.one_or_none()
                 
                 if not content_item:
                     return {"status": "error", "error": "Content not found"}
@@ -152,7 +235,7 @@ class ContentManagementService:
                     "tags": content_item.tags.split(",") if content_item.tags else [],
                     "created_at": content_item.created_at.isoformat() if content_item.created_at else None,
                     "updated_at": content_item.updated_at.isoformat() if content_item.updated_at else None,
-                    "has_embedding": content_item.embedding is not None
+                    "has_embedding": content_item.has_embedding
                 }
                 
                 return {"status": "success", "content": content_dict}
@@ -205,6 +288,9 @@ class ContentManagementService:
                 await db.commit()
                 await db.refresh(new_content)
                 
+                # Invalidate cached searches/readiness even if embedding fails below
+                vector_search_service.notify_content_changed([new_content.id])
+                
                 # Auto-generate embedding
                 vectorization_result = await self._generate_embedding_for_content(new_content)
                 
@@ -294,6 +380,10 @@ class ContentManagementService:
                 await db.commit()
                 await db.refresh(content_item)
                 
+                # Approval status, title, text or metadata changed: cached searches and the
+                # memory index must not keep serving the old row, even if re-embedding fails
+                vector_search_service.notify_content_changed([content_item.id])
+                
                 # Re-vectorize if content changed
                 vectorization_result = None
                 if content_changed:
@@ -331,8 +421,13 @@ class ContentManagementService:
             async with AsyncSessionLocal() as db:
                 # Use async query operations
                 from sqlalchemy import select
-                result = await db.execute(select(MarketingContent).where(MarketingContent.id == content_id))
-                content_item = result.scalar_one_or_none()
+                result = await db.execute(
+                    select(
+                        MarketingContent,
+                        MarketingContent.embedding.isnot(None).label('has_embedding')
+                    ).where(MarketingContent.id == content_id)
+                )
+                content_item, has_embedding = result.one_or_none() or (None, False)
                 
                 if not content_item:
                     return {"status": "error", "error": "Content not found"}
@@ -342,13 +437,15 @@ class ContentManagementService:
                     "id": content_item.id,
                     "title": content_item.title,
                     "content_type": content_item.content_type.value,
-                    "had_embedding": content_item.embedding is not None
+                    "had_embedding": has_embedding
                 }
                 
                 # Delete the content (this also deletes the embedding)
                 await db.delete(content_item)
                 await db.commit()
                 
+                vector_search_service.notify_content_changed([content_id])
+                
                 return {
                     "status": "success",
                     "message": "Content deleted successfully",
@@ -384,6 +481,7 @@ class ContentManagementService:
                     if fresh_content:
                         fresh_content.embedding = embedding
                         await db.commit()
+                        vector_search_service.notify_content_changed([content_item.id])
                 
                 return {
                     "status": "success",
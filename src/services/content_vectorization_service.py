@@ -4,127 +4,312 @@ Service for generating and managing embeddings for existing and new content.
 Handles batch processing of existing content and real-time embedding of new content.
 """
 
+import asyncio
 import logging
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 
+from pgvector.sqlalchemy import Vector
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update, and_, text, func
+from sqlalchemy import select, update, delete, and_, text, func, bindparam
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import selectinload
 
-from src.models.refactored_database import MarketingContent, ComplianceRules, ApprovalStatus
-from src.core.database import AsyncSessionLocal
+from config.settings import settings
+from src.models.refactored_database import (
+    MarketingContent, ComplianceRules, ApprovalStatus, VectorizationCheckpoint
+)
+from src.core.database import AsyncSessionLocal, engine
 from src.services.embedding_service import embedding_service
+from src.services.rate_limiter import RateLimiter
+from src.services.vector_search_service import vector_search_service
 
 logger = logging.getLogger(__name__)
 
 
+class _PipelineRun:
+    """Mutable state shared by the batches of one bulk vectorization run."""
+
+    def __init__(self, job_name: str, checkpointed: bool = True):
+        self.job_name = job_name
+        self.checkpointed = checkpointed  # Persist the watermark for resuming
+        self.start_after_id = 0
+        self.watermark = 0
+        self.next_sequence = 0
+        self.completed: Dict[int, Tuple[int, bool]] = {}
+        self.lock = asyncio.Lock()
+        self.total_items = 0
+        self.processed = 0
+        self.errors = 0
+        self.total_cost = 0.0
+
+
 class ContentVectorizationService:
     """Service for generating and managing content embeddings."""
     
     def __init__(self):
         """Initialize the vectorization service."""
-        self.batch_size = 10  # Process content in batches
+        self.batch_size = settings.vectorization_batch_size
+        self.max_concurrent_batches = settings.vectorization_max_concurrent_batches
+        self.rate_limiter = RateLimiter(
+            requests_per_minute=settings.embedding_requests_per_minute,
+            tokens_per_minute=settings.embedding_tokens_per_minute
+        )
     
-    async def vectorize_existing_marketing_content(self, force_update: bool = False) -> Dict[str, Any]:
+    async def vectorize_existing_marketing_content(
+        self,
+        force_update: bool = False,
+        resume: bool = True
+    ) -> Dict[str, Any]:
         """
         Generate embeddings for all existing marketing content.
         
+        Rows are streamed in id order from a server-side cursor and embedded in
+        batches, with a bounded number of batches in flight and OpenAI calls
+        throttled to the configured RPM/TPM budget. Each batch is written back
+        with a single bulk UPDATE.
+        
+        Regular runs only select rows without an embedding, so an interrupted
+        run resumes by itself. Forced runs re-embed every approved row and
+        checkpoint their progress instead; the checkpoint is cleared once a
+        forced run reaches the end of the table.
+        
         Args:
             force_update: If True, regenerate embeddings even if they exist
+            resume: Continue a forced run from the checkpoint of an interrupted one
             
         Returns:
             Results summary with counts and any errors
         """
-        async with AsyncSessionLocal() as db:
+        job_name = "marketing_content_force" if force_update else "marketing_content"
+        run = _PipelineRun(job_name, checkpointed=force_update)
+        
+        try:
+            if run.checkpointed:
+                await self._ensure_checkpoint_table()
+                run.start_after_id = await self._load_checkpoint(job_name) if resume else 0
+                run.watermark = run.start_after_id
+            
+            query = select(
+                MarketingContent.id,
+                MarketingContent.title,
+                MarketingContent.content_text,
+                MarketingContent.content_type,
+                MarketingContent.audience_type,
+                MarketingContent.tags
+            ).where(
+                MarketingContent.approval_status == ApprovalStatus.APPROVED
+            ).order_by(MarketingContent.id)
+            
+            if force_update:
+                query = query.where(MarketingContent.id > run.start_after_id)
+            else:
+                # Rows written by an earlier run drop out of this filter, so no checkpoint is needed
+                query = query.where(MarketingContent.embedding.is_(None))
+            
+            if run.start_after_id:
+                logger.info(f"Resuming {job_name} vectorization after content ID {run.start_after_id}")
+            
+            in_flight = asyncio.Semaphore(self.max_concurrent_batches)
+            tasks = []
+            
             try:
-                # Get content that needs embeddings
-                if force_update:
-                    # Get all approved content
-                    query = select(MarketingContent).where(
-                        MarketingContent.approval_status == ApprovalStatus.APPROVED
-                    )
-                else:
-                    # Get only content without embeddings
-                    query = select(MarketingContent).where(
-                        and_(
-                            MarketingContent.approval_status == ApprovalStatus.APPROVED,
-                            MarketingContent.embedding.is_(None)
-                        )
-                    )
-                
-                result = await db.execute(query)
-                content_items = result.scalars().all()
-                
-                if not content_items:
-                    return {
-                        "status": "success",
-                        "message": "No marketing content needs vectorization",
-                        "processed": 0,
-                        "skipped": 0,
-                        "errors": 0
-                    }
-                
-                logger.info(f"Starting vectorization of {len(content_items)} marketing content items")
-                
-                processed = 0
-                errors = 0
-                total_cost = 0.0
-                
-                # Process in batches
-                for i in range(0, len(content_items), self.batch_size):
-                    batch = content_items[i:i + self.batch_size]
-                    
-                    # Prepare texts for embedding
-                    texts_to_embed = []
-                    for content in batch:
-                        prepared_text = embedding_service.prepare_text_for_embedding(
-                            title=content.title,
-                            content=content.content_text,
-                            content_type=content.content_type.value if content.content_type else None,
-                            audience_type=content.audience_type.value if content.audience_type else None,
-                            tags=content.tags
-                        )
-                        texts_to_embed.append(prepared_text)
-                    
-                    # Generate embeddings for batch
-                    embeddings = await embedding_service.generate_batch_embeddings(texts_to_embed)
-                    
-                    # Update content with embeddings
-                    for j, (content, embedding) in enumerate(zip(batch, embeddings)):
-                        if embedding:
-                            content.embedding = embedding
-                            processed += 1
-                            
-                            # Estimate cost for this item
-                            token_count = embedding_service.count_tokens(texts_to_embed[j])
-                            total_cost += embedding_service.estimate_cost(token_count)
-                        else:
-                            errors += 1
-                            logger.error(f"Failed to generate embedding for content ID {content.id}")
-                    
-                    # Commit batch
-                    await db.commit()
-                    logger.info(f"Processed batch {i//self.batch_size + 1}: {len([e for e in embeddings if e])} successful")
-                
+                async with AsyncSessionLocal() as db:
+                    result = await db.stream(query.execution_options(yield_per=self.batch_size))
+                    async for rows in result.partitions(self.batch_size):
+                        # Blocks the cursor while max_concurrent_batches are still embedding
+                        await in_flight.acquire()
+                        task = asyncio.create_task(self._process_marketing_batch(run, len(tasks), rows))
+                        task.add_done_callback(lambda _: in_flight.release())
+                        tasks.append(task)
+            except BaseException:
+                # Streaming failed or the run was cancelled: stop the batches already started
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                raise
+            
+            await asyncio.gather(*tasks)
+            
+            if run.checkpointed:
+                # The forced pass is complete; failed rows keep their previous embedding
+                await self._clear_checkpoint(job_name)
+            
+            if run.total_items == 0:
                 return {
                     "status": "success",
-                    "message": f"Vectorization completed",
-                    "processed": processed,
-                    "errors": errors,
-                    "total_items": len(content_items),
-                    "estimated_cost": total_cost,
-                    "batch_count": (len(content_items) + self.batch_size - 1) // self.batch_size
-                }
-                
-            except Exception as e:
-                logger.error(f"Error in marketing content vectorization: {str(e)}")
-                await db.rollback()
-                return {
-                    "status": "error",
-                    "error": str(e),
-                    "processed": 0
+                    "message": "No marketing content needs vectorization",
+                    "processed": 0,
+                    "skipped": 0,
+                    "errors": 0
                 }
+            
+            return {
+                "status": "success",
+                "message": f"Vectorization completed",
+                "processed": run.processed,
+                "errors": run.errors,
+                "total_items": run.total_items,
+                "estimated_cost": run.total_cost,
+                "batch_count": len(tasks),
+                "resumed_after_id": run.start_after_id,
+                "checkpoint_id": run.watermark,
+                "rate_limiter": self.rate_limiter.get_stats()
+            }
+            
+        except Exception as e:
+            logger.error(f"Error in marketing content vectorization: {str(e)}")
+            return {
+                "status": "error",
+                "error": str(e),
+                "processed": run.processed,
+                "checkpoint_id": run.watermark
+            }
+    
+    async def _process_marketing_batch(self, run: "_PipelineRun", sequence: int, rows: List[Any]) -> None:
+        """Embed one streamed batch, bulk-write it and advance the checkpoint."""
+        run.total_items += len(rows)
+        succeeded = False
+        
+        try:
+            texts = [
+                embedding_service.prepare_text_for_embedding(
+                    title=row.title,
+                    content=row.content_text,
+                    content_type=row.content_type.value if row.content_type else None,
+                    audience_type=row.audience_type.value if row.audience_type else None,
+                    tags=row.tags
+                )
+                for row in rows
+            ]
+            token_counts = embedding_service.count_tokens_many(texts)
+            
+            await self.rate_limiter.acquire(tokens=sum(token_counts))
+            # Document vectors are written once; keep them out of the query embedding cache
+            embeddings = await embedding_service.generate_batch_embeddings(texts, use_cache=False)
+            
+            updates = []
+            for row, embedding, token_count in zip(rows, embeddings, token_counts):
+                if embedding:
+                    updates.append((row.id, embedding))
+                    run.total_cost += embedding_service.estimate_cost(token_count)
+                else:
+                    run.errors += 1
+                    logger.error(f"Failed to generate embedding for content ID {row.id}")
+            
+            if updates:
+                async with AsyncSessionLocal() as db:
+                    await self._bulk_update_embeddings(db, MarketingContent.__tablename__, updates)
+                    await db.commit()
+                vector_search_service.notify_content_changed([content_id for content_id, _ in updates])
+            
+            run.processed += len(updates)
+            succeeded = len(updates) == len(rows)
+            logger.info(f"Processed batch {sequence + 1}: {len(updates)} successful")
+            
+        except Exception as e:
+            run.errors += len(rows)
+            logger.error(f"Error in vectorization batch {sequence + 1}: {str(e)}")
+        
+        await self._advance_checkpoint(run, sequence, rows[-1].id, succeeded)
+    
+    async def _bulk_update_embeddings(
+        self,
+        db: AsyncSession,
+        table_name: str,
+        updates: List[Tuple[int, List[float]]]
+    ) -> None:
+        """
+        Write a batch of embeddings with one UPDATE ... FROM (VALUES ...) statement.
+        
+        Args:
+            db: Session to execute on (caller commits)
+            table_name: Table with integer id and embedding columns
+            updates: (id, embedding) pairs
+        """
+        values = ", ".join(
+            f"(CAST(:id_{i} AS INTEGER), CAST(:embedding_{i} AS vector))" for i in range(len(updates))
+        )
+        statement = text(
+            f"UPDATE {table_name} AS t SET embedding = v.embedding "
+            f"FROM (VALUES {values}) AS v(id, embedding) "
+            f"WHERE t.id = v.id"
+        ).bindparams(*[
+            bindparam(f"embedding_{i}", type_=Vector(embedding_service.dimensions))
+            for i in range(len(updates))
+        ])
+        
+        params = {}
+        for i, (row_id, embedding) in enumerate(updates):
+            params[f"id_{i}"] = row_id
+            params[f"embedding_{i}"] = embedding
+        
+        await db.execute(statement, params)
+    
+    async def _advance_checkpoint(self, run: "_PipelineRun", sequence: int, last_id: int, succeeded: bool) -> None:
+        """
+        Move the checkpoint over every leading batch that finished successfully.
+        
+        Batches complete out of order, so the checkpoint only ever covers a
+        contiguous prefix of the id range; a failed batch holds it in place
+        and is retried on the next run.
+        """
+        async with run.lock:
+            run.completed[sequence] = (last_id, succeeded)
+            advanced = False
+            while run.next_sequence in run.completed:
+                batch_last_id, batch_succeeded = run.completed[run.next_sequence]
+                if not batch_succeeded:
+                    break
+                del run.completed[run.next_sequence]
+                run.watermark = batch_last_id
+                run.next_sequence += 1
+                advanced = True
+            
+            if advanced and run.checkpointed:
+                await self._save_checkpoint(run.job_name, run.watermark, run.processed)
+    
+    async def _ensure_checkpoint_table(self) -> None:
+        async with engine.begin() as conn:
+            await conn.run_sync(VectorizationCheckpoint.__table__.create, checkfirst=True)
+    
+    async def _load_checkpoint(self, job_name: str) -> int:
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(VectorizationCheckpoint.last_processed_id).where(
+                    VectorizationCheckpoint.job_name == job_name
+                )
+            )
+            return result.scalar_one_or_none() or 0
+    
+    async def _save_checkpoint(self, job_name: str, last_processed_id: int, processed_count: int) -> None:
+        try:
+            async with AsyncSessionLocal() as db:
+                statement = pg_insert(VectorizationCheckpoint).values(
+                    job_name=job_name,
+                    last_processed_id=last_processed_id,
+                    processed_count=processed_count
+                )
+                statement = statement.on_conflict_do_update(
+                    index_elements=[VectorizationCheckpoint.job_name],
+                    set_={
+                        "last_processed_id": statement.excluded.last_processed_id,
+                        "processed_count": statement.excluded.processed_count,
+                        "updated_at": func.now()
+                    }
+                )
+                await db.execute(statement)
+                await db.commit()
+        except Exception as e:
+            # A stale checkpoint only costs re-embedding a few batches on resume
+            logger.warning(f"Could not save vectorization checkpoint for {job_name}: {str(e)}")
+    
+    async def _clear_checkpoint(self, job_name: str) -> None:
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                delete(VectorizationCheckpoint).where(VectorizationCheckpoint.job_name == job_name)
+            )
+            await db.commit()
     
     async def vectorize_single_content(self, content_id: int) -> Dict[str, Any]:
         """
@@ -165,6 +350,7 @@ class ContentVectorizationService:
                 if embedding:
                     content.embedding = embedding
                     await db.commit()
+                    vector_search_service.notify_content_changed([content_id])
                     
                     # Calculate cost
                     token_count = embedding_service.count_tokens(prepared_text)
@@ -327,8 +513,8 @@ class ContentVectorizationService:
                             tags=getattr(rule, 'applies_to_content_types', None)  # Keep tags as is
                         )
                         
-                        # Generate embedding
-                        embedding = await embedding_service.generate_embedding(prepared_text)
+                        # Generate embedding (bulk pass: bypass the query embedding cache)
+                        embedding = await embedding_service.generate_embedding(prepared_text, use_cache=False)
                         
                         if embedding:
                             rule.embedding = embedding
@@ -352,6 +538,7 @@ class ContentVectorizationService:
                 
                 # Commit all changes
                 await db.commit()
+                vector_search_service.notify_rules_changed()
                 
                 return {
                     "status": "success" if failed == 0 else "partial_success",
@@ -1,11 +1,11 @@
 """Document context gathering service"""
 
 import logging
-import tiktoken
 from typing import List, Dict, Any, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..models import ContextElement, ContextType
+from ...tokenizer_service import tokenizer_service
 
 logger = logging.getLogger(__name__)
 
@@ -17,26 +17,12 @@ class DocumentGatherer:
         from ...document_manager import DocumentManager
         self.document_manager = DocumentManager()
         
-        # Use direct tiktoken instead of importing TokenManager to avoid circular import
-        try:
-            self.tokenizer = tiktoken.encoding_for_model("gpt-4")
-        except Exception:
-            self.tokenizer = None
-            logger.warning("Could not load tiktoken, using approximation")
+        # Shared process-wide tokenizer (no per-instance encoder load)
+        self.tokenizer = tokenizer_service
     
     def count_tokens(self, text: str) -> int:
-        """Count tokens using tiktoken."""
-        if not text:
-            return 0
-            
-        if self.tokenizer:
-            try:
-                return len(self.tokenizer.encode(text))
-            except Exception:
-                pass
-        
-        # Fallback: rough approximation (1 token ≈ 4 characters)
-        return len(text) // 4
+        """Count tokens using the shared tokenizer."""
+        return self.tokenizer.count_tokens(text)
     
     async def gather_context(
         self,
@@ -2,96 +2,229 @@
 
 import hashlib
 import logging
-import tiktoken
-from typing import Dict, Optional
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.services.tokenizer_service import TokenizerService, tokenizer_service
 
 logger = logging.getLogger(__name__)
 
+# Shared cache bounds: total size of the text the cached counts represent
+DEFAULT_CACHE_MAX_BYTES = 64 * 1024 * 1024
+# Inputs longer than this are fingerprinted by sampling instead of a full hash
+SAMPLED_FINGERPRINT_THRESHOLD = 64 * 1024
+FINGERPRINT_SAMPLES = 16
+FINGERPRINT_SAMPLE_SIZE = 64
+
+
+class TokenCountCache:
+    """LRU cache of token counts bounded by the total bytes of text represented."""
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+        max_entries: Optional[int] = None,
+        sample_threshold: int = SAMPLED_FINGERPRINT_THRESHOLD
+    ):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.sample_threshold = sample_threshold
+
+        # fingerprint -> (token_count, size, verifier)
+        self._entries: "OrderedDict[Tuple, Tuple[int, int, Optional[int]]]" = OrderedDict()
+        self._total_bytes = 0
+
+        self._evictions = 0
+        self._collisions = 0
+
+    def get(self, text: str) -> Optional[int]:
+        key = self._lookup_key(text)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        # Real LRU: a hit makes the entry most recently used
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def set(self, text: str, token_count: int) -> None:
+        # Text sizes are measured in characters, which equals UTF-8 bytes for ASCII
+        size = len(text)
+        if size > self.max_bytes:
+            return
+
+        key = self._lookup_key(text)
+        verifier = hash(text) if key[0] == "sampled" else None
+
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._total_bytes -= previous[1]
+
+        self._entries[key] = (token_count, size, verifier)
+        self._total_bytes += size
+        self._evict()
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._total_bytes = 0
+        self._evictions = 0
+        self._collisions = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "bytes": self._total_bytes,
+            "max_bytes": self.max_bytes,
+            "max_entries": self.max_entries,
+            "evictions": self._evictions,
+            "fingerprint_collisions": self._collisions
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _lookup_key(self, text: str) -> Tuple:
+        if len(text) <= self.sample_threshold:
+            return self._full_key(text)
+
+        key = self._sampled_key(text)
+        entry = self._entries.get(key)
+        # Sampled fingerprints ignore most of the text, so confirm a match with the
+        # string hash (computed once per str object) and fall back to a full hash
+        if entry is not None and entry[2] != hash(text):
+            self._collisions += 1
+            return self._full_key(text)
+        return key
+
+    def _full_key(self, text: str) -> Tuple:
+        digest = hashlib.blake2b(text.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+        return ("full", digest)
+
+    def _sampled_key(self, text: str) -> Tuple:
+        # Length plus evenly spaced windows (always including head and tail)
+        length = len(text)
+        step = (length - FINGERPRINT_SAMPLE_SIZE) / (FINGERPRINT_SAMPLES - 1)
+        samples = "".join(
+            text[int(i * step):int(i * step) + FINGERPRINT_SAMPLE_SIZE]
+            for i in range(FINGERPRINT_SAMPLES)
+        )
+        digest = hashlib.blake2b(samples.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+        return ("sampled", length, digest)
+
+    def _evict(self) -> None:
+        while self._entries and (
+            self._total_bytes > self.max_bytes
+            or (self.max_entries is not None and len(self._entries) > self.max_entries)
+        ):
+            _, (_, size, _) = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            self._evictions += 1
+
+
+# Process-wide cache shared by every TextTokenManager that doesn't ask for its own
+shared_token_count_cache = TokenCountCache()
+
 
 class TextTokenManager:
-    """Precise token counting with hash-based caching for performance."""
-    
-    def __init__(self, cache_size_limit: int = 1000):
-        # Use Claude's tokenizer (approximating with GPT-4 tokenizer)
-        try:
-            self.tokenizer = tiktoken.encoding_for_model("gpt-4")
-            logger.info("TextTokenManager initialized with tiktoken GPT-4 encoding")
-        except Exception as e:
-            # Fallback to rough estimation
-            self.tokenizer = None
-            logger.warning(f"Could not load tiktoken, using approximation: {e}")
-        
-        # Hash-based cache for performance optimization
-        self._token_cache: Dict[str, int] = {}
-        self._cache_size_limit = cache_size_limit
-        
-        # Performance metrics
+    """Precise token counting with a shared LRU cache for performance."""
+
+    def __init__(
+        self,
+        cache_size_limit: Optional[int] = None,
+        tokenizer: Optional[TokenizerService] = None,
+        cache: Optional[TokenCountCache] = None
+    ):
+        # Shared process-wide tokenizer (GPT-4 cl100k_base encoding approximates Claude's)
+        self.tokenizer = tokenizer or tokenizer_service
+
+        # Counts are shared across instances (orchestrators, builders, per-request managers)
+        # unless an explicit cache or entry limit asks for a private one
+        if cache is not None:
+            self._cache = cache
+        elif cache_size_limit is not None:
+            self._cache = TokenCountCache(max_entries=cache_size_limit)
+        else:
+            self._cache = shared_token_count_cache
+
+        # Performance metrics (per instance)
         self._cache_hits = 0
         self._cache_misses = 0
-    
+
     def count_tokens(self, text: str) -> int:
         if not text:
             return 0
-        
-        # Generate content hash for caching
-        content_hash = self._generate_content_hash(text)
-        
+
         # Check cache first
-        if content_hash in self._token_cache:
+        token_count = self._cache.get(text)
+        if token_count is not None:
             self._cache_hits += 1
-            return self._token_cache[content_hash]
-        
+            return token_count
+
         # Cache miss - calculate tokens
         self._cache_misses += 1
         token_count = self._calculate_tokens(text)
-        
+
         # Store in cache with size management
-        self._store_in_cache(content_hash, token_count)
-        
+        self._cache.set(text, token_count)
+
         return token_count
-    
-    def _generate_content_hash(self, text: str) -> str:
-        return hashlib.md5(text.encode('utf-8')).hexdigest()
-    
+
+    def count_many(self, texts: List[str]) -> List[int]:
+        """Count tokens for several texts, batch-encoding the uncached ones."""
+        counts: List[Optional[int]] = []
+        misses = []
+        for text in texts:
+            if not text:
+                counts.append(0)
+                continue
+            token_count = self._cache.get(text)
+            if token_count is not None:
+                self._cache_hits += 1
+                counts.append(token_count)
+            else:
+                self._cache_misses += 1
+                misses.append(len(counts))
+                counts.append(None)
+
+        if misses:
+            encoded = self.tokenizer.encode_batch([texts[i] for i in misses])
+            for i, tokens in zip(misses, encoded):
+                self._cache.set(texts[i], len(tokens))
+                counts[i] = len(tokens)
+
+        return counts
+
     def _calculate_tokens(self, text: str) -> int:
-        if self.tokenizer:
-            try:
-                return len(self.tokenizer.encode(text))
-            except Exception as e:
-                logger.warning(f"Tiktoken encoding failed, using fallback: {e}")
-        
-        # Fallback: rough approximation (1 token ≈ 4 characters)
-        return len(text) // 4
-    
-    def _store_in_cache(self, content_hash: str, token_count: int) -> None:
-        # Remove oldest entries if cache is full
-        if len(self._token_cache) >= self._cache_size_limit:
-            # Simple FIFO eviction - remove first entry
-            oldest_key = next(iter(self._token_cache))
-            del self._token_cache[oldest_key]
-        
-        self._token_cache[content_hash] = token_count
-    
-    def get_cache_stats(self) -> Dict[str, any]:
+        # This manager caches counts itself, so skip the tokenizer's cache
+        return self.tokenizer.count_tokens(text, use_cache=False)
+
+    def get_cache_stats(self) -> Dict[str, Any]:
         total_requests = self._cache_hits + self._cache_misses
         hit_rate = (self._cache_hits / total_requests * 100) if total_requests > 0 else 0
-        
+        cache_stats = self._cache.get_stats()
+
         return {
             "cache_hits": self._cache_hits,
             "cache_misses": self._cache_misses,
             "hit_rate_percent": round(hit_rate, 2),
-            "cache_size": len(self._token_cache),
-            "cache_limit": self._cache_size_limit
+            "cache_size": cache_stats["entries"],
+            "cache_limit": cache_stats["max_entries"],
+            "cache_bytes": cache_stats["bytes"],
+            "cache_max_bytes": cache_stats["max_bytes"],
+            "cache_evictions": cache_stats["evictions"],
+            "fingerprint_collisions": cache_stats["fingerprint_collisions"],
+            "shared_cache": self._cache is shared_token_count_cache
         }
-    
+
     def clear_cache(self) -> None:
-        self._token_cache.clear()
+        # Clears the underlying cache, which may be shared with other managers
+        self._cache.clear()
         self._cache_hits = 0
         self._cache_misses = 0
         logger.info("TextTokenManager cache cleared")
-    
+
     def estimate_tokens_from_chars(self, char_count: int) -> int:
         return char_count // 4
-    
+
     def estimate_chars_from_tokens(self, token_count: int) -> int:
         return token_count * 4
@@ -19,6 +19,7 @@ from src.models.advisor_workflow_models import (
     AdvisorMessages, 
     ConversationContext
 )
+from src.services.tokenizer_service import tokenizer_service
 
 logger = logging.getLogger(__name__)
 
@@ -270,10 +271,10 @@ Recent conversation:
     
     def _estimate_tokens(self, text: str) -> int:
         """
-        Estimate token count for text. Using rough approximation: 1 token ≈ 4 characters.
-        This is conservative for Claude tokenization.
+        Estimate token count for text with the shared tokenizer (GPT-4 encoding
+        approximates Claude tokenization; falls back to 1 token ≈ 4 characters).
         """
-        return len(text) // 4
+        return tokenizer_service.count_tokens(text)
     
     async def _save_context(self, session_id: str, context_type: str, content: str, token_count: int):
         """
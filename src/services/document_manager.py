@@ -19,9 +19,10 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, and_, or_, update, desc, delete
 from sqlalchemy.orm import selectinload
 
-from src.models.advisor_workflow_models import SessionDocuments
+from src.models.advisor_workflow_models import SessionDocuments, AdvisorSessions
 from src.core.database import AsyncSessionLocal
 from src.services.claude_service import claude_service
+from src.services.llm_scheduler import LLMPriority
 from src.services.context_assembly_service import TokenManager
 
 logger = logging.getLogger(__name__)
@@ -468,15 +469,20 @@ class DocumentManager:
         self, 
         content: str, 
         content_type: str, 
-        target_tokens: int = 800
+        target_tokens: int = 800,
+        advisor_id: Optional[str] = None
     ) -> str:
         """
         Generate AI-powered summary using Claude for Warren context.
         
+        Summaries are background work: they queue behind interactive chat and
+        compliance review, fair-shared per advisor.
+        
         Args:
             content: Full document content
             content_type: Type of content ('pdf', 'docx', 'txt', 'video_transcript')
             target_tokens: Target token count for summary (default: 800)
+            advisor_id: Advisor who uploaded the document (scheduling fairness key)
             
         Returns:
             str: AI-generated summary optimized for Warren context
@@ -504,7 +510,9 @@ Please provide a well-structured summary that captures the essential information
             # Get AI summary from Claude
             response = await claude_service.generate_content(
                 prompt=summarization_prompt,
-                max_tokens=target_tokens * 2  # Allow some buffer for generation
+                max_tokens=target_tokens * 2,  # Allow some buffer for generation
+                priority=LLMPriority.BACKGROUND,
+                advisor_id=advisor_id
             )
             
             if not response:
@@ -555,11 +563,16 @@ Please provide a well-structured summary that captures the essential information
                     logger.warning(f"No content to summarize for document: {document_id}")
                     return False
                 
+                # Advisor owning the session, so one advisor's uploads share fairly with others
+                advisor_stmt = select(AdvisorSessions.advisor_id).where(AdvisorSessions.session_id == document.session_id)
+                advisor_id = (await db.execute(advisor_stmt)).scalar_one_or_none()
+                
                 # Generate AI summary
                 ai_summary = await self.generate_ai_summary(
                     content=document.full_content,
                     content_type=document.content_type,
-                    target_tokens=800
+                    target_tokens=800,
+                    advisor_id=advisor_id
                 )
                 
                 # Update document with summary and metadata
@@ -0,0 +1,140 @@
+# Embedding Micro-Batcher
+"""
+Coalesces concurrent single-text embedding requests into batched API calls.
+Requests arriving within a short window (or until the batch is full) share one
+embeddings.create call; identical texts in a window are embedded once.
+"""
+
+import asyncio
+import logging
+from typing import List, Dict, Any, Optional, Callable, Awaitable
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingMicroBatcher:
+    """Asyncio micro-batcher that fans batched embedding results back out to waiters."""
+
+    def __init__(
+        self,
+        embed_batch: Callable[[List[str]], Awaitable[List[Optional[List[float]]]]],
+        window_ms: float = 5.0,
+        max_batch_size: int = 64
+    ):
+        """
+        Initialize the micro-batcher.
+
+        Args:
+            embed_batch: Coroutine embedding a list of texts, results in input order
+            window_ms: How long the first request in a batch waits for company
+            max_batch_size: Flush immediately once this many unique texts are pending
+        """
+        self.embed_batch = embed_batch
+        self.window_seconds = window_ms / 1000
+        self.max_batch_size = max_batch_size
+
+        self._pending: Dict[str, List[asyncio.Future]] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._inflight: set = set()
+
+        # Metrics
+        self._requests = 0
+        self._deduplicated = 0
+        self._batches = 0
+        self._batched_texts = 0
+
+    async def submit(self, text: str) -> Optional[List[float]]:
+        """
+        Queue a text for the next batch and wait for its embedding.
+
+        Raises:
+            Exception: Whatever the batch call raised, so callers keep their own error handling
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._reset(loop)
+
+        future = loop.create_future()
+        self._requests += 1
+
+        waiters = self._pending.get(text)
+        if waiters is not None:
+            self._deduplicated += 1
+            waiters.append(future)
+        else:
+            self._pending[text] = [future]
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window_seconds, self._flush)
+
+        return await future
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Coalescing metrics."""
+        return {
+            "requests": self._requests,
+            "deduplicated": self._deduplicated,
+            "batches_sent": self._batches,
+            "average_batch_size": round(self._batched_texts / self._batches, 2) if self._batches else 0,
+            "api_calls_saved": self._requests - self._batches,
+            "window_ms": self.window_seconds * 1000,
+            "max_batch_size": self.max_batch_size
+        }
+
+    def _flush(self) -> None:
+        """Send everything pending as one batch."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch, self._pending = self._pending, {}
+        if not batch:
+            return
+
+        task = asyncio.ensure_future(self._run_batch(batch))
+        self._inflight.add(task)
+        task.add_done_callback(self._inflight.discard)
+
+    async def _run_batch(self, batch: Dict[str, List[asyncio.Future]]) -> None:
+        texts = list(batch.keys())
+        self._batches += 1
+        self._batched_texts += len(texts)
+
+        try:
+            embeddings = await self.embed_batch(texts)
+            if len(embeddings) != len(texts):
+                raise ValueError(f"Embedding batch returned {len(embeddings)} results for {len(texts)} texts")
+        except asyncio.CancelledError:
+            self._fail_waiters(batch, None)
+            raise
+        except Exception as e:
+            self._fail_waiters(batch, e)
+            return
+
+        for text, embedding in zip(texts, embeddings):
+            for future in batch[text]:
+                if not future.done():
+                    future.set_result(embedding)
+
+    def _fail_waiters(self, batch: Dict[str, List[asyncio.Future]], error: Optional[BaseException]) -> None:
+        """Resolve every waiter still without a result: raise error, or cancel when there is none."""
+        for waiters in batch.values():
+            for future in waiters:
+                if future.done():
+                    continue
+                if error is None:
+                    future.cancel()
+                else:
+                    future.set_exception(error)
+
+    def _reset(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Bind to a new event loop, dropping state owned by a previous one."""
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = None
+        self._pending = {}
+        self._inflight = set()
+        self._loop = loop
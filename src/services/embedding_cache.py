@@ -0,0 +1,214 @@
+# Embedding Cache
+"""
+Content-hash cache for OpenAI embeddings.
+In-process LRU tier of float32 vectors bounded by bytes, with an optional
+shared Redis tier.
+"""
+
+import hashlib
+import logging
+import unicodedata
+from array import array
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# In-process tier bound: ~10,000 1536-dim float32 vectors
+DEFAULT_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+
+class EmbeddingCache:
+    """Two-tier embedding cache keyed by model, dimensions and text hash."""
+
+    def __init__(
+        self,
+        model: str,
+        dimensions: int,
+        max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+        max_entries: Optional[int] = None,
+        redis_url: Optional[str] = None,
+        redis_ttl_seconds: int = 7 * 24 * 3600,
+        key_prefix: str = "fiducia:embedding"
+    ):
+        """
+        Initialize the embedding cache.
+
+        Args:
+            model: Embedding model name (part of the cache key)
+            dimensions: Embedding dimensions (part of the cache key)
+            max_bytes: Maximum vector bytes held in the in-process LRU tier
+            max_entries: Optional entry cap for the in-process tier
+            redis_url: Enables the shared Redis tier when provided
+            redis_ttl_seconds: Expiry for Redis entries
+            key_prefix: Namespace for Redis keys
+        """
+        self.model = model
+        self.dimensions = dimensions
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.redis_ttl_seconds = redis_ttl_seconds
+        self.key_prefix = key_prefix
+
+        # Vectors are kept as float32 arrays (~6 KB per 1536 dims instead of ~48 KB as a float list)
+        self._lru: "OrderedDict[str, array]" = OrderedDict()
+        self._lru_bytes = 0
+        self._redis = self._create_redis_client(redis_url) if redis_url else None
+
+        # Metrics
+        self._memory_hits = 0
+        self._redis_hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._redis_errors = 0
+
+    @staticmethod
+    def normalize_text(text: str) -> str:
+        """Normalize text for keying: Unicode NFC and trimmed outer whitespace."""
+        return unicodedata.normalize("NFC", text).strip()
+
+    def make_key(self, text: str) -> str:
+        """Cache key: model + dimensions + SHA-256 of the normalized text."""
+        digest = hashlib.sha256(self.normalize_text(text).encode("utf-8")).hexdigest()
+        return f"{self.model}:{self.dimensions}:{digest}"
+
+    async def get(self, text: str) -> Optional[List[float]]:
+        """Look up a single embedding."""
+        return (await self.get_many([text]))[0]
+
+    async def get_many(self, texts: List[str]) -> List[Optional[List[float]]]:
+        """
+        Look up embeddings for several texts.
+
+        Returns:
+            List aligned with texts; None for cache misses
+        """
+        keys = [self.make_key(text) for text in texts]
+        results: List[Optional[List[float]]] = [None] * len(texts)
+
+        redis_lookups = []
+        for i, key in enumerate(keys):
+            embedding = self._lru_get(key)
+            if embedding is not None:
+                self._memory_hits += 1
+                results[i] = embedding
+            else:
+                redis_lookups.append(i)
+
+        if redis_lookups and self._redis is not None:
+            try:
+                payloads = await self._redis.mget([self._redis_key(keys[i]) for i in redis_lookups])
+                for i, payload in zip(redis_lookups, payloads):
+                    if payload:
+                        vector = self._decode(payload)
+                        self._lru_set(keys[i], vector)
+                        self._redis_hits += 1
+                        results[i] = vector.tolist()
+            except Exception as e:
+                self._redis_errors += 1
+                logger.warning(f"Embedding cache Redis lookup failed: {e}")
+
+        self._misses += sum(1 for result in results if result is None)
+        return results
+
+    async def set(self, text: str, embedding: List[float]) -> None:
+        """Store a single embedding."""
+        await self.set_many([text], [embedding])
+
+    async def set_many(self, texts: List[str], embeddings: List[Optional[List[float]]]) -> None:
+        """Store embeddings for several texts (None entries are skipped)."""
+        entries = {}
+        for text, embedding in zip(texts, embeddings):
+            if embedding is None:
+                continue
+            key = self.make_key(text)
+            vector = array("f", embedding)
+            self._lru_set(key, vector)
+            entries[key] = vector
+
+        if entries and self._redis is not None:
+            try:
+                pipeline = self._redis.pipeline(transaction=False)
+                for key, vector in entries.items():
+                    pipeline.set(self._redis_key(key), self._encode(vector), ex=self.redis_ttl_seconds)
+                await pipeline.execute()
+            except Exception as e:
+                self._redis_errors += 1
+                logger.warning(f"Embedding cache Redis write failed: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss metrics for both tiers."""
+        hits = self._memory_hits + self._redis_hits
+        total_requests = hits + self._misses
+        hit_rate = (hits / total_requests * 100) if total_requests > 0 else 0
+
+        return {
+            "memory_hits": self._memory_hits,
+            "redis_hits": self._redis_hits,
+            "misses": self._misses,
+            "hit_rate_percent": round(hit_rate, 2),
+            "evictions": self._evictions,
+            "memory_entries": len(self._lru),
+            "memory_bytes": self._lru_bytes,
+            "memory_max_bytes": self.max_bytes,
+            "memory_limit": self.max_entries,
+            "redis_enabled": self._redis is not None,
+            "redis_errors": self._redis_errors
+        }
+
+    def clear(self) -> None:
+        """Clear the in-process tier and reset metrics."""
+        self._lru.clear()
+        self._lru_bytes = 0
+        self._memory_hits = 0
+        self._redis_hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._redis_errors = 0
+        logger.info("Embedding cache cleared")
+
+    def _lru_get(self, key: str) -> Optional[List[float]]:
+        vector = self._lru.get(key)
+        if vector is None:
+            return None
+        self._lru.move_to_end(key)
+        return vector.tolist()
+
+    def _lru_set(self, key: str, vector: array) -> None:
+        size = len(vector) * vector.itemsize
+        if size > self.max_bytes:
+            return
+
+        previous = self._lru.pop(key, None)
+        if previous is not None:
+            self._lru_bytes -= len(previous) * previous.itemsize
+
+        self._lru[key] = vector
+        self._lru_bytes += size
+        while self._lru_bytes > self.max_bytes or (self.max_entries is not None and len(self._lru) > self.max_entries):
+            _, evicted = self._lru.popitem(last=False)
+            self._lru_bytes -= len(evicted) * evicted.itemsize
+            self._evictions += 1
+
+    def _redis_key(self, key: str) -> str:
+        return f"{self.key_prefix}:{key}"
+
+    @staticmethod
+    def _encode(embedding: List[float]) -> bytes:
+        # float32 is what pgvector stores, so nothing is lost by caching at that precision
+        return array("f", embedding).tobytes()
+
+    @staticmethod
+    def _decode(payload: bytes) -> array:
+        values = array("f")
+        values.frombytes(payload)
+        return values
+
+    @staticmethod
+    def _create_redis_client(redis_url: str):
+        try:
+            import redis.asyncio as redis_asyncio
+            return redis_asyncio.from_url(redis_url)
+        except Exception as e:
+            logger.warning(f"Embedding cache Redis tier unavailable, using memory only: {e}")
+            return None
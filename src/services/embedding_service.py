@@ -8,12 +8,14 @@ import logging
 import asyncio
 from typing import List, Dict, Any, Optional
 from datetime import datetime
-import tiktoken
 
 import openai
 from openai import AsyncOpenAI
 
 from config.settings import settings
+from src.services.embedding_cache import EmbeddingCache
+from src.services.embedding_batcher import EmbeddingMicroBatcher
+from src.services.tokenizer_service import tokenizer_service
 
 logger = logging.getLogger(__name__)
 
@@ -29,12 +31,28 @@ class EmbeddingService:
         self.max_tokens = 8191  # Model limit
         self.batch_size = 100   # API rate limiting
         
-        # Initialize tokenizer for cost estimation
-        try:
-            self.tokenizer = tiktoken.encoding_for_model("text-embedding-3-large")
-        except Exception:
-            # Fallback tokenizer
-            self.tokenizer = tiktoken.get_encoding("cl100k_base")
+        # Shared tokenizer (text-embedding-3-large uses cl100k_base) for truncation and cost estimation
+        self.tokenizer = tokenizer_service
+        
+        # Content-hash cache in front of the embeddings API
+        self.cache = None
+        if settings.embedding_cache_enabled:
+            self.cache = EmbeddingCache(
+                model=self.model,
+                dimensions=self.dimensions,
+                max_bytes=settings.embedding_cache_max_bytes,
+                redis_url=settings.redis_url if settings.embedding_cache_redis_enabled else None,
+                redis_ttl_seconds=settings.embedding_cache_ttl_seconds
+            )
+        
+        # Coalesce concurrent single-text requests into batched API calls
+        self.batcher = None
+        if settings.embedding_batching_enabled:
+            self.batcher = EmbeddingMicroBatcher(
+                embed_batch=self._embed_coalesced_batch,
+                window_ms=settings.embedding_batch_window_ms,
+                max_batch_size=min(settings.embedding_batch_max_size, self.batch_size)
+            )
     
     def prepare_text_for_embedding(self, title: str, content: str, 
                                  content_type: str = None, 
@@ -75,21 +93,20 @@ class EmbeddingService:
         combined_text = "\n\n".join(combined_parts)
         
         # Truncate if too long (leave buffer for safety)
-        tokens = self.tokenizer.encode(combined_text)
-        if len(tokens) > self.max_tokens - 100:
-            # Truncate tokens and decode back
-            truncated_tokens = tokens[:self.max_tokens - 100]
-            combined_text = self.tokenizer.decode(truncated_tokens)
-            logger.warning(f"Text truncated from {len(tokens)} to {len(truncated_tokens)} tokens")
+        truncated_text = self.tokenizer.truncate(combined_text, self.max_tokens - 100)
+        if truncated_text != combined_text:
+            logger.warning(f"Text truncated to {self.max_tokens - 100} tokens")
+            combined_text = truncated_text
         
         return combined_text
     
-    async def generate_embedding(self, text: str) -> Optional[List[float]]:
+    async def generate_embedding(self, text: str, use_cache: bool = True) -> Optional[List[float]]:
         """
         Generate embedding for a single text.
         
         Args:
             text: Text to embed
+            use_cache: Read and fill the embedding cache (False for one-off document texts)
             
         Returns:
             Embedding vector or None if failed
@@ -99,19 +116,30 @@ class EmbeddingService:
                 logger.warning("Empty text provided for embedding")
                 return None
             
-            response = await self.client.embeddings.create(
-                model=self.model,
-                input=text,
-                dimensions=self.dimensions
-            )
-            
-            embedding = response.data[0].embedding
+            if use_cache and self.cache is not None:
+                cached_embedding = await self.cache.get(text)
+                if cached_embedding is not None:
+                    return cached_embedding
             
-            # Log token usage for cost tracking
-            token_count = response.usage.total_tokens
-            cost = self.estimate_cost(token_count)
+            if self.batcher is not None:
+                embedding = await self.batcher.submit(text)
+            else:
+                response = await self.client.embeddings.create(
+                    model=self.model,
+                    input=text,
+                    dimensions=self.dimensions
+                )
+                
+                embedding = response.data[0].embedding
+                
+                # Log token usage for cost tracking
+                token_count = response.usage.total_tokens
+                cost = self.estimate_cost(token_count)
+                
+                logger.info(f"Generated embedding: {token_count} tokens, ${cost:.6f}")
             
-            logger.info(f"Generated embedding: {token_count} tokens, ${cost:.6f}")
+            if use_cache and self.cache is not None:
+                await self.cache.set(text, embedding)
             
             return embedding
             
@@ -119,12 +147,22 @@ class EmbeddingService:
             logger.error(f"Error generating embedding: {str(e)}")
             return None
     
-    async def generate_batch_embeddings(self, texts: List[str]) -> List[Optional[List[float]]]:
+    async def generate_batch_embeddings(
+        self,
+        texts: List[str],
+        use_cache: bool = True
+    ) -> List[Optional[List[float]]]:
         """
         Generate embeddings for multiple texts in batch.
         
+        Cached texts are served from the embedding cache; only the remaining
+        unique texts are sent to the API. Bulk document vectorization passes
+        use_cache=False so one-off document vectors do not evict hot query
+        embeddings.
+        
         Args:
             texts: List of texts to embed
+            use_cache: Read and fill the embedding cache
             
         Returns:
             List of embedding vectors (None for failed items)
@@ -132,6 +170,39 @@ class EmbeddingService:
         if not texts:
             return []
         
+        if not use_cache or self.cache is None:
+            return await self._generate_batch_embeddings_uncached(texts)
+        
+        embeddings = await self.cache.get_many(texts)
+        missing_indices = [i for i, embedding in enumerate(embeddings) if embedding is None]
+        
+        if missing_indices:
+            unique_texts = list(dict.fromkeys(texts[i] for i in missing_indices))
+            generated = await self._generate_batch_embeddings_uncached(unique_texts)
+            await self.cache.set_many(unique_texts, generated)
+            
+            generated_by_text = dict(zip(unique_texts, generated))
+            for i in missing_indices:
+                embeddings[i] = generated_by_text[texts[i]]
+        
+        return embeddings
+    
+    async def _embed_coalesced_batch(self, texts: List[str]) -> List[List[float]]:
+        """Embed a micro-batch of concurrent single-text requests in one API call."""
+        response = await self.client.embeddings.create(
+            model=self.model,
+            input=texts,
+            dimensions=self.dimensions
+        )
+        
+        token_count = response.usage.total_tokens
+        cost = self.estimate_cost(token_count)
+        logger.info(f"Generated embeddings: {len(texts)} coalesced requests, {token_count} tokens, ${cost:.6f}")
+        
+        return [item.embedding for item in response.data]
+    
+    async def _generate_batch_embeddings_uncached(self, texts: List[str]) -> List[Optional[List[float]]]:
+        """Generate embeddings for texts directly through the API."""
         try:
             # Process in batches to respect API limits
             all_embeddings = []
@@ -170,13 +241,25 @@ class EmbeddingService:
             logger.error(f"Error in batch embedding generation: {str(e)}")
             return [None] * len(texts)
     
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Embedding cache hit/miss metrics."""
+        if self.cache is None:
+            return {"enabled": False}
+        return {"enabled": True, **self.cache.get_stats()}
+    
+    def get_batching_stats(self) -> Dict[str, Any]:
+        """Request coalescing metrics."""
+        if self.batcher is None:
+            return {"enabled": False}
+        return {"enabled": True, **self.batcher.get_stats()}
+    
     def count_tokens(self, text: str) -> int:
         """Count tokens in text for cost estimation."""
-        try:
-            return len(self.tokenizer.encode(text))
-        except Exception:
-            # Rough estimation if tokenizer fails
-            return len(text.split()) * 1.3
+        return self.tokenizer.count_tokens(text)
+    
+    def count_tokens_many(self, texts: List[str]) -> List[int]:
+        """Count tokens for several texts with one batched encode."""
+        return self.tokenizer.count_many(texts)
     
     def estimate_cost(self, token_count: int) -> float:
         """
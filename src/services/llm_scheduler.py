@@ -0,0 +1,231 @@
+# LLM Scheduler
+"""
+Admission control for Claude calls. Caps concurrent requests, spends a
+tokens-per-minute budget, and orders waiting calls by priority class
+(interactive chat before compliance review before background summarization)
+with round-robin fair queuing between advisors inside each class, so one
+advisor's burst of document uploads cannot starve everyone else's chat.
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from enum import IntEnum
+from typing import Any, AsyncIterator, Deque, Dict, Optional
+
+from src.services.rate_limiter import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+
+class LLMPriority(IntEnum):
+    """Priority classes; lower values are served first."""
+    INTERACTIVE = 0
+    COMPLIANCE_REVIEW = 1
+    BACKGROUND = 2
+
+
+class _Waiter:
+    """A queued call waiting for admission."""
+
+    __slots__ = ("future", "priority", "advisor", "tokens", "enqueued_at")
+
+    def __init__(self, future: asyncio.Future, priority: LLMPriority, advisor: str, tokens: int):
+        self.future = future
+        self.priority = priority
+        self.advisor = advisor
+        self.tokens = tokens
+        self.enqueued_at = time.monotonic()
+
+
+class LLMScheduler:
+    """Priority- and fairness-aware concurrency and token budget for LLM calls."""
+
+    def __init__(
+        self,
+        max_concurrent: int = 32,
+        tokens_per_minute: Optional[int] = None,
+        enabled: bool = True
+    ):
+        """
+        Args:
+            max_concurrent: Calls in flight at once
+            tokens_per_minute: Token budget (None = unlimited)
+            enabled: When False calls are admitted immediately
+        """
+        self.max_concurrent = max_concurrent
+        self.tokens = TokenBucket.per_minute(tokens_per_minute) if tokens_per_minute else None
+        self.enabled = enabled
+
+        self._in_flight = 0
+        # priority -> advisor -> FIFO of waiters; advisors are served round-robin
+        self._queues: Dict[LLMPriority, "OrderedDict[str, Deque[_Waiter]]"] = {
+            priority: OrderedDict() for priority in LLMPriority
+        }
+        self._budget_timer: Optional[asyncio.TimerHandle] = None
+
+        # Metrics per priority class
+        self._admitted = {priority: 0 for priority in LLMPriority}
+        self._queued = {priority: 0 for priority in LLMPriority}  # Admissions that had to wait
+        self._total_wait = {priority: 0.0 for priority in LLMPriority}
+        self._max_wait = {priority: 0.0 for priority in LLMPriority}
+        self._max_queue_depth = 0
+
+    @asynccontextmanager
+    async def slot(
+        self,
+        priority: LLMPriority = LLMPriority.INTERACTIVE,
+        advisor_id: Optional[str] = None,
+        tokens: int = 0
+    ) -> AsyncIterator[None]:
+        """Hold a concurrency slot for the duration of a call."""
+        await self.acquire(priority, advisor_id, tokens)
+        try:
+            yield
+        finally:
+            self.release()
+
+    async def acquire(
+        self,
+        priority: LLMPriority = LLMPriority.INTERACTIVE,
+        advisor_id: Optional[str] = None,
+        tokens: int = 0
+    ) -> float:
+        """
+        Wait for admission, then take a concurrency slot and the estimated tokens.
+
+        Every successful acquire must be paired with release().
+
+        Returns:
+            Seconds spent waiting
+        """
+        if not self.enabled:
+            return 0.0
+
+        waiter = _Waiter(asyncio.get_running_loop().create_future(), priority, advisor_id or "anonymous", tokens)
+        self._queues[priority].setdefault(waiter.advisor, deque()).append(waiter)
+        self._dispatch()
+        if not waiter.future.done():
+            self._queued[priority] += 1
+            self._max_queue_depth = max(self._max_queue_depth, self.queue_depth)
+
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # Admitted just as the caller gave up: hand the slot back
+                self.release()
+            else:
+                self._discard(waiter)
+            raise
+
+        waited = time.monotonic() - waiter.enqueued_at
+        self._total_wait[priority] += waited
+        self._max_wait[priority] = max(self._max_wait[priority], waited)
+        return waited
+
+    def release(self) -> None:
+        """Free a concurrency slot and admit the next waiter."""
+        if not self.enabled:
+            return
+        self._in_flight -= 1
+        self._dispatch()
+
+    def charge(self, tokens: int) -> None:
+        """Spend tokens used beyond the admission estimate (e.g. generated output)."""
+        if self.enabled and self.tokens and tokens > 0:
+            self.tokens.consume(tokens)
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(len(waiters) for queue in self._queues.values() for waiters in queue.values())
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Queue depth, wait time and budget metrics."""
+        by_priority = {}
+        for priority in LLMPriority:
+            admitted = self._admitted[priority]
+            by_priority[priority.name.lower()] = {
+                "queue_depth": sum(len(waiters) for waiters in self._queues[priority].values()),
+                "waiting_advisors": len(self._queues[priority]),
+                "admitted": admitted,
+                "queued": self._queued[priority],
+                "avg_wait_ms": round(self._total_wait[priority] / admitted * 1000, 2) if admitted else 0.0,
+                "max_wait_ms": round(self._max_wait[priority] * 1000, 2)
+            }
+        return {
+            "enabled": self.enabled,
+            "in_flight": self._in_flight,
+            "max_concurrent": self.max_concurrent,
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self._max_queue_depth,
+            "tokens_available": round(self.tokens.available, 2) if self.tokens else None,
+            "priorities": by_priority
+        }
+
+    def _dispatch(self) -> None:
+        """Admit waiters in priority order while slots and token budget allow."""
+        while self._in_flight < self.max_concurrent:
+            waiter = self._next_waiter()
+            if waiter is None:
+                return
+            if waiter.future.done():
+                # Cancelled caller that has not been discarded yet
+                self._pop(waiter)
+                continue
+
+            if self.tokens:
+                wait = self.tokens.wait_time(waiter.tokens)
+                if wait > 0:
+                    # Budget exhausted: the head waiter keeps its place until the bucket refills
+                    self._schedule_budget_retry(wait)
+                    return
+                self.tokens.consume(waiter.tokens)
+
+            self._pop(waiter)
+            self._in_flight += 1
+            self._admitted[waiter.priority] += 1
+            waiter.future.set_result(None)
+
+    def _next_waiter(self) -> Optional[_Waiter]:
+        # Highest priority class first; within a class, the advisor at the front of the rotation
+        for priority in LLMPriority:
+            queue = self._queues[priority]
+            if queue:
+                return next(iter(queue.values()))[0]
+        return None
+
+    def _pop(self, waiter: _Waiter) -> None:
+        queue = self._queues[waiter.priority]
+        waiters = queue[waiter.advisor]
+        waiters.popleft()
+        if waiters:
+            # Rotate: this advisor's next call goes behind the other waiting advisors
+            queue.move_to_end(waiter.advisor)
+        else:
+            del queue[waiter.advisor]
+
+    def _discard(self, waiter: _Waiter) -> None:
+        queue = self._queues[waiter.priority]
+        waiters = queue.get(waiter.advisor)
+        if waiters is None:
+            return
+        try:
+            waiters.remove(waiter)
+        except ValueError:
+            return
+        if not waiters:
+            del queue[waiter.advisor]
+        self._dispatch()
+
+    def _schedule_budget_retry(self, delay: float) -> None:
+        if self._budget_timer is not None and not self._budget_timer.cancelled():
+            return
+
+        def retry() -> None:
+            self._budget_timer = None
+            self._dispatch()
+
+        self._budget_timer = asyncio.get_running_loop().call_later(delay, retry)
@@ -0,0 +1,75 @@
+# MMR Reranker
+"""
+Maximal marginal relevance selection over retrieved candidates. Picks a
+diverse top-k by trading query relevance against similarity to the results
+already picked, so near-duplicate examples do not crowd out the prompt budget.
+Candidates are scored in one matrix at a time: each pick costs a single
+matrix-vector product over the candidate embeddings.
+"""
+
+import logging
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def maximal_marginal_relevance(
+    query_embedding: Sequence[float],
+    candidate_embeddings: Sequence[Sequence[float]],
+    limit: int,
+    lambda_mult: float = 0.7,
+    relevance_scores: Optional[Sequence[float]] = None
+) -> List[int]:
+    """
+    Greedy MMR selection.
+
+    Each step picks the candidate maximizing
+    lambda_mult * relevance - (1 - lambda_mult) * max similarity to the picked ones.
+
+    Args:
+        query_embedding: Query vector
+        candidate_embeddings: One vector per candidate
+        limit: Number of candidates to select
+        lambda_mult: 1.0 = pure relevance order, 0.0 = maximum diversity
+        relevance_scores: Precomputed query similarities (e.g. from the
+            database); computed from the embeddings when omitted
+
+    Returns:
+        Indexes of the selected candidates, in selection order
+    """
+    candidates = np.asarray(candidate_embeddings, dtype=np.float32)
+    count = candidates.shape[0] if candidates.ndim == 2 else 0
+    if count == 0 or limit <= 0:
+        return []
+
+    norms = np.linalg.norm(candidates, axis=1)
+    norms[norms == 0] = 1.0
+    candidates = candidates / norms[:, None]
+
+    if relevance_scores is None:
+        query = np.asarray(query_embedding, dtype=np.float32)
+        query_norm = float(np.linalg.norm(query))
+        relevance = candidates @ (query / query_norm) if query_norm else np.zeros(count, dtype=np.float32)
+    else:
+        relevance = np.asarray(relevance_scores, dtype=np.float32)
+
+    k = min(limit, count)
+    selected = np.empty(k, dtype=np.intp)
+    scores = np.empty(count, dtype=np.float32)
+
+    # First pick is the most relevant; redundancy is then the max similarity to any pick
+    selected[0] = int(np.argmax(relevance))
+    redundancy = candidates @ candidates[selected[0]]
+
+    # Relevance term is fixed; only the redundancy term changes between picks
+    weighted_relevance = lambda_mult * relevance
+    for step in range(1, k):
+        np.subtract(weighted_relevance, (1.0 - lambda_mult) * redundancy, out=scores)
+        scores[selected[:step]] = -np.inf
+        best = int(np.argmax(scores))
+        selected[step] = best
+        np.maximum(redundancy, candidates @ candidates[best], out=redundancy)
+
+    return selected.tolist()
@@ -10,13 +10,44 @@ This service manages all AI prompts across the platform including:
 All system prompts should be defined here for consistency and maintainability.
 """
 
-from typing import Dict, Optional, List
+from typing import Dict, Optional, List, Sequence
 from enum import Enum
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+# Static generation requirements; free of per-request details so they stay in the cacheable prefix
+WARREN_GENERATION_REQUIREMENTS = """GENERATION REQUIREMENTS (for the requested marketing content):
+1. Follows all SEC Marketing Rule and FINRA 2210 requirements
+2. Includes appropriate disclaimers and risk disclosures
+3. Uses educational tone rather than promotional claims
+4. Avoids performance predictions or guarantees
+5. Is appropriate for the specified platform/content type
+6. References the style and structure of the approved examples
+
+Remember to wrap your final marketing content in ##MARKETINGCONTENT## delimiters."""
+
+
+class CacheablePrompt(str):
+    """
+    Complete prompt text that also records its stable prefix.
+    
+    Behaves as the full prompt wherever a string is expected. ClaudeService
+    sends the stable blocks (system prompt, generation requirements,
+    disclaimers) as system blocks marked for provider-side prompt caching
+    and only the per-request text as the user message, so repeat calls with
+    the same prefix skip re-processing it.
+    """
+    
+    def __new__(cls, stable_blocks: Sequence[str], request: str):
+        stable_blocks = [block for block in stable_blocks if block]
+        prompt = super().__new__(cls, "\n\n".join([*stable_blocks, request]))
+        prompt.stable_blocks = stable_blocks
+        prompt.request = request
+        return prompt
+
+
 class AIService(Enum):
     """Supported AI services for prompt management."""
     WARREN = "warren"
@@ -0,0 +1,122 @@
+# Rate Limiter
+"""
+Asyncio token-bucket rate limiting for outbound AI API calls.
+Supports combined requests-per-minute and tokens-per-minute budgets.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Token bucket that refills continuously up to its capacity."""
+
+    def __init__(self, capacity: float, refill_per_second: float):
+        """
+        Args:
+            capacity: Maximum burst size
+            refill_per_second: Sustained rate
+        """
+        self.capacity = float(capacity)
+        self.refill_per_second = float(refill_per_second)
+        self._tokens = float(capacity)
+        self._updated_at = time.monotonic()
+
+    @classmethod
+    def per_minute(cls, amount_per_minute: float) -> "TokenBucket":
+        """Bucket allowing amount_per_minute with a one-minute burst."""
+        return cls(capacity=amount_per_minute, refill_per_second=amount_per_minute / 60)
+
+    @property
+    def available(self) -> float:
+        """Tokens currently available."""
+        self._refill()
+        return self._tokens
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until amount tokens are available (0 if available now)."""
+        self._refill()
+        amount = min(amount, self.capacity)
+        if self._tokens >= amount:
+            return 0.0
+        return (amount - self._tokens) / self.refill_per_second
+
+    def consume(self, amount: float) -> None:
+        """Take tokens without waiting (may go negative, repaid by refill)."""
+        self._refill()
+        self._tokens -= min(amount, self.capacity)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._updated_at
+        self._updated_at = now
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.refill_per_second)
+
+
+class RateLimiter:
+    """Combined requests-per-minute / tokens-per-minute limiter."""
+
+    def __init__(
+        self,
+        requests_per_minute: Optional[int] = None,
+        tokens_per_minute: Optional[int] = None
+    ):
+        """
+        Args:
+            requests_per_minute: Request budget (None = unlimited)
+            tokens_per_minute: Token budget (None = unlimited)
+        """
+        self.requests = TokenBucket.per_minute(requests_per_minute) if requests_per_minute else None
+        self.tokens = TokenBucket.per_minute(tokens_per_minute) if tokens_per_minute else None
+        self._lock = asyncio.Lock()
+
+        # Metrics
+        self._acquired = 0
+        self._throttled = 0
+        self._total_wait_seconds = 0.0
+
+    async def acquire(self, tokens: int = 0, requests: int = 1) -> float:
+        """
+        Wait until both budgets allow the call, then consume from them.
+
+        Callers are served in arrival order.
+
+        Returns:
+            Seconds spent waiting
+        """
+        async with self._lock:
+            waited = 0.0
+            while True:
+                wait = max(
+                    self.requests.wait_time(requests) if self.requests else 0.0,
+                    self.tokens.wait_time(tokens) if self.tokens else 0.0
+                )
+                if wait <= 0:
+                    break
+                waited += wait
+                await asyncio.sleep(wait)
+
+            if self.requests:
+                self.requests.consume(requests)
+            if self.tokens:
+                self.tokens.consume(tokens)
+
+            self._acquired += 1
+            if waited > 0:
+                self._throttled += 1
+                self._total_wait_seconds += waited
+            return waited
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Throttling metrics."""
+        return {
+            "acquired": self._acquired,
+            "throttled": self._throttled,
+            "total_wait_seconds": round(self._total_wait_seconds, 3),
+            "requests_available": round(self.requests.available, 2) if self.requests else None,
+            "tokens_available": round(self.tokens.available, 2) if self.tokens else None
+        }
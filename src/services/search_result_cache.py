@@ -0,0 +1,200 @@
+# Search Result Cache
+"""
+In-process cache for marketing content, compliance rule and disclaimer
+searches. Entries are keyed by search method plus normalized arguments (query
+text, content type, threshold, limit...), expire after a TTL, and are
+invalidated in bulk by per-table version counters that content and rule
+writes bump.
+"""
+
+import functools
+import inspect
+import logging
+import time
+import unicodedata
+from collections import OrderedDict
+from enum import Enum
+from typing import List, Dict, Any, Tuple, Callable, Awaitable, Sequence
+
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+MARKETING_CONTENT = "marketing_content"
+COMPLIANCE_RULES = "compliance_rules"
+
+
+class SearchResultCache:
+    """TTL + version-invalidated LRU of search results."""
+
+    def __init__(self, ttl_seconds: float = 300.0, max_entries: int = 2000, enabled: bool = True):
+        """
+        Initialize the cache.
+
+        Args:
+            ttl_seconds: Maximum age of a cached result
+            max_entries: Entries kept before least recently used ones are evicted
+            enabled: When False every lookup goes straight to the search
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.enabled = enabled
+
+        # key -> (versions at search time, expires_at, results)
+        self._entries: "OrderedDict[Tuple, Tuple[Tuple[int, ...], float, List[Dict[str, Any]]]]" = OrderedDict()
+        self._versions: Dict[str, int] = {}
+
+        # Metrics, per search method
+        self._hits: Dict[str, int] = {}
+        self._misses: Dict[str, int] = {}
+        self._expired = 0
+        self._invalidated = 0
+        self._evictions = 0
+
+    @staticmethod
+    def normalize_value(value: Any) -> Any:
+        """Key form of an argument: text is NFC-normalized, case-folded and whitespace-collapsed."""
+        if isinstance(value, Enum):
+            value = value.value
+        if isinstance(value, str):
+            return " ".join(unicodedata.normalize("NFC", value).casefold().split())
+        if isinstance(value, list):
+            return tuple(value)
+        return value
+
+    def make_key(self, method: str, params: Dict[str, Any]) -> Tuple:
+        return (method,) + tuple(sorted((name, self.normalize_value(value)) for name, value in params.items()))
+
+    def version_of(self, tables: Sequence[str]) -> Tuple[int, ...]:
+        return tuple(self._versions.get(table, 0) for table in tables)
+
+    def bump_version(self, *tables: str) -> None:
+        """Invalidate every cached result that depends on the given tables."""
+        for table in tables:
+            self._versions[table] = self._versions.get(table, 0) + 1
+
+    async def get_or_search(
+        self,
+        method: str,
+        tables: Sequence[str],
+        params: Dict[str, Any],
+        search: Callable[[], Awaitable[List[Dict[str, Any]]]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Return cached results for method(params), or run the search and cache them.
+
+        Empty results are not cached: the search methods also return [] on
+        errors, and a transient failure must not be served for a whole TTL.
+        """
+        if not self.enabled:
+            return await search()
+
+        key = self.make_key(method, params)
+        entry = self._entries.get(key)
+        if entry is not None:
+            versions, expires_at, results = entry
+            if versions != self.version_of(tables):
+                self._invalidated += 1
+                del self._entries[key]
+            elif expires_at <= time.monotonic():
+                self._expired += 1
+                del self._entries[key]
+            else:
+                self._entries.move_to_end(key)
+                self._hits[method] = self._hits.get(method, 0) + 1
+                return self._copy(results)
+
+        self._misses[method] = self._misses.get(method, 0) + 1
+        # Versions are read before searching so a write during the search makes the entry stale
+        versions = self.version_of(tables)
+        results = await search()
+
+        if results:
+            self._entries[key] = (versions, time.monotonic() + self.ttl_seconds, self._copy(results))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+        return results
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._hits.clear()
+        self._misses.clear()
+        self._expired = 0
+        self._invalidated = 0
+        self._evictions = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit-rate metrics overall and per search method."""
+        hits = sum(self._hits.values())
+        misses = sum(self._misses.values())
+        methods = sorted(set(self._hits) | set(self._misses))
+
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate_percent": self._hit_rate(hits, misses),
+            "expired": self._expired,
+            "invalidated": self._invalidated,
+            "evictions": self._evictions,
+            "versions": dict(self._versions),
+            "by_method": {
+                method: {
+                    "hits": self._hits.get(method, 0),
+                    "misses": self._misses.get(method, 0),
+                    "hit_rate_percent": self._hit_rate(self._hits.get(method, 0), self._misses.get(method, 0))
+                }
+                for method in methods
+            }
+        }
+
+    @staticmethod
+    def _hit_rate(hits: int, misses: int) -> float:
+        total = hits + misses
+        return round(hits / total * 100, 2) if total else 0.0
+
+    @staticmethod
+    def _copy(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        # Callers annotate/merge result dicts; never hand out the cached ones
+        return [dict(result) for result in results]
+
+
+# Process-wide cache shared by VectorSearchService and WarrenDatabaseService
+search_result_cache = SearchResultCache(
+    ttl_seconds=settings.search_result_cache_ttl_seconds,
+    max_entries=settings.search_result_cache_max_entries,
+    enabled=settings.search_result_cache_enabled
+)
+
+
+def cached_search(*tables: str, ignore: Tuple[str, ...] = ("query_embedding",)):
+    """
+    Cache an async search method's results in search_result_cache.
+
+    The key is the method plus all bound arguments except self and the ignored
+    ones (e.g. a precomputed query embedding of the same query text). Results
+    are invalidated when any of the given tables' versions are bumped.
+    """
+    def decorator(method):
+        signature = inspect.signature(method)
+
+        @functools.wraps(method)
+        async def wrapper(self, *args, **kwargs):
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            params = {
+                name: value for name, value in bound.arguments.items()
+                if name != "self" and name not in ignore
+            }
+            return await search_result_cache.get_or_search(
+                method.__qualname__, tables, params, lambda: method(self, *args, **kwargs)
+            )
+
+        return wrapper
+    return decorator
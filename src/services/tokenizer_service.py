@@ -0,0 +1,255 @@
+# Tokenizer Service
+"""
+Process-wide tiktoken tokenizer shared by every token-counting caller.
+Loads each encoding once (from a local cache directory so no network is
+needed at runtime), keeps a bounded LRU of token counts and exposes threaded
+batch encoding.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Sequence
+
+import tiktoken
+
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+
+class TokenizerService:
+    """Shared tokenizer with cached counts and an approximation fallback."""
+
+    def __init__(
+        self,
+        encoding_name: str = "cl100k_base",
+        cache_dir: Optional[str] = None,
+        cache_max_entries: int = 10000,
+        batch_threads: int = 4
+    ):
+        """
+        Initialize the tokenizer service. Encodings load lazily (or via preload()).
+
+        Args:
+            encoding_name: Default tiktoken encoding
+            cache_dir: Directory holding vendored tiktoken BPE files (TIKTOKEN_CACHE_DIR)
+            cache_max_entries: Size of the token-count LRU
+            batch_threads: Threads used by encode_batch / count_many
+        """
+        self.encoding_name = encoding_name
+        self.cache_dir = self._resolve_cache_dir(cache_dir)
+        self.cache_max_entries = cache_max_entries
+        self.batch_threads = batch_threads
+
+        self._encodings: Dict[str, Any] = {}
+        self._failed_encodings: set = set()
+        self._load_lock = threading.Lock()
+        self._count_cache: "OrderedDict[str, int]" = OrderedDict()
+
+        # Metrics
+        self._cache_hits = 0
+        self._cache_misses = 0
+        self._fallback_counts = 0
+
+    def preload(self, encoding_names: Optional[Sequence[str]] = None) -> Dict[str, bool]:
+        """
+        Load encodings up front (e.g. at application startup).
+
+        Returns:
+            Encoding name -> whether it loaded
+        """
+        return {
+            name: self.get_encoding(name) is not None
+            for name in (encoding_names or [self.encoding_name])
+        }
+
+    def get_encoding(self, encoding_name: Optional[str] = None):
+        """Shared tiktoken Encoding, or None when it cannot be loaded."""
+        name = encoding_name or self.encoding_name
+        encoding = self._encodings.get(name)
+        if encoding is not None or name in self._failed_encodings:
+            return encoding
+
+        with self._load_lock:
+            if name in self._encodings or name in self._failed_encodings:
+                return self._encodings.get(name)
+            try:
+                if self.cache_dir:
+                    os.environ.setdefault("TIKTOKEN_CACHE_DIR", self.cache_dir)
+                encoding = tiktoken.get_encoding(name)
+                self._encodings[name] = encoding
+                logger.info(f"Tokenizer loaded tiktoken encoding {name}")
+                return encoding
+            except Exception as e:
+                # Remember the failure so each call doesn't retry a download
+                self._failed_encodings.add(name)
+                logger.warning(f"Could not load tiktoken encoding {name}, using approximation: {e}")
+                return None
+
+    def count_tokens(self, text: str, encoding_name: Optional[str] = None, use_cache: bool = True) -> int:
+        """Count tokens in text (1 token ≈ 4 characters when no encoding is available)."""
+        if not text:
+            return 0
+
+        if not use_cache:
+            return self._count_uncached(text, encoding_name)
+
+        key = self._cache_key(text, encoding_name)
+        count = self._cache_get(key)
+        if count is not None:
+            self._cache_hits += 1
+            return count
+
+        self._cache_misses += 1
+        count = self._count_uncached(text, encoding_name)
+        self._cache_set(key, count)
+        return count
+
+    def count_many(self, texts: Sequence[str], encoding_name: Optional[str] = None) -> List[int]:
+        """Count tokens for several texts, batch-encoding the cache misses on worker threads."""
+        counts: List[Optional[int]] = [None] * len(texts)
+        misses: Dict[str, List[int]] = {}
+
+        for i, text in enumerate(texts):
+            if not text:
+                counts[i] = 0
+                continue
+            key = self._cache_key(text, encoding_name)
+            count = self._cache_get(key)
+            if count is not None:
+                self._cache_hits += 1
+                counts[i] = count
+            else:
+                self._cache_misses += 1
+                misses.setdefault(text, []).append(i)
+
+        if misses:
+            miss_texts = list(misses.keys())
+            miss_counts = [len(tokens) for tokens in self.encode_batch(miss_texts, encoding_name)]
+            for text, count in zip(miss_texts, miss_counts):
+                self._cache_set(self._cache_key(text, encoding_name), count)
+                for i in misses[text]:
+                    counts[i] = count
+
+        return counts
+
+    def encode(self, text: str, encoding_name: Optional[str] = None) -> List[int]:
+        """Encode text to token ids (special-token text is treated as ordinary text)."""
+        encoding = self.get_encoding(encoding_name)
+        if encoding is None:
+            raise RuntimeError(f"Tokenizer encoding {encoding_name or self.encoding_name} unavailable")
+        return encoding.encode_ordinary(text)
+
+    def encode_batch(self, texts: Sequence[str], encoding_name: Optional[str] = None) -> List[List[int]]:
+        """
+        Encode several texts using tiktoken's threaded batch encoder.
+
+        Without an encoding, returns placeholder token lists sized by the
+        character approximation so callers can still take len().
+        """
+        encoding = self.get_encoding(encoding_name)
+        if encoding is not None:
+            try:
+                return encoding.encode_ordinary_batch(list(texts), num_threads=self.batch_threads)
+            except Exception as e:
+                logger.warning(f"Tiktoken batch encoding failed, using fallback: {e}")
+
+        self._fallback_counts += len(texts)
+        return [[0] * self.approximate_tokens(text) for text in texts]
+
+    def decode(self, tokens: List[int], encoding_name: Optional[str] = None) -> str:
+        """Decode token ids back to text."""
+        encoding = self.get_encoding(encoding_name)
+        if encoding is None:
+            raise RuntimeError(f"Tokenizer encoding {encoding_name or self.encoding_name} unavailable")
+        return encoding.decode(tokens)
+
+    def truncate(self, text: str, max_tokens: int, encoding_name: Optional[str] = None) -> str:
+        """Truncate text to at most max_tokens (by characters when no encoding is available)."""
+        encoding = self.get_encoding(encoding_name)
+        if encoding is None:
+            return text[:max_tokens * 4]
+
+        tokens = encoding.encode_ordinary(text)
+        if len(tokens) <= max_tokens:
+            return text
+        return encoding.decode(tokens[:max_tokens])
+
+    @staticmethod
+    def approximate_tokens(text: str) -> int:
+        """Rough approximation: 1 token ≈ 4 characters."""
+        return len(text) // 4
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Cache and encoding metrics."""
+        total_requests = self._cache_hits + self._cache_misses
+        hit_rate = (self._cache_hits / total_requests * 100) if total_requests > 0 else 0
+
+        return {
+            "encodings_loaded": list(self._encodings.keys()),
+            "encodings_failed": list(self._failed_encodings),
+            "cache_hits": self._cache_hits,
+            "cache_misses": self._cache_misses,
+            "hit_rate_percent": round(hit_rate, 2),
+            "cache_size": len(self._count_cache),
+            "cache_limit": self.cache_max_entries,
+            "fallback_counts": self._fallback_counts
+        }
+
+    def clear_cache(self) -> None:
+        """Clear cached counts and reset metrics (loaded encodings are kept)."""
+        self._count_cache.clear()
+        self._cache_hits = 0
+        self._cache_misses = 0
+        self._fallback_counts = 0
+
+    def _count_uncached(self, text: str, encoding_name: Optional[str]) -> int:
+        encoding = self.get_encoding(encoding_name)
+        if encoding is not None:
+            try:
+                return len(encoding.encode_ordinary(text))
+            except Exception as e:
+                logger.warning(f"Tiktoken encoding failed, using fallback: {e}")
+
+        self._fallback_counts += 1
+        return self.approximate_tokens(text)
+
+    def _cache_key(self, text: str, encoding_name: Optional[str]) -> str:
+        digest = hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+        return f"{encoding_name or self.encoding_name}:{digest}"
+
+    def _cache_get(self, key: str) -> Optional[int]:
+        count = self._count_cache.get(key)
+        if count is not None:
+            self._count_cache.move_to_end(key)
+        return count
+
+    def _cache_set(self, key: str, count: int) -> None:
+        self._count_cache[key] = count
+        self._count_cache.move_to_end(key)
+        while len(self._count_cache) > self.cache_max_entries:
+            self._count_cache.popitem(last=False)
+
+    @staticmethod
+    def _resolve_cache_dir(cache_dir: Optional[str]) -> Optional[str]:
+        if not cache_dir:
+            return None
+        path = Path(cache_dir)
+        if not path.is_absolute():
+            path = PROJECT_ROOT / path
+        return str(path)
+
+
+# Service instance
+tokenizer_service = TokenizerService(
+    encoding_name=settings.tokenizer_encoding,
+    cache_dir=settings.tokenizer_cache_dir,
+    cache_max_entries=settings.tokenizer_cache_max_entries,
+    batch_threads=settings.tokenizer_batch_threads
+)
@@ -0,0 +1,413 @@
+# Vector Index Service
+"""
+Service for managing pgvector ANN indexes (HNSW / IVFFlat) on embedding columns.
+Handles index creation, rebuilds, reporting and per-query search settings.
+"""
+
+import logging
+from typing import List, Dict, Any, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import text
+
+from config.settings import settings
+from src.core.database import engine
+from src.models.refactored_database import ContentType
+
+logger = logging.getLogger(__name__)
+
+
+# Embedding columns that can carry an ANN index: target name -> (table, column)
+VECTOR_INDEX_TARGETS = {
+    "marketing_content": ("marketing_content", "embedding"),
+    "compliance_rules": ("compliance_rules", "embedding"),
+}
+
+INDEX_METHOD_HNSW = "hnsw"
+INDEX_METHOD_IVFFLAT = "ivfflat"
+INDEX_METHODS = (INDEX_METHOD_HNSW, INDEX_METHOD_IVFFLAT)
+
+# Partial ANN indexes cover approved marketing content only: one for all
+# content types plus one per content type, so filtered searches scan just the
+# matching vectors instead of filtering after the distance calculation
+PARTIAL_INDEX_TARGET = "marketing_content"
+
+
+class VectorIndexService:
+    """Service for creating, rebuilding and reporting on pgvector indexes."""
+
+    def __init__(self):
+        """Initialize vector index service from settings."""
+        self.default_method = settings.vector_index_method
+        self.hnsw_m = settings.vector_index_hnsw_m
+        self.hnsw_ef_construction = settings.vector_index_hnsw_ef_construction
+        self.ivfflat_lists = settings.vector_index_ivfflat_lists
+
+    def get_index_name(self, target: str, method: str) -> str:
+        """Deterministic index name for a target column and method."""
+        table, column = self._resolve_target(target)
+        return f"ix_{table}_{column}_{method}_cosine"
+
+    def get_partial_index_name(self, method: str, content_type: Optional[ContentType] = None) -> str:
+        """Name of the approved-rows partial index, optionally for one content type."""
+        table, column = self._resolve_target(PARTIAL_INDEX_TARGET)
+        suffix = f"_{content_type.value.lower()}" if content_type else ""
+        return f"ix_{table}_{column}_{method}_approved{suffix}"
+
+    def build_partial_index_predicate(self, content_type: Optional[ContentType] = None) -> str:
+        """
+        WHERE clause of an approved-rows partial index.
+
+        Searches match it by filtering on the same literal values (see
+        VectorSearchService), which is what lets the planner pick the index.
+        """
+        predicate = "approval_status = 'APPROVED'"
+        if content_type:
+            predicate += f" AND content_type = '{ContentType(content_type).value}'"
+        return predicate
+
+    def build_create_partial_index_sql(
+        self,
+        content_type: Optional[ContentType] = None,
+        method: Optional[str] = None,
+        m: Optional[int] = None,
+        ef_construction: Optional[int] = None,
+        lists: Optional[int] = None,
+        concurrently: bool = True
+    ) -> str:
+        """Build the CREATE INDEX statement for an approved-rows partial index."""
+        method = self._resolve_method(method)
+        return self.build_create_index_sql(
+            PARTIAL_INDEX_TARGET, method, m=m, ef_construction=ef_construction, lists=lists,
+            concurrently=concurrently,
+            index_name=self.get_partial_index_name(method, content_type),
+            where=self.build_partial_index_predicate(content_type)
+        )
+
+    def build_create_index_sql(
+        self,
+        target: str,
+        method: Optional[str] = None,
+        m: Optional[int] = None,
+        ef_construction: Optional[int] = None,
+        lists: Optional[int] = None,
+        concurrently: bool = True,
+        index_name: Optional[str] = None,
+        where: Optional[str] = None
+    ) -> str:
+        """
+        Build the CREATE INDEX statement for an embedding column.
+
+        Args:
+            target: Key of VECTOR_INDEX_TARGETS
+            method: "hnsw" or "ivfflat" (defaults to settings)
+            m: HNSW max connections per layer
+            ef_construction: HNSW candidate list size during build
+            lists: IVFFlat number of inverted lists
+            concurrently: Build without blocking writes
+            index_name: Override the default index name (partial indexes)
+            where: Partial index predicate (internal, built from validated enums)
+
+        Returns:
+            SQL statement text (all values are validated integers)
+        """
+        method = self._resolve_method(method)
+        table, column = self._resolve_target(target)
+        index_name = index_name or self.get_index_name(target, method)
+
+        if method == INDEX_METHOD_HNSW:
+            m = int(m or self.hnsw_m)
+            ef_construction = int(ef_construction or self.hnsw_ef_construction)
+            with_clause = f"WITH (m = {m}, ef_construction = {ef_construction})"
+        else:
+            lists = int(lists or self.ivfflat_lists)
+            with_clause = f"WITH (lists = {lists})"
+
+        return (
+            f"CREATE INDEX {'CONCURRENTLY ' if concurrently else ''}IF NOT EXISTS {index_name} "
+            f"ON {table} USING {method} ({column} vector_cosine_ops) {with_clause}"
+            + (f" WHERE {where}" if where else "")
+        )
+
+    async def create_index(
+        self,
+        target: str,
+        method: Optional[str] = None,
+        m: Optional[int] = None,
+        ef_construction: Optional[int] = None,
+        lists: Optional[int] = None,
+        concurrently: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Create an ANN index on an embedding column (no-op if it already exists).
+
+        An existing index left invalid by a failed concurrent build would
+        satisfy IF NOT EXISTS while never being used by the planner, so it is
+        dropped and built again.
+
+        Returns:
+            Result dict with index name, statements executed and any invalid
+            index that was rebuilt
+        """
+        try:
+            method = self._resolve_method(method)
+            index_name = self.get_index_name(target, method)
+            statement = self.build_create_index_sql(
+                target, method, m=m, ef_construction=ef_construction,
+                lists=lists, concurrently=concurrently
+            )
+            invalid = await self._find_invalid_indexes([index_name])
+            statements = self._drop_statements(invalid, concurrently) + [statement]
+            await self._execute_autocommit(statements)
+
+            logger.info(f"Vector index ready: {index_name}")
+            return {
+                "status": "success",
+                "target": target,
+                "index_name": index_name,
+                "method": method,
+                "statement": statement,
+                "statements": statements,
+                "rebuilt_invalid": invalid
+            }
+
+        except Exception as e:
+            logger.error(f"Error creating vector index for {target}: {str(e)}")
+            return {"status": "error", "target": target, "error": str(e)}
+
+    async def create_partial_indexes(
+        self,
+        method: Optional[str] = None,
+        content_types: Optional[List[ContentType]] = None
+    ) -> Dict[str, Any]:
+        """
+        Create the approved-rows partial indexes on marketing content embeddings.
+
+        Args:
+            method: "hnsw" or "ivfflat" (defaults to settings)
+            content_types: Content types to index separately (defaults to all)
+
+        Returns:
+            Result dict with the index names and statements executed
+        """
+        try:
+            method = self._resolve_method(method)
+            content_types = list(ContentType) if content_types is None else content_types
+            scopes = [None] + [ContentType(content_type) for content_type in content_types]
+            index_names = [self.get_partial_index_name(method, content_type) for content_type in scopes]
+            invalid = await self._find_invalid_indexes(index_names)
+            statements = self._drop_statements(invalid) + [
+                self.build_create_partial_index_sql(content_type, method)
+                for content_type in scopes
+            ]
+            await self._execute_autocommit(statements)
+
+            logger.info(f"Partial vector indexes ready: {len(index_names)}")
+            return {
+                "status": "success",
+                "target": PARTIAL_INDEX_TARGET,
+                "method": method,
+                "index_names": index_names,
+                "statements": statements,
+                "rebuilt_invalid": invalid
+            }
+
+        except Exception as e:
+            logger.error(f"Error creating partial vector indexes: {str(e)}")
+            return {"status": "error", "target": PARTIAL_INDEX_TARGET, "error": str(e)}
+
+    async def rebuild_index(
+        self,
+        target: str,
+        method: Optional[str] = None,
+        m: Optional[int] = None,
+        ef_construction: Optional[int] = None,
+        lists: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Rebuild an ANN index.
+
+        Without new parameters the existing index is REINDEXed in place. When
+        build parameters change the index is dropped and recreated, which is
+        also the way to re-train IVFFlat lists after large corpus changes.
+        """
+        try:
+            method = self._resolve_method(method)
+            index_name = self.get_index_name(target, method)
+
+            if m is None and ef_construction is None and lists is None:
+                statements = [f"REINDEX INDEX CONCURRENTLY {index_name}"]
+            else:
+                statements = [
+                    f"DROP INDEX CONCURRENTLY IF EXISTS {index_name}",
+                    self.build_create_index_sql(
+                        target, method, m=m, ef_construction=ef_construction, lists=lists
+                    )
+                ]
+
+            await self._execute_autocommit(statements)
+
+            logger.info(f"Vector index rebuilt: {index_name}")
+            return {
+                "status": "success",
+                "target": target,
+                "index_name": index_name,
+                "method": method,
+                "statements": statements
+            }
+
+        except Exception as e:
+            logger.error(f"Error rebuilding vector index for {target}: {str(e)}")
+            return {"status": "error", "target": target, "error": str(e)}
+
+    async def drop_index(self, target: str, method: Optional[str] = None) -> Dict[str, Any]:
+        """Drop an ANN index from an embedding column."""
+        try:
+            method = self._resolve_method(method)
+            index_name = self.get_index_name(target, method)
+            await self._execute_autocommit([f"DROP INDEX CONCURRENTLY IF EXISTS {index_name}"])
+
+            logger.info(f"Vector index dropped: {index_name}")
+            return {"status": "success", "target": target, "index_name": index_name}
+
+        except Exception as e:
+            logger.error(f"Error dropping vector index for {target}: {str(e)}")
+            return {"status": "error", "target": target, "error": str(e)}
+
+    async def get_index_report(self) -> Dict[str, Any]:
+        """
+        Report ANN indexes on all embedding columns.
+
+        Returns:
+            Dict keyed by target with index definitions, size, scan counts and validity
+        """
+        try:
+            async with engine.connect() as conn:
+                result = await conn.execute(
+                    text("""
+                        SELECT
+                            t.relname AS table_name,
+                            i.relname AS index_name,
+                            am.amname AS method,
+                            pg_get_indexdef(i.oid) AS definition,
+                            pg_relation_size(i.oid) AS size_bytes,
+                            ix.indisvalid AS is_valid,
+                            COALESCE(s.idx_scan, 0) AS scans
+                        FROM pg_index ix
+                        JOIN pg_class i ON i.oid = ix.indexrelid
+                        JOIN pg_class t ON t.oid = ix.indrelid
+                        JOIN pg_am am ON am.oid = i.relam
+                        LEFT JOIN pg_stat_user_indexes s ON s.indexrelid = i.oid
+                        WHERE am.amname IN ('hnsw', 'ivfflat')
+                          AND t.relname = ANY(:tables)
+                    """),
+                    {"tables": [table for table, _ in VECTOR_INDEX_TARGETS.values()]}
+                )
+                rows = result.mappings().all()
+
+            report = {}
+            for target, (table, column) in VECTOR_INDEX_TARGETS.items():
+                indexes = [
+                    {
+                        "index_name": row["index_name"],
+                        "method": row["method"],
+                        "definition": row["definition"],
+                        "size_bytes": row["size_bytes"],
+                        "is_valid": row["is_valid"],
+                        "scans": row["scans"]
+                    }
+                    for row in rows if row["table_name"] == table
+                ]
+                report[target] = {
+                    "table": table,
+                    "column": column,
+                    "indexed": any(index["is_valid"] for index in indexes),
+                    "indexes": indexes
+                }
+
+            return {"status": "success", "indexes": report}
+
+        except Exception as e:
+            logger.error(f"Error building vector index report: {str(e)}")
+            return {"status": "error", "error": str(e)}
+
+    async def apply_search_settings(
+        self,
+        db: AsyncSession,
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None
+    ) -> None:
+        """
+        Apply per-query ANN search settings for the current transaction.
+
+        Uses set_config(..., is_local => true) so the values only affect the
+        session's current transaction and never leak into pooled connections.
+
+        Args:
+            db: Session the vector query will run on
+            ef_search: HNSW candidate list size at query time (recall vs speed)
+            probes: IVFFlat number of lists probed at query time
+        """
+        if ef_search:
+            await db.execute(
+                text("SELECT set_config('hnsw.ef_search', :value, true)"),
+                {"value": str(int(ef_search))}
+            )
+        if probes:
+            await db.execute(
+                text("SELECT set_config('ivfflat.probes', :value, true)"),
+                {"value": str(int(probes))}
+            )
+
+    async def _find_invalid_indexes(self, index_names: List[str]) -> List[str]:
+        """Names among index_names that exist but are marked invalid (pg_index.indisvalid)."""
+        async with engine.connect() as conn:
+            result = await conn.execute(
+                text("""
+                    SELECT i.relname AS index_name
+                    FROM pg_index ix
+                    JOIN pg_class i ON i.oid = ix.indexrelid
+                    WHERE i.relname = ANY(:names)
+                      AND NOT ix.indisvalid
+                """),
+                {"names": index_names}
+            )
+            invalid = {row["index_name"] for row in result.mappings().all()}
+
+        if invalid:
+            logger.warning(f"Rebuilding invalid vector indexes: {sorted(invalid)}")
+        return [name for name in index_names if name in invalid]
+
+    def _drop_statements(self, index_names: List[str], concurrently: bool = True) -> List[str]:
+        """DROP INDEX statements for indexes that have to be rebuilt."""
+        return [
+            f"DROP INDEX {'CONCURRENTLY ' if concurrently else ''}IF EXISTS {index_name}"
+            for index_name in index_names
+        ]
+
+    async def _execute_autocommit(self, statements: List[str]) -> None:
+        """Run DDL outside a transaction block (required for CONCURRENTLY)."""
+        async with engine.connect() as conn:
+            conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+            for statement in statements:
+                await conn.execute(text(statement))
+
+    def _resolve_target(self, target: str) -> tuple:
+        """Look up table and column for an index target."""
+        if target not in VECTOR_INDEX_TARGETS:
+            raise ValueError(
+                f"Unknown vector index target '{target}'. "
+                f"Available: {list(VECTOR_INDEX_TARGETS.keys())}"
+            )
+        return VECTOR_INDEX_TARGETS[target]
+
+    def _resolve_method(self, method: Optional[str]) -> str:
+        """Validate index method, falling back to the configured default."""
+        method = (method or self.default_method).lower()
+        if method not in INDEX_METHODS:
+            raise ValueError(f"Unknown vector index method '{method}'. Available: {list(INDEX_METHODS)}")
+        return method
+
+
+# Service instance
+vector_index_service = VectorIndexService()
@@ -0,0 +1,258 @@
+# In-Memory Vector Index
+"""
+In-process exact cosine index over a small/medium embedding corpus.
+Rows live in one contiguous float32 (or int8-quantized) NumPy matrix with
+parallel id/metadata arrays; top-k uses a single matrix-vector product and
+argpartition. Used by VectorSearchService to keep approved marketing content
+search out of the database.
+"""
+
+import logging
+import time
+from typing import List, Dict, Any, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class InMemoryVectorIndex:
+    """Mutable NumPy-backed cosine similarity index keyed by integer id."""
+
+    def __init__(
+        self,
+        dimensions: int,
+        normalize: bool = True,
+        quantize: bool = False,
+        initial_capacity: int = 1024
+    ):
+        """
+        Initialize an empty index.
+
+        Args:
+            dimensions: Embedding dimensions
+            normalize: Store unit vectors so scoring is a plain dot product
+                (otherwise row norms are kept and divided out per query)
+            quantize: Store rows as int8 with a per-row scale (4x less memory,
+                small recall loss)
+            initial_capacity: Rows preallocated before the first growth
+        """
+        self.dimensions = dimensions
+        self.normalize = normalize
+        self.quantize = quantize
+
+        self._capacity = max(1, initial_capacity)
+        self._size = 0
+        self._matrix = self._allocate(self._capacity)
+        self._scales = np.ones(self._capacity, dtype=np.float32)  # int8 dequantization factors
+        self._norms = np.ones(self._capacity, dtype=np.float32)  # used when not normalized
+        self._ids = np.zeros(self._capacity, dtype=np.int64)
+        self._metadata: List[Optional[Dict[str, Any]]] = [None] * self._capacity
+        self._row_by_id: Dict[int, int] = {}
+        self._filter_masks: Dict[Tuple, np.ndarray] = {}  # metadata filter -> row mask, reset on writes
+
+        self.loaded = False
+        self.loaded_at: Optional[float] = None
+        self._searches = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, item_id: int) -> bool:
+        return item_id in self._row_by_id
+
+    def replace_all(
+        self,
+        ids: Sequence[int],
+        embeddings: Sequence[Sequence[float]],
+        metadata: Sequence[Dict[str, Any]]
+    ) -> None:
+        """Rebuild the index from a full snapshot of the corpus."""
+        count = len(ids)
+        vectors = np.asarray(embeddings, dtype=np.float32).reshape(count, self.dimensions)
+
+        self._capacity = max(count, 1)
+        self._matrix = self._allocate(self._capacity)
+        self._scales = np.ones(self._capacity, dtype=np.float32)
+        self._norms = np.ones(self._capacity, dtype=np.float32)
+        self._ids = np.asarray(ids, dtype=np.int64).copy() if count else np.zeros(1, dtype=np.int64)
+        self._metadata = list(metadata) or [None]
+        self._row_by_id = {int(item_id): row for row, item_id in enumerate(ids)}
+        self._size = count
+        self._filter_masks.clear()
+
+        if count:
+            self._write_rows(np.arange(count), vectors)
+
+        self.loaded = True
+        self.loaded_at = time.time()
+
+    def upsert(self, item_id: int, embedding: Sequence[float], metadata: Dict[str, Any]) -> None:
+        """Insert or replace one row."""
+        row = self._row_by_id.get(item_id)
+        if row is None:
+            if self._size == self._capacity:
+                self._grow()
+            row = self._size
+            self._size += 1
+            self._row_by_id[item_id] = row
+            self._ids[row] = item_id
+
+        self._metadata[row] = metadata
+        self._filter_masks.clear()
+        self._write_rows(np.array([row]), np.asarray(embedding, dtype=np.float32).reshape(1, self.dimensions))
+
+    def remove(self, item_id: int) -> bool:
+        """Remove one row (the last row is moved into its slot)."""
+        row = self._row_by_id.pop(item_id, None)
+        if row is None:
+            return False
+
+        last = self._size - 1
+        if row != last:
+            self._matrix[row] = self._matrix[last]
+            self._scales[row] = self._scales[last]
+            self._norms[row] = self._norms[last]
+            self._ids[row] = self._ids[last]
+            self._metadata[row] = self._metadata[last]
+            self._row_by_id[int(self._ids[row])] = row
+
+        self._metadata[last] = None
+        self._size -= 1
+        self._filter_masks.clear()
+        return True
+
+    def search(
+        self,
+        query_embedding: Sequence[float],
+        limit: int,
+        similarity_threshold: float = 0.0,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> List[Tuple[Dict[str, Any], float]]:
+        """
+        Exact cosine top-k.
+
+        Args:
+            filters: Metadata field -> required value; only matching rows are
+                ranked (row masks are cached until the next write)
+
+        Returns:
+            (metadata, similarity) pairs, most similar first, similarity > threshold
+        """
+        if self._size == 0 or limit <= 0:
+            return []
+
+        self._searches += 1
+        scores = self._scores(np.asarray(query_embedding, dtype=np.float32))
+
+        if filters:
+            candidates = np.flatnonzero(self._filter_mask(filters))
+            scores_subset = scores[candidates]
+        else:
+            candidates = None
+            scores_subset = scores
+
+        count = scores_subset.shape[0]
+        k = min(limit, count)
+        if k == 0:
+            return []
+        if k < count:
+            top = np.argpartition(-scores_subset, k - 1)[:k]
+        else:
+            top = np.arange(count)
+        top = top[np.argsort(-scores_subset[top], kind="stable")]
+        if candidates is not None:
+            top = candidates[top]
+
+        return [
+            (self._metadata[row], float(scores[row]))
+            for row in top
+            if scores[row] > similarity_threshold
+        ]
+
+    def vectors(self, item_ids: Sequence[int]) -> np.ndarray:
+        """Unit-length float32 rows for the given ids (KeyError for unknown ids)."""
+        rows = np.array([self._row_by_id[item_id] for item_id in item_ids], dtype=np.intp)
+        vectors = self._matrix[rows].astype(np.float32)
+        if self.quantize:
+            vectors *= self._scales[rows][:, None]
+        if not self.normalize:
+            vectors /= self._norms[rows][:, None]
+        return vectors
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Size and memory metrics."""
+        matrix_bytes = self._matrix[:self._size].nbytes
+        return {
+            "loaded": self.loaded,
+            "items": self._size,
+            "capacity": self._capacity,
+            "dimensions": self.dimensions,
+            "normalized": self.normalize,
+            "quantized": self.quantize,
+            "matrix_bytes": matrix_bytes,
+            "loaded_at": self.loaded_at,
+            "searches": self._searches
+        }
+
+    def _filter_mask(self, filters: Dict[str, Any]) -> np.ndarray:
+        key = tuple(sorted(filters.items()))
+        mask = self._filter_masks.get(key)
+        if mask is None:
+            mask = np.fromiter(
+                (
+                    all(metadata.get(field) == value for field, value in filters.items())
+                    for metadata in self._metadata[:self._size]
+                ),
+                dtype=bool,
+                count=self._size
+            )
+            self._filter_masks[key] = mask
+        return mask
+
+    def _scores(self, query: np.ndarray) -> np.ndarray:
+        query_norm = float(np.linalg.norm(query))
+        if query_norm == 0:
+            return np.zeros(self._size, dtype=np.float32)
+        query = query / query_norm
+
+        rows = self._matrix[:self._size]
+        if self.quantize:
+            scores = (rows @ query.astype(np.float32)) * self._scales[:self._size]
+        else:
+            scores = rows @ query
+        if not self.normalize:
+            scores = scores / self._norms[:self._size]
+        return scores
+
+    def _write_rows(self, rows: np.ndarray, vectors: np.ndarray) -> None:
+        norms = np.linalg.norm(vectors, axis=1).astype(np.float32)
+        norms[norms == 0] = 1.0
+        if self.normalize:
+            vectors = vectors / norms[:, None]
+        else:
+            self._norms[rows] = norms
+
+        if self.quantize:
+            # Symmetric per-row int8 quantization: x ≈ q * scale
+            scales = np.abs(vectors).max(axis=1) / 127.0
+            scales[scales == 0] = 1.0
+            self._matrix[rows] = np.round(vectors / scales[:, None]).astype(np.int8)
+            self._scales[rows] = scales
+        else:
+            self._matrix[rows] = vectors
+
+    def _grow(self) -> None:
+        capacity = self._capacity * 2
+        matrix = self._allocate(capacity)
+        matrix[:self._size] = self._matrix[:self._size]
+        self._matrix = matrix
+        self._scales = np.concatenate([self._scales, np.ones(capacity - self._capacity, dtype=np.float32)])
+        self._norms = np.concatenate([self._norms, np.ones(capacity - self._capacity, dtype=np.float32)])
+        self._ids = np.concatenate([self._ids, np.zeros(capacity - self._capacity, dtype=np.int64)])
+        self._metadata.extend([None] * (capacity - self._capacity))
+        self._capacity = capacity
+
+    def _allocate(self, capacity: int) -> np.ndarray:
+        dtype = np.int8 if self.quantize else np.float32
+        return np.zeros((capacity, self.dimensions), dtype=dtype)
@@ -4,14 +4,17 @@ Replaces enhanced_warren_service.py using refactored services.
 """
 
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, AsyncIterator, List
 from datetime import datetime
 
 from src.services.warren.search_orchestrator import SearchOrchestrator
+from src.services.warren.session_retrieval_memo import session_retrieval_memo
+from src.services.warren.semantic_response_cache import semantic_response_cache
 from src.services.warren.conversation_context_service import ConversationContextService
 from src.services.warren.context_quality_assessor import ContextQualityAssessor
 from src.services.warren.prompt_construction_service import PromptConstructionService
 from src.services.warren.strategies.strategy_factory import StrategyFactory
+from src.services.llm_scheduler import LLMPriority
 from src.models.refactored_database import ContentType
 
 logger = logging.getLogger(__name__)
@@ -33,13 +36,17 @@ class ContentGenerationOrchestrator:
                  conversation_service=None,
                  quality_assessor=None,
                  prompt_service=None,
-                 strategy_factory=None):
+                 strategy_factory=None,
+                 retrieval_memo=None,
+                 response_cache=None):
         """Initialize with dependency injection for testing."""
         self.search_orchestrator = search_orchestrator or SearchOrchestrator()
         self.conversation_service = conversation_service or ConversationContextService()
         self.quality_assessor = quality_assessor or ContextQualityAssessor()
         self.prompt_service = prompt_service or PromptConstructionService()
         self.strategy_factory = strategy_factory or StrategyFactory()
+        self.retrieval_memo = retrieval_memo or session_retrieval_memo
+        self.response_cache = response_cache or semantic_response_cache
         
         # Configuration matching enhanced_warren_service defaults
         self.vector_similarity_threshold = 0.1
@@ -58,7 +65,8 @@ class ContentGenerationOrchestrator:
         youtube_context: Optional[Dict[str, Any]] = None,
         use_conversation_context: bool = True,
         conversation_history: Optional[list] = None,
-        session_documents: Optional[list] = None
+        session_documents: Optional[list] = None,
+        llm_priority: LLMPriority = LLMPriority.INTERACTIVE
     ) -> Dict[str, Any]:
         """Generate content maintaining exact interface compatibility with enhanced_warren_service."""
         try:
@@ -90,30 +98,48 @@ class ContentGenerationOrchestrator:
                 conversation_context = session_context.get("conversation_context", "")
                 session_docs = session_context.get("session_documents", [])
             
-            # Execute search with fallback logic
-            context_data = await self.search_orchestrator.execute_search_with_fallback(
-                user_request, content_type, content_type_enum, audience_type
+            # Fresh requests without per-session material can be answered from the response cache
+            use_response_cache = self._uses_response_cache(
+                is_refinement, youtube_context, session_docs, conversation_context
+            )
+            query_embedding = None
+            if use_response_cache:
+                query_embedding = await self.search_orchestrator.embed_query(user_request)
+            
+            # Execute search with fallback logic (or reuse this session's last retrieval)
+            context_data = await self._retrieve_context(
+                user_request, content_type, content_type_enum, audience_type, session_id, query_embedding
             )
             
             # Add session context to search results
             context_data["conversation_context"] = conversation_context
             context_data["session_documents"] = session_docs
             context_data["session_id"] = session_id
+            # Claude call scheduling: priority class and per-advisor fairness key
+            context_data["user_id"] = user_id
+            context_data["llm_priority"] = llm_priority
             
             # Assess context quality for strategy selection
             context_quality = self.quality_assessor.assess_context_quality(context_data)
             
+            generation_result = None
+            if use_response_cache:
+                generation_result = self._cached_generation(query_embedding, content_type, audience_type, context_data)
+            
             # Select and execute content generation strategy
-            generation_result = await self._coordinate_generation_workflow({
-                "context_data": context_data,
-                "user_request": user_request,
-                "content_type": content_type,
-                "audience_type": audience_type,
-                "current_content": current_content,
-                "is_refinement": is_refinement,
-                "youtube_context": youtube_context,
-                "context_quality": context_quality
-            })
+            if generation_result is None:
+                generation_result = await self._coordinate_generation_workflow({
+                    "context_data": context_data,
+                    "user_request": user_request,
+                    "content_type": content_type,
+                    "audience_type": audience_type,
+                    "current_content": current_content,
+                    "is_refinement": is_refinement,
+                    "youtube_context": youtube_context,
+                    "context_quality": context_quality
+                })
+                if use_response_cache:
+                    self._store_generation(query_embedding, content_type, audience_type, context_data, generation_result)
             
             # Assemble final response with all metadata
             return self._assemble_response(
@@ -136,6 +162,282 @@ class ContentGenerationOrchestrator:
                 user_request, content_type, audience_type, user_id, session_id, e
             )
     
+    async def stream_content_with_enhanced_context(
+        self,
+        user_request: str,
+        content_type: str,
+        audience_type: Optional[str] = None,
+        user_id: Optional[str] = None,
+        session_id: Optional[str] = None,
+        current_content: Optional[str] = None,
+        is_refinement: bool = False,
+        youtube_context: Optional[Dict[str, Any]] = None,
+        use_conversation_context: bool = True,
+        llm_priority: LLMPriority = LLMPriority.INTERACTIVE
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Streaming variant of generate_content_with_enhanced_context.
+        
+        Yields pipeline-stage events as they finish ("retrieval_complete",
+        "context_assembled"), "token" events as the content is generated, and
+        ends with "complete" carrying the same response the non-streaming call
+        returns, or "error".
+        """
+        tokens_sent = False
+        try:
+            validation_result = self._validate_request(user_request, content_type)
+            if not validation_result.valid:
+                yield {"event": "error", "error": validation_result.error_message}
+                return
+            
+            content_type_enum = validation_result.processed_params.get("content_type_enum")
+            
+            session_context = await self.conversation_service.get_session_context(
+                session_id, use_conversation_context
+            )
+            conversation_context = session_context.get("conversation_context", "")
+            session_docs = session_context.get("session_documents", [])
+            
+            use_response_cache = self._uses_response_cache(
+                is_refinement, youtube_context, session_docs, conversation_context
+            )
+            query_embedding = None
+            if use_response_cache:
+                query_embedding = await self.search_orchestrator.embed_query(user_request)
+            
+            context_data = await self._retrieve_context(
+                user_request, content_type, content_type_enum, audience_type, session_id, query_embedding
+            )
+            context_data["conversation_context"] = conversation_context
+            context_data["session_documents"] = session_docs
+            context_data["session_id"] = session_id
+            context_data["user_id"] = user_id
+            context_data["llm_priority"] = llm_priority
+            
+            yield {
+                "event": "retrieval_complete",
+                "search_strategy": context_data.get("search_strategy", "hybrid"),
+                "marketing_examples_count": len(context_data.get("marketing_examples", []) or []),
+                "compliance_rules_count": len(context_data.get("disclaimers", []) or []),
+                "retrieval_reused": context_data.get("retrieval_reused", False),
+                "fallback_used": context_data.get("fallback_used", False)
+            }
+            
+            context_quality = self.quality_assessor.assess_context_quality(context_data)
+            request_params = {
+                "context_data": context_data,
+                "user_request": user_request,
+                "content_type": content_type,
+                "audience_type": audience_type,
+                "current_content": current_content,
+                "is_refinement": is_refinement,
+                "youtube_context": youtube_context
+            }
+            
+            response_metadata = {
+                "context_data": context_data,
+                "session_documents": session_docs,
+                "conversation_context": conversation_context,
+                "context_quality": context_quality,
+                "user_request": user_request,
+                "content_type": content_type,
+                "session_id": session_id
+            }
+            
+            cached = None
+            if use_response_cache:
+                cached = self._cached_generation(query_embedding, content_type, audience_type, context_data)
+            if cached is not None:
+                yield {"event": "token", "text": cached["content"]}
+                yield {
+                    "event": "complete",
+                    "response": self._assemble_response(
+                        cached["content"], {**response_metadata, "generation_metadata": cached["metadata"]}
+                    )
+                }
+                return
+            
+            strategy = self._select_generation_strategy(context_data, context_quality)
+            logger.info(f"Selected generation strategy: {strategy.get_strategy_name()}")
+            
+            outcome = {}
+            async for event in self._relay_strategy_stream(strategy, request_params, outcome):
+                tokens_sent = tokens_sent or event["event"] == "token"
+                yield event
+            generation_result = outcome["result"]
+            
+            # Nothing reached the client yet: the legacy strategy can still take over
+            original_error = None
+            if not generation_result.success and not tokens_sent:
+                original_error = generation_result.error_message
+                logger.info("Trying fallback strategy: legacy")
+                async for event in self._relay_strategy_stream(
+                    self.strategy_factory.get_strategy("legacy"), request_params, outcome
+                ):
+                    tokens_sent = tokens_sent or event["event"] == "token"
+                    yield event
+                generation_result = outcome["result"]
+            
+            if not generation_result.success:
+                yield {"event": "error", "error": generation_result.error_message}
+                return
+            
+            generation_metadata = {
+                "strategy_used": generation_result.strategy_used,
+                "generation_time": generation_result.generation_time,
+                "token_usage": generation_result.token_usage
+            }
+            if original_error:
+                generation_metadata["fallback_used"] = True
+                generation_metadata["original_error"] = original_error
+            if use_response_cache:
+                self._store_generation(
+                    query_embedding, content_type, audience_type, context_data,
+                    {"content": generation_result.content, "metadata": generation_metadata}
+                )
+            
+            yield {
+                "event": "complete",
+                "response": self._assemble_response(
+                    generation_result.content,
+                    {**response_metadata, "generation_metadata": generation_metadata}
+                )
+            }
+            
+        except Exception as e:
+            logger.error(f"Error in streaming Warren generation: {str(e)}")
+            if tokens_sent:
+                yield {"event": "error", "error": str(e)}
+            else:
+                yield {
+                    "event": "complete",
+                    "response": await self._execute_emergency_fallback(
+                        user_request, content_type, audience_type, user_id, session_id, e
+                    )
+                }
+    
+    async def _relay_strategy_stream(
+        self,
+        strategy,
+        request_params: Dict[str, Any],
+        outcome: Dict[str, Any]
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Relay a strategy's stream events; its GenerationResult is stored in outcome["result"]."""
+        async for event in strategy.stream_content(
+            context_data=request_params["context_data"],
+            user_request=request_params["user_request"],
+            content_type=request_params["content_type"],
+            audience_type=request_params["audience_type"],
+            current_content=request_params["current_content"],
+            is_refinement=request_params["is_refinement"],
+            youtube_context=request_params["youtube_context"]
+        ):
+            if event["event"] == "generation_complete":
+                outcome["result"] = event["result"]
+            else:
+                yield event
+    
+    async def _retrieve_context(
+        self,
+        user_request: str,
+        content_type: str,
+        content_type_enum: Optional[ContentType],
+        audience_type: Optional[str],
+        session_id: Optional[str],
+        query_embedding: Optional[List[float]] = None
+    ) -> Dict[str, Any]:
+        """
+        Search context for a turn.
+        
+        Follow-up turns in a session whose query stays close (cosine similarity)
+        to the previous one, with the same content and audience type, reuse the
+        previous turn's retrieval; the search pipeline only runs when the query
+        drifts.
+        """
+        if session_id and self.retrieval_memo.enabled:
+            if query_embedding is None:
+                query_embedding = await self.search_orchestrator.embed_query(user_request)
+            reused = self.retrieval_memo.lookup(session_id, query_embedding, content_type, audience_type)
+            if reused is not None:
+                context_data, similarity = reused
+                logger.info(f"Reusing session {session_id} retrieval (query similarity {similarity:.3f})")
+                context_data["retrieval_reused"] = True
+                context_data["retrieval_similarity"] = similarity
+                return context_data
+        
+        context_data = await self.search_orchestrator.execute_search_with_fallback(
+            user_request, content_type, content_type_enum, audience_type
+        )
+        
+        # Failed retrievals are not remembered, the next turn searches again
+        if query_embedding is not None and not context_data.get("error"):
+            self.retrieval_memo.store(session_id, query_embedding, content_type, audience_type, context_data)
+        
+        return context_data
+    
+    def _uses_response_cache(
+        self,
+        is_refinement: bool,
+        youtube_context: Optional[Dict[str, Any]],
+        session_documents: Optional[list],
+        conversation_context: Optional[str]
+    ) -> bool:
+        """Refinements, videos, uploaded documents and prior turns make a generation specific to one session."""
+        return (self.response_cache.enabled and not is_refinement
+                and not youtube_context and not session_documents
+                and not (conversation_context or "").strip())
+    
+    @staticmethod
+    def _source_ids(context_data: Dict[str, Any]) -> List[Any]:
+        """Ids of the approved examples and compliance rules retrieved for a request."""
+        sources = (context_data.get("marketing_examples", []) or []) + (context_data.get("disclaimers", []) or [])
+        return [source.get("id") for source in sources if isinstance(source, dict) and source.get("id") is not None]
+    
+    def _cached_generation(
+        self,
+        query_embedding: Optional[List[float]],
+        content_type: str,
+        audience_type: Optional[str],
+        context_data: Dict[str, Any]
+    ) -> Optional[Dict[str, Any]]:
+        """Stored generation for a near-duplicate request built on the same sources, if any."""
+        if context_data.get("error"):
+            return None
+        
+        cached = self.response_cache.lookup(
+            query_embedding, content_type, audience_type, self._source_ids(context_data)
+        )
+        if cached is None:
+            return None
+        
+        generation, similarity = cached
+        logger.info(f"Serving cached generation (request similarity {similarity:.3f})")
+        return {
+            "content": generation["content"],
+            "metadata": {
+                **generation.get("metadata", {}),
+                "token_usage": {},
+                "response_cache_hit": True,
+                "response_cache_similarity": similarity
+            }
+        }
+    
+    def _store_generation(
+        self,
+        query_embedding: Optional[List[float]],
+        content_type: str,
+        audience_type: Optional[str],
+        context_data: Dict[str, Any],
+        generation_result: Dict[str, Any]
+    ) -> None:
+        # Generations from failed retrievals are not reused
+        if context_data.get("error") or not generation_result.get("content"):
+            return
+        self.response_cache.store(
+            query_embedding, content_type, audience_type, self._source_ids(context_data),
+            {"content": generation_result["content"], "metadata": generation_result.get("metadata", {})}
+        )
+    
     def _validate_request(self, user_request: str, content_type: str) -> ValidationResult:
         """Validate and preprocess the content generation request."""
         result = ValidationResult()
@@ -177,6 +479,7 @@ class ContentGenerationOrchestrator:
         session_documents = metadata.get("session_documents", []) or []  # Ensure it's a list
         conversation_context = metadata.get("conversation_context", "") or ""  # Ensure it's a string
         context_quality = metadata.get("context_quality", {})
+        generation_metadata = metadata.get("generation_metadata", {}) or {}
         
         # Ensure all list fields have default empty lists to prevent None errors
         marketing_examples = context_data.get("marketing_examples", []) or []
@@ -195,8 +498,11 @@ class ContentGenerationOrchestrator:
             "search_details": {
                 "vector_results_found": context_data.get("vector_results_count", 0),
                 "text_results_found": context_data.get("text_results_count", 0),
-                "total_knowledge_sources": context_data.get("total_sources", 0)
+                "total_knowledge_sources": context_data.get("total_sources", 0),
+                "retrieval_reused": context_data.get("retrieval_reused", False)
             },
+            "token_usage": generation_metadata.get("token_usage", {}) or {},
+            "response_cache_hit": generation_metadata.get("response_cache_hit", False),
             "session_info": {
                 "session_id": metadata.get("session_id"),
                 "conversation_context_used": bool(conversation_context),
@@ -10,8 +10,9 @@ Responsibilities:
 
 """
 
+import asyncio
 import logging
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Awaitable
 
 from src.services.vector_search_service import VectorSearchService
 from src.services.warren_database_service import WarrenDatabaseService
@@ -26,7 +27,8 @@ class ContextRetrievalService:
                  warren_db_service=None,
                  enable_vector_search: bool = True,
                  vector_similarity_threshold: float = 0.1,
-                 min_results_threshold: int = 1):
+                 min_results_threshold: int = 1,
+                 branch_timeout: float = 10.0):
         """Initialize the context retrieval service."""
         # Dependency injection for testing, with defaults for production
         self.vector_search_service = vector_search_service or VectorSearchService()
@@ -36,6 +38,7 @@ class ContextRetrievalService:
         self.enable_vector_search = enable_vector_search
         self.vector_similarity_threshold = vector_similarity_threshold
         self.min_results_threshold = min_results_threshold
+        self.branch_timeout = branch_timeout  # Seconds allowed per concurrent retrieval branch
     
     async def get_vector_search_context(
         self,
@@ -47,56 +50,87 @@ class ContextRetrievalService:
         """
         Get context using vector similarity search.
         Direct port of enhanced_warren_service._get_vector_search_context()
+        
+        The readiness check, marketing search and compliance rule search run
+        concurrently, each on its own pooled session and with its own timeout,
+        with their query texts embedded in one batched call up front. The
+        backup disclaimer search over marketing content only runs when vector
+        search is ready and no compliance rules came back. A failed or slow
+        compliance/disclaimer branch degrades to no disclaimers; only a failed
+        marketing branch makes vector context unavailable.
         """
         try:
             if not self.enable_vector_search:
                 return {"marketing_examples": [], "disclaimers": [], "vector_available": False}
             
-            # Check if vector search is available
-            readiness_check = await self.vector_search_service.check_readiness()
-            if not readiness_check.get("ready", False):
-                logger.warning(f"Vector search not ready: {readiness_check.get('reason', 'Unknown')}")
-                return {"marketing_examples": [], "disclaimers": [], "vector_available": False}
+            compliance_query = f"{content_type} compliance rules disclaimer"
+            disclaimer_query = f"{content_type} disclaimer risk disclosure"
             
-            # Search for relevant marketing content examples
-            marketing_examples = await self.vector_search_service.search_marketing_content(
-                query_text=user_request,
-                content_type=content_type_enum,
-                similarity_threshold=self.vector_similarity_threshold,
-                limit=3
-            )
+            # One embeddings call for the query texts every request searches with
+            request_embedding, compliance_embedding = await self._embed_queries([user_request, compliance_query])
             
-            # Try to search compliance rules, but fall back gracefully if it fails
-            compliance_rules = []
-            try:
-                compliance_rules = await self.vector_search_service.search_compliance_rules(
-                    query_text=f"{content_type} compliance rules disclaimer",
-                    content_type=content_type,
-                    similarity_threshold=0.1,
-                    limit=3
+            failed_branches: List[str] = []
+            readiness_check, marketing_examples, compliance_rules = await asyncio.gather(
+                self._run_branch(
+                    "readiness",
+                    self.vector_search_service.check_readiness(),
+                    failed_branches
+                ),
+                self._run_branch(
+                    "marketing",
+                    self.vector_search_service.search_marketing_content(
+                        query_text=user_request,
+                        content_type=content_type_enum,
+                        similarity_threshold=self.vector_similarity_threshold,
+                        limit=3,
+                        query_embedding=request_embedding
+                    ),
+                    failed_branches
+                ),
+                self._run_branch(
+                    "compliance_rules",
+                    self.vector_search_service.search_compliance_rules(
+                        query_text=compliance_query,
+                        content_type=content_type,
+                        similarity_threshold=0.1,
+                        limit=3,
+                        query_embedding=compliance_embedding
+                    ),
+                    failed_branches
                 )
-            except Exception as e:
-                logger.warning(f"Compliance rules vector search failed: {e}, continuing with marketing examples only")
-                compliance_rules = []
+            )
+            
+            # Check if vector search is available
+            if readiness_check is None or not readiness_check.get("ready", False):
+                reason = readiness_check.get("reason", "Unknown") if readiness_check else "readiness check failed"
+                logger.warning(f"Vector search not ready: {reason}")
+                return {"marketing_examples": [], "disclaimers": [], "vector_available": False}
             
-            # If no compliance rules found via vector search, try marketing content for disclaimers as backup
-            disclaimers = compliance_rules
+            if marketing_examples is None:
+                error = "; ".join(failed_branches)
+                logger.error(f"Error in vector search context: {error}")
+                return {"marketing_examples": [], "disclaimers": [], "vector_available": False, "error": error}
+            
+            # If no compliance rules found via vector search, use marketing content for disclaimers as backup
+            disclaimers = [{**rule, "source": "compliance_rule"} for rule in compliance_rules or []]
             if not disclaimers:
-                disclaimer_query = f"{content_type} disclaimer risk disclosure"
-                potential_disclaimers = await self.vector_search_service.search_marketing_content(
-                    query_text=disclaimer_query,
-                    similarity_threshold=0.1,
-                    limit=3
+                potential_disclaimers = await self._run_branch(
+                    "disclaimers",
+                    self.vector_search_service.search_marketing_content(
+                        query_text=disclaimer_query,
+                        similarity_threshold=0.1,
+                        limit=3
+                    ),
+                    failed_branches
                 )
-                
                 # Filter for disclaimer-like content
                 disclaimers = [
-                    d for d in potential_disclaimers 
+                    {**d, "source": "marketing_content"} for d in (potential_disclaimers or [])
                     if any(keyword in d.get("title", "").lower() or keyword in d.get("tags", "").lower() 
                            for keyword in ["disclaimer", "risk", "disclosure"])
                 ]
             
-            return {
+            result = {
                 "marketing_examples": marketing_examples,
                 "disclaimers": disclaimers,
                 "vector_available": True,
@@ -105,11 +139,43 @@ class ContextRetrievalService:
                 "disclaimer_count": len(disclaimers),
                 "total_sources": len(marketing_examples) + len(disclaimers)
             }
+            if failed_branches:
+                result["failed_branches"] = failed_branches
+            return result
             
         except Exception as e:
             logger.error(f"Error in vector search context: {str(e)}")
             return {"marketing_examples": [], "disclaimers": [], "vector_available": False, "error": str(e)}
     
+    async def embed_query(self, query_text: str) -> Optional[List[float]]:
+        """Embedding of one query text (None if unavailable)."""
+        return (await self._embed_queries([query_text]))[0]
+    
+    async def _embed_queries(self, query_texts: List[str]) -> List[Optional[List[float]]]:
+        """Batch-embed query texts; on failure each search embeds its own query."""
+        try:
+            embeddings = await asyncio.wait_for(
+                self.vector_search_service.embed_queries(query_texts),
+                timeout=self.branch_timeout
+            )
+            if isinstance(embeddings, list) and len(embeddings) == len(query_texts):
+                return embeddings
+        except Exception as e:
+            logger.warning(f"Batched query embedding failed: {e!r}, searches will embed individually")
+        return [None] * len(query_texts)
+    
+    async def _run_branch(self, name: str, coroutine: Awaitable[Any], failed_branches: List[str]) -> Any:
+        """Await one retrieval branch with its own timeout; None (and a recorded failure) on error."""
+        try:
+            return await asyncio.wait_for(coroutine, timeout=self.branch_timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Vector retrieval branch '{name}' timed out after {self.branch_timeout}s")
+            failed_branches.append(f"{name}: timed out")
+        except Exception as e:
+            logger.warning(f"Vector retrieval branch '{name}' failed: {e}")
+            failed_branches.append(f"{name}: {e}")
+        return None
+    
     async def get_text_search_context(
         self,
         user_request: str,
@@ -167,12 +233,13 @@ class ContextRetrievalService:
             vector_context.get("marketing_examples", []) + text_examples[:2]
         )
         
-        # For disclaimers, prefer vector results but supplement with text if needed
+        # For disclaimers, prefer vector results but supplement with text if needed.
+        # Disclaimers come from compliance_rules or marketing_content, so ids are compared per source table.
         if len(vector_context.get("disclaimers", [])) < 2:
-            vector_disclaimer_ids = {d.get("id") for d in vector_context.get("disclaimers", [])}
+            vector_disclaimer_keys = {(d.get("source"), d.get("id")) for d in vector_context.get("disclaimers", [])}
             text_disclaimers = [
                 d for d in text_context.get("disclaimers", [])
-                if d.get("id") not in vector_disclaimer_ids
+                if (d.get("source"), d.get("id")) not in vector_disclaimer_keys
             ]
             combined["disclaimers"] = (
                 vector_context.get("disclaimers", []) + text_disclaimers[:2]
@@ -19,7 +19,7 @@ Extracted from enhanced_warren_service.py:
 import logging
 from typing import Dict, Any, List, Optional
 
-from src.services.prompt_service import prompt_service
+from src.services.prompt_service import prompt_service, CacheablePrompt, WARREN_GENERATION_REQUIREMENTS
 from src.services.context_assembly_service.orchestrator import BasicContextAssemblyOrchestrator
 from src.core.database import AsyncSessionLocal
 
@@ -69,7 +69,8 @@ class PromptConstructionService:
             prompt_type: Type of prompt to construct
             
         Returns:
-            Complete prompt ready for AI generation
+            Complete prompt ready for AI generation (a CacheablePrompt: stable
+            system/requirements blocks first, per-request context after)
         """
         if prompt_type == PromptType.ADVANCED_GENERATION:
             return await self._build_advanced_generation_prompt(
@@ -134,8 +135,7 @@ class PromptConstructionService:
             logger.info(f"Added conversation context to refinement prompt: {len(conversation_context)} characters")
         
         # For refinement, we focus on current content and user's request, but also include conversation context
-        final_prompt = f"""{base_system_prompt}
-{conversation_section}
+        final_prompt = CacheablePrompt([base_system_prompt], f"""{conversation_section}
 CURRENT CONTENT TO REFINE:
 ##MARKETINGCONTENT##
 {current_content}
@@ -144,7 +144,7 @@ CURRENT CONTENT TO REFINE:
 USER'S REFINEMENT REQUEST: {refinement_request}
 
 Please refine the content based on the user's request while maintaining SEC/FINRA compliance. Consider the conversation history above for additional context about what we've been discussing.
-Wrap your refined content in ##MARKETINGCONTENT## delimiters and explain your changes."""
+Wrap your refined content in ##MARKETINGCONTENT## delimiters and explain your changes.""".lstrip())
 
         return final_prompt
     
@@ -371,22 +371,18 @@ Please reference and incorporate information from these documents when creating
             if has_documents:
                 document_titles = [doc['title'] for doc in context_data.get("session_documents", [])]
             
-            final_prompt = f"""{base_system_prompt}
-
-{optimized_context}{document_instruction}
-
-Based on the above information{" and uploaded documents" if has_documents else ""}, please create compliant marketing content that:
-1. Follows all SEC Marketing Rule and FINRA 2210 requirements
-2. Includes appropriate disclaimers and risk disclosures
-3. Uses educational tone rather than promotional claims
-4. Avoids performance predictions or guarantees
-5. Is appropriate for the specified platform/content type
-6. References the style and structure of the approved examples
-{f"7. Incorporates relevant information from the uploaded documents: {', '.join(document_titles)}" if has_documents else ""}
+            document_requirement = ""
+            if has_documents:
+                document_requirement = f" and incorporates relevant information from the uploaded documents: {', '.join(document_titles)}"
+            
+            final_prompt = CacheablePrompt(
+                [f"{base_system_prompt}\n\n{WARREN_GENERATION_REQUIREMENTS}"],
+                f"""{optimized_context}{document_instruction}
 
-Remember to wrap your final marketing content in ##MARKETINGCONTENT## delimiters.
+Based on the above information{" and uploaded documents" if has_documents else ""}, please create compliant marketing content that meets the generation requirements{document_requirement}.
 
 Generate the content now:"""
+            )
             
             # Add Phase 2 assembly metadata to context_data for response
             context_data["token_management"] = {
@@ -444,21 +440,14 @@ Generate the content now:"""
             
             base_system_prompt = prompt_service.get_warren_system_prompt(prompt_context)
             
-            final_prompt = f"""{base_system_prompt}
-
-{optimized_context}
-
-Based on the above information, please create compliant marketing content that:
-1. Follows all SEC Marketing Rule and FINRA 2210 requirements
-2. Includes appropriate disclaimers and risk disclosures
-3. Uses educational tone rather than promotional claims
-4. Avoids performance predictions or guarantees
-5. Is appropriate for the specified platform/content type
-6. References the style and structure of the approved examples
+            final_prompt = CacheablePrompt(
+                [f"{base_system_prompt}\n\n{WARREN_GENERATION_REQUIREMENTS}"],
+                f"""{optimized_context}
 
-Remember to wrap your final marketing content in ##MARKETINGCONTENT## delimiters.
+Based on the above information, please create compliant marketing content that meets the generation requirements.
 
 Generate the content now:"""
+            )
             
             return final_prompt
     
@@ -509,12 +498,14 @@ Generate the content now:"""
                 if example.get('tags'):
                     context_parts.append(f"Tags: {example['tags']}")
         
-        # Add disclaimers
+        # Disclaimers change far less often than the rest of the context; they follow the system prompt
+        disclaimer_section = ""
         disclaimers = context_data.get("disclaimers", [])
         if disclaimers:
-            context_parts.append(f"\n## REQUIRED DISCLAIMERS:")
-            for disclaimer in disclaimers[:2]:
-                context_parts.append(f"\n**{disclaimer['title']}**: {disclaimer['content_text'][:200]}...")
+            disclaimer_section = "## REQUIRED DISCLAIMERS:" + "".join(
+                f"\n**{disclaimer['title']}**: {disclaimer['content_text'][:200]}..."
+                for disclaimer in disclaimers[:2]
+            )
         
         # Add YouTube video context if provided
         youtube_context = context_data.get("youtube_context")
@@ -523,25 +514,18 @@ Generate the content now:"""
         
         knowledge_context = "\n".join(context_parts)
         
-        # Create final prompt combining system prompt with specific context
-        final_prompt = f"""{base_system_prompt}
-
-{knowledge_context}
+        # Stable blocks first (cacheable), per-request context after
+        final_prompt = CacheablePrompt(
+            [f"{base_system_prompt}\n\n{WARREN_GENERATION_REQUIREMENTS}", disclaimer_section],
+            f"""{knowledge_context}
 
 USER REQUEST: {user_request}
 CONTENT TYPE: {content_type}
 TARGET AUDIENCE: {audience_type or 'general'}
 
-Based on the compliance examples and requirements shown above, please create compliant marketing content that:
-1. Follows all SEC Marketing Rule and FINRA 2210 requirements
-2. Includes appropriate disclaimers and risk disclosures
-3. Uses educational tone rather than promotional claims
-4. Avoids performance predictions or guarantees
-5. Is appropriate for the specified platform/content type
-6. References the style and structure of the approved examples
-
-Remember to wrap your final marketing content in ##MARKETINGCONTENT## delimiters.
+Based on the compliance examples and disclaimers provided, please create compliant marketing content that meets the generation requirements.
 
 Generate the content now:"""
+        )
 
         return final_prompt
@@ -7,12 +7,15 @@ Responsibilities:
 - Execute vector search with fallback to text search
 - Coordinate with ContextRetrievalService and ContextQualityAssessor
 - Manage search strategy selection and metadata
+- Speculatively start the text search fallback while slow vector searches run
 
 """
 
+import asyncio
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 
+from config.settings import settings
 from src.services.warren.context_retrieval_service import ContextRetrievalService
 from src.services.warren.context_quality_assessor import ContextQualityAssessor
 from src.models.refactored_database import ContentType
@@ -25,11 +28,43 @@ class SearchOrchestrator:
     
     def __init__(self, 
                  context_retrieval_service=None,
-                 context_quality_assessor=None):
-        """Initialize the search orchestrator."""
+                 context_quality_assessor=None,
+                 speculative_fallback: Optional[bool] = None,
+                 speculative_fallback_delay: Optional[float] = None,
+                 speculative_fallback_immediate: Optional[bool] = None):
+        """
+        Initialize the search orchestrator.
+        
+        Args:
+            context_retrieval_service: Vector/text context retrieval
+            context_quality_assessor: Decides whether vector context is sufficient
+            speculative_fallback: Run the text search concurrently with a slow
+                vector search instead of after it
+            speculative_fallback_delay: Seconds the vector search may run before
+                the text search is started speculatively
+            speculative_fallback_immediate: Start the text search together with
+                the vector search (no delay)
+        """
         # Dependency injection for testing, with defaults for production
         self.context_retrieval = context_retrieval_service or ContextRetrievalService()
         self.quality_assessor = context_quality_assessor or ContextQualityAssessor()
+        
+        self.speculative_fallback = (
+            settings.search_speculative_fallback_enabled if speculative_fallback is None else speculative_fallback
+        )
+        self.speculative_fallback_delay = (
+            settings.search_speculative_fallback_delay_ms / 1000.0
+            if speculative_fallback_delay is None else speculative_fallback_delay
+        )
+        self.speculative_fallback_immediate = (
+            settings.search_speculative_fallback_immediate
+            if speculative_fallback_immediate is None else speculative_fallback_immediate
+        )
+        
+        # Speculation metrics
+        self._speculative_started = 0  # Text searches started before the vector verdict
+        self._speculative_used = 0  # ...whose results were needed
+        self._speculative_wasted = 0  # ...not needed because vector results were sufficient
     
     async def execute_search_with_fallback(
         self,
@@ -40,27 +75,119 @@ class SearchOrchestrator:
     ) -> Dict[str, Any]:
         """
         Execute search with fallback logic.
+        
+        In speculative mode the text search fallback is started while the
+        vector search is still running (after speculative_fallback_delay, or
+        immediately), so a fallback costs max(vector, text) instead of
+        vector + text. Fast vector searches finish before the delay and never
+        start it; a started fallback is cancelled when the vector results turn
+        out sufficient.
         """
-        # Try vector search first (primary method)
-        context_data = await self.context_retrieval.get_vector_search_context(
-            user_request, content_type, content_type_enum, audience_type
-        )
+        fallback_task = None
+        start_fallback = None
+        fallback_state = {"speculative": False}
+        if self.speculative_fallback:
+            start_fallback = asyncio.Event()
+            if self.speculative_fallback_immediate:
+                start_fallback.set()
+            fallback_task = asyncio.create_task(self._speculative_text_search(
+                start_fallback, fallback_state, user_request, content_type, content_type_enum
+            ))
         
-        # Validate context quality
-        context_quality = self.quality_assessor.assess_context_quality(context_data)
+        try:
+            # Try vector search first (primary method)
+            context_data = await self.context_retrieval.get_vector_search_context(
+                user_request, content_type, content_type_enum, audience_type
+            )
+            
+            # Validate context quality
+            context_quality = self.quality_assessor.assess_context_quality(context_data)
+        except BaseException:
+            await self._cancel_fallback(fallback_task, fallback_state)
+            raise
         
         # Fall back to text search if vector search results are poor
         if not context_quality["sufficient"]:
-            fallback_context = await self.context_retrieval.get_text_search_context(
-                user_request, content_type, content_type_enum
-            )
+            if fallback_task is not None:
+                # Skip whatever is left of the delay
+                start_fallback.set()
+                fallback_context = await fallback_task
+                if fallback_state["speculative"]:
+                    self._speculative_used += 1
+            else:
+                fallback_context = await self.context_retrieval.get_text_search_context(
+                    user_request, content_type, content_type_enum
+                )
             
             # Combine vector and text results
             context_data = self.context_retrieval.combine_contexts(context_data, fallback_context)
             context_data["fallback_used"] = True
             context_data["fallback_reason"] = context_quality["reason"]
         else:
+            await self._cancel_fallback(fallback_task, fallback_state)
             context_data["fallback_used"] = False
             context_data["search_strategy"] = "vector"  # Explicitly set vector strategy
         
         return context_data
+    
+    async def embed_query(self, query_text: str) -> Optional[List[float]]:
+        """Query embedding from the retrieval service (served from the embedding cache on repeat)."""
+        return await self.context_retrieval.embed_query(query_text)
+    
+    async def _speculative_text_search(
+        self,
+        start_now: asyncio.Event,
+        state: Dict[str, bool],
+        user_request: str,
+        content_type: str,
+        content_type_enum: Optional[ContentType]
+    ) -> Dict[str, Any]:
+        """Text search context, started after the delay or as soon as start_now is set."""
+        if not start_now.is_set() and self.speculative_fallback_delay > 0:
+            try:
+                await asyncio.wait_for(start_now.wait(), timeout=self.speculative_fallback_delay)
+            except asyncio.TimeoutError:
+                pass
+        
+        # Started before the vector verdict (or alongside the vector search)
+        if not start_now.is_set() or self.speculative_fallback_immediate:
+            state["speculative"] = True
+            self._speculative_started += 1
+        
+        return await self.context_retrieval.get_text_search_context(
+            user_request, content_type, content_type_enum
+        )
+    
+    async def _cancel_fallback(self, fallback_task: Optional[asyncio.Task], state: Dict[str, bool]) -> None:
+        """
+        Cancel a speculative text search and wait for it to unwind.
+        
+        Only the child's own cancellation is swallowed; if the caller is
+        itself being cancelled while waiting, the CancelledError propagates.
+        """
+        if fallback_task is None:
+            return
+        if not fallback_task.done():
+            fallback_task.cancel()
+        try:
+            await fallback_task
+        except asyncio.CancelledError:
+            current = asyncio.current_task()
+            if not fallback_task.cancelled() or (current is not None and current.cancelling()):
+                raise
+        except Exception as e:
+            logger.warning(f"Discarded speculative text search failed: {e}")
+        finally:
+            if state["speculative"]:
+                self._speculative_wasted += 1
+    
+    def get_fallback_stats(self) -> Dict[str, Any]:
+        """Speculative fallback configuration and counters."""
+        return {
+            "speculative_fallback": self.speculative_fallback,
+            "delay_seconds": self.speculative_fallback_delay,
+            "immediate": self.speculative_fallback_immediate,
+            "speculative_started": self._speculative_started,
+            "speculative_used": self._speculative_used,
+            "speculative_wasted": self._speculative_wasted
+        }
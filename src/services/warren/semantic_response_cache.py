@@ -0,0 +1,196 @@
+"""
+Semantic Response Cache
+
+Remembers finished Warren generations keyed by the request embedding, content
+type, audience and the ids of the sources retrieved for it, so a repeat or
+near-duplicate request ("LinkedIn post about Roth IRA conversions for
+retirees") is answered without another LLM call.
+
+Responsibilities:
+- Buckets of generations per (content type, audience, retrieved source ids)
+- Near-duplicate match: cosine similarity of request embeddings above threshold
+- Expiry by TTL, LRU entry cap and marketing/compliance data changes
+
+"""
+
+import logging
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, List, Sequence, Tuple
+
+import numpy as np
+
+from config.settings import settings
+from src.services.search_result_cache import search_result_cache, MARKETING_CONTENT, COMPLIANCE_RULES
+
+logger = logging.getLogger(__name__)
+
+# Generations are built from these tables; a write to either retires the cache
+_SOURCE_TABLES = (MARKETING_CONTENT, COMPLIANCE_RULES)
+
+
+class SemanticResponseCache:
+    """LRU of generations, looked up by request embedding similarity."""
+
+    def __init__(self,
+                 similarity_threshold: float = 0.95,
+                 ttl_seconds: float = 3600.0,
+                 max_entries: int = 500,
+                 enabled: bool = False):
+        """
+        Initialize the cache.
+
+        Args:
+            similarity_threshold: Minimum cosine similarity between request
+                embeddings for a stored generation to be returned
+            ttl_seconds: Maximum age of a stored generation
+            max_entries: Generations kept before least recently used ones are dropped
+            enabled: When False nothing is stored or returned
+        """
+        self.similarity_threshold = similarity_threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.enabled = enabled
+
+        # entry id -> entry dict (bucket key, unit request vector, generation, stored_at)
+        self._entries: "OrderedDict[int, Dict[str, Any]]" = OrderedDict()
+        # bucket key -> entry ids (content type, audience, source ids)
+        self._buckets: Dict[Tuple, List[int]] = {}
+        self._next_id = 0
+        self._versions = search_result_cache.version_of(_SOURCE_TABLES)
+
+        # Metrics
+        self._hits = 0
+        self._misses = 0
+        self._stale = 0  # Expired or invalidated by data changes
+        self._stores = 0
+
+    def lookup(
+        self,
+        request_embedding: Optional[List[float]],
+        content_type: str,
+        audience_type: Optional[str],
+        source_ids: Sequence[Any]
+    ) -> Optional[Tuple[Dict[str, Any], float]]:
+        """
+        Stored generation for a near-duplicate request, if any.
+
+        Returns:
+            (copy of the stored generation, request similarity), or None to generate
+        """
+        query = self._unit_vector(request_embedding)
+        if not self.enabled or query is None:
+            return None
+        self._check_versions()
+
+        bucket = self._buckets.get(self._bucket_key(content_type, audience_type, source_ids), [])
+        now = time.monotonic()
+        for entry_id in [entry_id for entry_id in bucket if self._entries[entry_id]["stored_at"] + self.ttl_seconds <= now]:
+            self._stale += 1
+            self._remove(entry_id)
+
+        candidates = [entry_id for entry_id in bucket if self._entries[entry_id]["query"].shape == query.shape]
+        if not candidates:
+            self._misses += 1
+            return None
+
+        similarities = np.stack([self._entries[entry_id]["query"] for entry_id in candidates]) @ query
+        best = int(np.argmax(similarities))
+        similarity = float(similarities[best])
+        if similarity < self.similarity_threshold:
+            self._misses += 1
+            return None
+
+        entry_id = candidates[best]
+        self._entries.move_to_end(entry_id)
+        self._hits += 1
+        return dict(self._entries[entry_id]["generation"]), similarity
+
+    def store(
+        self,
+        request_embedding: Optional[List[float]],
+        content_type: str,
+        audience_type: Optional[str],
+        source_ids: Sequence[Any],
+        generation: Dict[str, Any]
+    ) -> None:
+        """Remember a finished generation (content and generation metadata)."""
+        query = self._unit_vector(request_embedding)
+        if not self.enabled or query is None:
+            return
+        self._check_versions()
+
+        key = self._bucket_key(content_type, audience_type, source_ids)
+        entry_id = self._next_id
+        self._next_id += 1
+        self._entries[entry_id] = {
+            "key": key,
+            "query": query,
+            "generation": dict(generation),
+            "stored_at": time.monotonic()
+        }
+        self._buckets.setdefault(key, []).append(entry_id)
+        self._stores += 1
+
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._buckets.clear()
+        self._hits = 0
+        self._misses = 0
+        self._stale = 0
+        self._stores = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit-rate metrics."""
+        lookups = self._hits + self._misses
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            "similarity_threshold": self.similarity_threshold,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self._hits,
+            "misses": self._misses,
+            "stale": self._stale,
+            "stores": self._stores,
+            "hit_rate_percent": round(self._hits / lookups * 100, 2) if lookups else 0.0
+        }
+
+    def _check_versions(self) -> None:
+        # Approved content or compliance rules changed: every stored generation may cite stale sources
+        versions = search_result_cache.version_of(_SOURCE_TABLES)
+        if versions != self._versions:
+            self._stale += len(self._entries)
+            self._entries.clear()
+            self._buckets.clear()
+            self._versions = versions
+
+    def _remove(self, entry_id: int) -> None:
+        entry = self._entries.pop(entry_id)
+        bucket = self._buckets[entry["key"]]
+        bucket.remove(entry_id)
+        if not bucket:
+            del self._buckets[entry["key"]]
+
+    @staticmethod
+    def _bucket_key(content_type: str, audience_type: Optional[str], source_ids: Sequence[Any]) -> Tuple:
+        return (content_type, audience_type, tuple(sorted(str(source_id) for source_id in source_ids)))
+
+    @staticmethod
+    def _unit_vector(embedding: Optional[List[float]]) -> Optional[np.ndarray]:
+        if not isinstance(embedding, (list, tuple, np.ndarray)) or len(embedding) == 0:
+            return None
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = float(np.linalg.norm(vector))
+        return vector / norm if norm else None
+
+
+# Process-wide cache used by the content generation orchestrator
+semantic_response_cache = SemanticResponseCache(
+    similarity_threshold=settings.warren_response_cache_threshold,
+    ttl_seconds=settings.warren_response_cache_ttl_seconds,
+    max_entries=settings.warren_response_cache_max_entries,
+    enabled=settings.warren_response_cache_enabled
+)
@@ -0,0 +1,183 @@
+"""
+Session Retrieval Memo
+
+Remembers the last retrieval (search context) of each Warren session together
+with the query embedding that produced it, so refinement turns on the same
+topic can reuse it instead of re-running the search pipeline.
+
+Responsibilities:
+- Per-session storage of the last search context and its query embedding
+- Reuse decision: same content/audience type, cosine similarity above threshold
+- Expiry by TTL, LRU session cap and marketing/compliance data changes
+
+"""
+
+import logging
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, List, Tuple
+
+import numpy as np
+
+from config.settings import settings
+from src.services.search_result_cache import search_result_cache, MARKETING_CONTENT, COMPLIANCE_RULES
+
+logger = logging.getLogger(__name__)
+
+# Retrieved context depends on these tables; a write to either retires memos
+_SOURCE_TABLES = (MARKETING_CONTENT, COMPLIANCE_RULES)
+
+
+class SessionRetrievalMemo:
+    """LRU of each session's last retrieval, keyed by session id."""
+
+    def __init__(self,
+                 similarity_threshold: float = 0.85,
+                 ttl_seconds: float = 1800.0,
+                 max_sessions: int = 1000,
+                 enabled: bool = True):
+        """
+        Initialize the memo.
+
+        Args:
+            similarity_threshold: Minimum cosine similarity between the new and
+                the remembered query for the remembered context to be reused
+            ttl_seconds: Maximum age of a remembered retrieval
+            max_sessions: Sessions kept before least recently used ones are dropped
+            enabled: When False nothing is remembered or reused
+        """
+        self.similarity_threshold = similarity_threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_sessions = max_sessions
+        self.enabled = enabled
+
+        # session_id -> entry dict (unit query vector, types, context, stored_at, versions)
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+        # Metrics
+        self._reused = 0
+        self._drifted = 0  # Query moved too far from the remembered one
+        self._mismatched = 0  # Content or audience type changed
+        self._stale = 0  # Expired or invalidated by data changes
+        self._misses = 0  # Nothing remembered for the session
+
+    def lookup(
+        self,
+        session_id: Optional[str],
+        query_embedding: Optional[List[float]],
+        content_type: str,
+        audience_type: Optional[str] = None
+    ) -> Optional[Tuple[Dict[str, Any], float]]:
+        """
+        Remembered context for a session turn, if it can be reused.
+
+        Returns:
+            (copy of the context, query similarity), or None to re-query
+        """
+        query = self._unit_vector(query_embedding)
+        if not self.enabled or not session_id or query is None:
+            return None
+
+        entry = self._entries.get(session_id)
+        if entry is None:
+            self._misses += 1
+            return None
+
+        if (entry["stored_at"] + self.ttl_seconds <= time.monotonic()
+                or entry["versions"] != search_result_cache.version_of(_SOURCE_TABLES)):
+            self._stale += 1
+            del self._entries[session_id]
+            return None
+
+        if entry["content_type"] != content_type or entry["audience_type"] != audience_type:
+            self._mismatched += 1
+            return None
+
+        if entry["query"].shape != query.shape:
+            self._drifted += 1
+            return None
+        similarity = float(entry["query"] @ query)
+        if similarity < self.similarity_threshold:
+            self._drifted += 1
+            return None
+
+        self._entries.move_to_end(session_id)
+        self._reused += 1
+        return self._copy(entry["context"]), similarity
+
+    def store(
+        self,
+        session_id: Optional[str],
+        query_embedding: Optional[List[float]],
+        content_type: str,
+        audience_type: Optional[str],
+        context_data: Dict[str, Any]
+    ) -> None:
+        """Remember a session's retrieval (replacing the previous one)."""
+        query = self._unit_vector(query_embedding)
+        if not self.enabled or not session_id or query is None:
+            return
+
+        self._entries[session_id] = {
+            "query": query,
+            "content_type": content_type,
+            "audience_type": audience_type,
+            "context": self._copy(context_data),
+            "stored_at": time.monotonic(),
+            "versions": search_result_cache.version_of(_SOURCE_TABLES)
+        }
+        self._entries.move_to_end(session_id)
+        while len(self._entries) > self.max_sessions:
+            self._entries.popitem(last=False)
+
+    def forget(self, session_id: str) -> None:
+        self._entries.pop(session_id, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._reused = 0
+        self._drifted = 0
+        self._mismatched = 0
+        self._stale = 0
+        self._misses = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Reuse metrics."""
+        lookups = self._reused + self._drifted + self._mismatched + self._stale + self._misses
+        return {
+            "enabled": self.enabled,
+            "sessions": len(self._entries),
+            "similarity_threshold": self.similarity_threshold,
+            "ttl_seconds": self.ttl_seconds,
+            "reused": self._reused,
+            "drifted": self._drifted,
+            "mismatched": self._mismatched,
+            "stale": self._stale,
+            "misses": self._misses,
+            "reuse_rate_percent": round(self._reused / lookups * 100, 2) if lookups else 0.0
+        }
+
+    @staticmethod
+    def _unit_vector(embedding: Optional[List[float]]) -> Optional[np.ndarray]:
+        if not isinstance(embedding, (list, tuple, np.ndarray)) or len(embedding) == 0:
+            return None
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = float(np.linalg.norm(vector))
+        return vector / norm if norm else None
+
+    @staticmethod
+    def _copy(context_data: Dict[str, Any]) -> Dict[str, Any]:
+        # Callers add session fields and merge results; never hand out the remembered dict
+        return {
+            key: list(value) if isinstance(value, list) else value
+            for key, value in context_data.items()
+        }
+
+
+# Process-wide memo used by the content generation orchestrator
+session_retrieval_memo = SessionRetrievalMemo(
+    similarity_threshold=settings.warren_retrieval_reuse_threshold,
+    ttl_seconds=settings.warren_retrieval_reuse_ttl_seconds,
+    max_sessions=settings.warren_retrieval_reuse_max_sessions,
+    enabled=settings.warren_retrieval_reuse_enabled
+)
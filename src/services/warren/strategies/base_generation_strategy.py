@@ -7,9 +7,13 @@ Eliminates code duplication by extracting shared methods from individual strateg
 
 import logging
 import time
-from typing import Dict, Any, Optional
+from abc import abstractmethod
+from typing import Dict, Any, Optional, Tuple, AsyncIterator
 
 from .content_generation_strategy import ContentGenerationStrategy, GenerationResult
+from src.services.claude_service import claude_service
+from src.services.prompt_service import CacheablePrompt
+from src.services.llm_scheduler import LLMPriority
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +24,82 @@ class BaseGenerationStrategy(ContentGenerationStrategy):
     
     """
     
+    @abstractmethod
+    async def _prepare_generation(
+        self,
+        context_data: Dict[str, Any],
+        user_request: str,
+        content_type: str,
+        audience_type: Optional[str] = None,
+        current_content: Optional[str] = None,
+        is_refinement: bool = False,
+        youtube_context: Optional[Dict[str, Any]] = None
+    ) -> Tuple[CacheablePrompt, Dict[str, Any]]:
+        """Build the final prompt and the strategy metadata for a generation."""
+        pass
+    
+    async def stream_content(
+        self,
+        context_data: Dict[str, Any],
+        user_request: str,
+        content_type: str,
+        audience_type: Optional[str] = None,
+        current_content: Optional[str] = None,
+        is_refinement: bool = False,
+        youtube_context: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Streaming variant of generate_content.
+        
+        Yields a "context_assembled" event once the prompt is built, "token"
+        events as Claude produces text, and a final "generation_complete" event
+        carrying the GenerationResult (failures included, nothing is raised).
+        """
+        strategy_name = self.get_strategy_name()
+        start_time = time.time()
+        chunks = []
+        token_usage = {}
+        
+        try:
+            final_prompt, metadata = await self._prepare_generation(
+                context_data, user_request, content_type, audience_type,
+                current_content, is_refinement, youtube_context
+            )
+            yield {
+                "event": "context_assembled",
+                "strategy": strategy_name,
+                "phase": metadata.get("phase"),
+                "total_tokens": metadata.get("token_management", {}).get("total_tokens")
+            }
+            
+            async for text in claude_service.stream_content(final_prompt, usage=token_usage, **self._llm_call_options(context_data)):
+                chunks.append(text)
+                yield {"event": "token", "text": text}
+            
+            result = GenerationResult()
+            self._populate_success_result(
+                result=result,
+                content="".join(chunks),
+                strategy_name=strategy_name,
+                start_time=start_time,
+                **metadata
+            )
+            result.token_usage = token_usage
+            logger.info(f"✅ {strategy_name.title()} generation strategy streamed successfully")
+            
+        except Exception as e:
+            result = self._handle_generation_error(e, strategy_name)
+            result.metadata["partial_content"] = "".join(chunks)
+        
+        yield {"event": "generation_complete", "result": result}
+    
+    def _llm_call_options(self, context_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Scheduling priority and fairness key for the Claude call."""
+        return {
+            "priority": context_data.get("llm_priority", LLMPriority.INTERACTIVE),
+            "advisor_id": context_data.get("user_id")
+        }
+    
     def _extract_platform_from_content_type(self, content_type: str) -> str:
         """Extract platform from content type."""
         platform_mapping = {
@@ -5,11 +5,11 @@ Legacy Generation Strategy
 
 import logging
 import time
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 
 from .base_generation_strategy import BaseGenerationStrategy
 from .content_generation_strategy import GenerationResult
-from src.services.prompt_service import prompt_service
+from src.services.prompt_service import prompt_service, CacheablePrompt, WARREN_GENERATION_REQUIREMENTS
 from src.services.claude_service import claude_service
 from src.services.warren.youtube_context_service import youtube_context_service
 
@@ -41,16 +41,15 @@ class LegacyGenerationStrategy(BaseGenerationStrategy):
         start_time = time.time()
         
         try:
-            if is_refinement and current_content:
-                final_prompt = self._build_refinement_prompt(
-                    context_data, user_request, content_type, audience_type, current_content
-                )
-            else:
-                final_prompt = self._build_generation_prompt(
-                    context_data, user_request, content_type, audience_type, youtube_context
-                )
+            final_prompt, metadata = await self._prepare_generation(
+                context_data, user_request, content_type, audience_type,
+                current_content, is_refinement, youtube_context
+            )
             
-            content = await claude_service.generate_content(final_prompt)
+            token_usage = {}
+            content = await claude_service.generate_content(
+                final_prompt, usage=token_usage, **self._llm_call_options(context_data)
+            )
             
             # Use base class method for success result population
             self._populate_success_result(
@@ -58,12 +57,9 @@ class LegacyGenerationStrategy(BaseGenerationStrategy):
                 content=content,
                 strategy_name="legacy",
                 start_time=start_time,
-                # Legacy-specific metadata
-                phase="Legacy_Fallback",
-                context_building="manual",
-                refinement=is_refinement,
-                youtube_context_present=youtube_context is not None
+                **metadata
             )
+            result.token_usage = token_usage
             
             logger.info("✅ Legacy generation strategy completed successfully")
             
@@ -73,6 +69,35 @@ class LegacyGenerationStrategy(BaseGenerationStrategy):
         
         return result
     
+    async def _prepare_generation(
+        self,
+        context_data: Dict[str, Any],
+        user_request: str,
+        content_type: str,
+        audience_type: Optional[str] = None,
+        current_content: Optional[str] = None,
+        is_refinement: bool = False,
+        youtube_context: Optional[Dict[str, Any]] = None
+    ) -> Tuple[CacheablePrompt, Dict[str, Any]]:
+        """Build the prompt from manually assembled context."""
+        if is_refinement and current_content:
+            final_prompt = self._build_refinement_prompt(
+                context_data, user_request, content_type, audience_type, current_content
+            )
+        else:
+            final_prompt = self._build_generation_prompt(
+                context_data, user_request, content_type, audience_type, youtube_context
+            )
+        
+        # Legacy-specific metadata
+        metadata = {
+            "phase": "Legacy_Fallback",
+            "context_building": "manual",
+            "refinement": is_refinement,
+            "youtube_context_present": youtube_context is not None
+        }
+        return final_prompt, metadata
+    
     def can_handle(self, context_data: Dict[str, Any]) -> bool:
         """
         Legacy strategy can always handle any context - this is the emergency fallback.
@@ -97,7 +122,7 @@ class LegacyGenerationStrategy(BaseGenerationStrategy):
         content_type: str,
         audience_type: Optional[str],
         current_content: str
-    ) -> str:
+    ) -> CacheablePrompt:
         """Build refinement prompt using base class context building."""
         # Use base class method for prompt context
         prompt_context = self._build_base_prompt_context(content_type, audience_type)
@@ -121,8 +146,7 @@ class LegacyGenerationStrategy(BaseGenerationStrategy):
 """
             logger.info(f"Added conversation context to refinement prompt: {len(conversation_context)} characters")
         
-        return f"""{base_system_prompt}
-{conversation_section}
+        return CacheablePrompt([base_system_prompt], f"""{conversation_section}
 CURRENT CONTENT TO REFINE:
 ##MARKETINGCONTENT##
 {current_content}
@@ -131,7 +155,7 @@ CURRENT CONTENT TO REFINE:
 USER'S REFINEMENT REQUEST: {user_request}
 
 Please refine the content based on the user's request while maintaining SEC/FINRA compliance. Consider the conversation history above for additional context about what we've been discussing.
-Wrap your refined content in ##MARKETINGCONTENT## delimiters and explain your changes."""
+Wrap your refined content in ##MARKETINGCONTENT## delimiters and explain your changes.""".lstrip())
     
     def _build_generation_prompt(
         self,
@@ -140,7 +164,7 @@ Wrap your refined content in ##MARKETINGCONTENT## delimiters and explain your ch
         content_type: str,
         audience_type: Optional[str],
         youtube_context: Optional[Dict[str, Any]]
-    ) -> str:
+    ) -> CacheablePrompt:
         """Build generation prompt using manual context building."""
         # Use base class method for prompt context
         prompt_context = self._build_base_prompt_context(content_type, audience_type)
@@ -170,12 +194,14 @@ Wrap your refined content in ##MARKETINGCONTENT## delimiters and explain your ch
                 if example.get('tags'):
                     context_parts.append(f"Tags: {example['tags']}")
         
-        # Add disclaimers
+        # Disclaimers change far less often than the rest of the context; they follow the system prompt
+        disclaimer_section = ""
         disclaimers = context_data.get("disclaimers", [])
         if disclaimers:
-            context_parts.append(f"\n## REQUIRED DISCLAIMERS:")
-            for disclaimer in disclaimers[:2]:
-                context_parts.append(f"\n**{disclaimer['title']}**: {disclaimer['content_text'][:200]}...")
+            disclaimer_section = "## REQUIRED DISCLAIMERS:" + "".join(
+                f"\n**{disclaimer['title']}**: {disclaimer['content_text'][:200]}..."
+                for disclaimer in disclaimers[:2]
+            )
         
         # Add YouTube context using shared service
         if youtube_context:
@@ -183,22 +209,16 @@ Wrap your refined content in ##MARKETINGCONTENT## delimiters and explain your ch
         
         knowledge_context = "\n".join(context_parts)
         
-        return f"""{base_system_prompt}
-
-{knowledge_context}
+        # Stable blocks first (cacheable), per-request context after
+        return CacheablePrompt(
+            [f"{base_system_prompt}\n\n{WARREN_GENERATION_REQUIREMENTS}", disclaimer_section],
+            f"""{knowledge_context}
 
 USER REQUEST: {user_request}
 CONTENT TYPE: {content_type}
 TARGET AUDIENCE: {audience_type or 'general'}
 
-Based on the compliance examples and requirements shown above, please create compliant marketing content that:
-1. Follows all SEC Marketing Rule and FINRA 2210 requirements
-2. Includes appropriate disclaimers and risk disclosures
-3. Uses educational tone rather than promotional claims
-4. Avoids performance predictions or guarantees
-5. Is appropriate for the specified platform/content type
-6. References the style and structure of the approved examples
-
-Remember to wrap your final marketing content in ##MARKETINGCONTENT## delimiters.
+Based on the compliance examples and disclaimers provided, please create compliant marketing content that meets the generation requirements.
 
 Generate the content now:"""
+        )
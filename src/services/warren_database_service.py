@@ -16,8 +16,12 @@ from src.models.refactored_database import (
     MarketingContent, ComplianceRules, WarrenInteractions, 
     ContentType, AudienceType, SourceType, ApprovalStatus
 )
+from config.settings import settings
 from src.core.database import AsyncSessionLocal
 from src.services.claude_service import claude_service
+from src.services.compliance_rules_registry import compliance_rules_registry
+from src.services.vector_search_service import marketing_full_text_clauses
+from src.services.search_result_cache import cached_search, MARKETING_CONTENT, COMPLIANCE_RULES
 
 logger = logging.getLogger(__name__)
 
@@ -27,26 +31,39 @@ class WarrenDatabaseService:
     
     def __init__(self):
         """Initialize the Warren database service."""
-        pass
+        # Rule lookups are served from the in-memory registry when it is available
+        self.rules_registry_enabled = settings.compliance_rules_registry_enabled
     
+    @cached_search(MARKETING_CONTENT)
     async def search_marketing_content(
         self, 
         query: str, 
         content_type: Optional[ContentType] = None,
         limit: int = 5
     ) -> List[Dict[str, Any]]:
-        """Search marketing content using text search (will be enhanced with vector search)."""
+        """Search marketing content using ranked full-text search."""
+        clauses = marketing_full_text_clauses(query)
+        if clauses is None:
+            return []
+        match, rank = clauses
+        
         async with AsyncSessionLocal() as db:
             try:
-                # Build search query
-                search_query = select(MarketingContent).where(
+                # Build search query (GIN index on search_vector)
+                search_query = select(
+                    MarketingContent.id,
+                    MarketingContent.title,
+                    MarketingContent.content_text,
+                    MarketingContent.content_type,
+                    MarketingContent.audience_type,
+                    MarketingContent.compliance_score,
+                    MarketingContent.tags,
+                    MarketingContent.usage_count,
+                    MarketingContent.source_type
+                ).where(
                     and_(
                         MarketingContent.approval_status == ApprovalStatus.APPROVED,
-                        or_(
-                            MarketingContent.content_text.contains(query),
-                            MarketingContent.title.contains(query),
-                            MarketingContent.tags.contains(query)
-                        )
+                        match
                     )
                 )
                 
@@ -54,14 +71,15 @@ class WarrenDatabaseService:
                 if content_type:
                     search_query = search_query.where(MarketingContent.content_type == content_type)
                 
-                # Order by usage count and compliance score
+                # Order by text rank, then usage count and compliance score
                 search_query = search_query.order_by(
+                    rank.desc(),
                     MarketingContent.usage_count.desc(),
                     MarketingContent.compliance_score.desc()
                 ).limit(limit)
                 
                 result = await db.execute(search_query)
-                contents = result.scalars().all()
+                contents = result.all()
                 
                 return [
                     {
@@ -82,6 +100,7 @@ class WarrenDatabaseService:
                 logger.error(f"Error searching marketing content: {str(e)}")
                 return []
     
+    @cached_search(COMPLIANCE_RULES)
     async def search_compliance_rules(
         self, 
         query: str, 
@@ -89,10 +108,32 @@ class WarrenDatabaseService:
         limit: int = 5
     ) -> List[Dict[str, Any]]:
         """Search compliance rules relevant to the query."""
+        if self.rules_registry_enabled and await compliance_rules_registry.ensure_current():
+            return [
+                {
+                    "id": rule["id"],
+                    "regulation_name": rule["regulation_name"],
+                    "rule_section": rule["rule_section"],
+                    "requirement_text": rule["requirement_text"],
+                    "required_disclaimers": rule["required_disclaimers"],
+                    "prohibition_type": rule["prohibition_type"],
+                    "applies_to_content_types": rule["applies_to_content_types"]
+                }
+                for rule in compliance_rules_registry.text_search(query, content_type, limit)
+            ]
+        
         async with AsyncSessionLocal() as db:
             try:
                 # Build search query
-                search_query = select(ComplianceRules).where(
+                search_query = select(
+                    ComplianceRules.id,
+                    ComplianceRules.regulation_name,
+                    ComplianceRules.rule_section,
+                    ComplianceRules.requirement_text,
+                    ComplianceRules.required_disclaimers,
+                    ComplianceRules.prohibition_type,
+                    ComplianceRules.applies_to_content_types
+                ).where(
                     or_(
                         ComplianceRules.requirement_text.contains(query),
                         ComplianceRules.regulation_name.contains(query),
@@ -112,7 +153,7 @@ class WarrenDatabaseService:
                 search_query = search_query.limit(limit)
                 
                 result = await db.execute(search_query)
-                rules = result.scalars().all()
+                rules = result.all()
                 
                 return [
                     {
@@ -131,15 +172,44 @@ class WarrenDatabaseService:
                 logger.error(f"Error searching compliance rules: {str(e)}")
                 return []
     
+    @cached_search(COMPLIANCE_RULES, MARKETING_CONTENT)
     async def get_disclaimers_for_content_type(
         self, 
         content_type: str
     ) -> List[Dict[str, Any]]:
-        """Get required disclaimers for a specific content type."""
+        """
+        Get required disclaimers for a specific content type.
+        
+        Rows come from compliance rules or, as a fallback, disclaimer-style
+        marketing content; "source" names the table the "id" belongs to.
+        """
+        # Disclaimers required by rules that apply to this content type
+        if self.rules_registry_enabled and await compliance_rules_registry.ensure_current():
+            rule_disclaimers = compliance_rules_registry.get_required_disclaimers(content_type, limit=3)
+            if rule_disclaimers:
+                return [
+                    {
+                        "id": rule["id"],
+                        "title": f"{rule['regulation_name']} {rule['rule_section'] or ''}".strip(),
+                        "content_text": rule["required_disclaimers"],
+                        "content_type": content_type,
+                        "tags": rule["prohibition_type"],
+                        "source": "compliance_rule"
+                    }
+                    for rule in rule_disclaimers
+                ]
+        
+        # Fall back to approved disclaimer-style marketing content
         async with AsyncSessionLocal() as db:
             try:
                 # Search for disclaimer-related marketing content
-                disclaimer_query = select(MarketingContent).where(
+                disclaimer_query = select(
+                    MarketingContent.id,
+                    MarketingContent.title,
+                    MarketingContent.content_text,
+                    MarketingContent.content_type,
+                    MarketingContent.tags
+                ).where(
                     and_(
                         MarketingContent.approval_status == ApprovalStatus.APPROVED,
                         or_(
@@ -151,7 +221,7 @@ class WarrenDatabaseService:
                 ).limit(3)
                 
                 result = await db.execute(disclaimer_query)
-                disclaimers = result.scalars().all()
+                disclaimers = result.all()
                 
                 return [
                     {
@@ -159,7 +229,8 @@ class WarrenDatabaseService:
                         "title": disclaimer.title,
                         "content_text": disclaimer.content_text,
                         "content_type": disclaimer.content_type.value,
-                        "tags": disclaimer.tags
+                        "tags": disclaimer.tags,
+                        "source": "marketing_content"
                     }
                     for disclaimer in disclaimers
                 ]
@@ -40,5 +40,13 @@ def event_loop():
     loop.close()
 
 
+@pytest.fixture(autouse=True)
+def clear_search_result_cache():
+    """Search results are cached process-wide; start every test with a cold cache."""
+    from src.services.search_result_cache import search_result_cache
+    search_result_cache.clear()
+    yield
+
+
 # Configure pytest-asyncio
 pytest_plugins = ["pytest_asyncio"]
@@ -5,23 +5,23 @@ from unittest.mock import Mock, patch
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.services.context_assembly_service.gathering.document_gatherer import DocumentGatherer
+from src.services.tokenizer_service import TokenizerService, tokenizer_service
 
 
 class TestDocumentGathererCoverage:
     
     @pytest.mark.asyncio 
-    async def test_tiktoken_initialization_failure(self):
-        """Test DocumentGatherer initialization when tiktoken fails."""
-        with patch('src.services.context_assembly_service.gathering.document_gatherer.tiktoken.encoding_for_model', side_effect=Exception("tiktoken error")):
-            gatherer = DocumentGatherer()
-            assert gatherer.tokenizer is None
+    async def test_uses_shared_tokenizer(self):
+        """Test DocumentGatherer uses the process-wide tokenizer."""
+        gatherer = DocumentGatherer()
+        assert gatherer.tokenizer is tokenizer_service
     
     @pytest.mark.asyncio
     async def test_token_counting_with_no_tokenizer(self):
         """Test token counting fallback when no tokenizer available."""
-        with patch('src.services.context_assembly_service.gathering.document_gatherer.tiktoken.encoding_for_model', side_effect=Exception("tiktoken error")):
-            gatherer = DocumentGatherer()
-            
+        gatherer = DocumentGatherer()
+        gatherer.tokenizer = TokenizerService()
+        with patch('src.services.tokenizer_service.tiktoken.get_encoding', side_effect=Exception("tiktoken error")):
             # Test with text
             tokens = gatherer.count_tokens("test text")
             assert tokens == len("test text") // 4
@@ -35,10 +35,11 @@ class TestDocumentGathererCoverage:
         """Test token counting when tokenizer.encode fails."""
         gatherer = DocumentGatherer()
         
-        # Mock tokenizer to exist but encoding to fail
-        mock_tokenizer = Mock()
-        mock_tokenizer.encode.side_effect = Exception("encoding error")
-        gatherer.tokenizer = mock_tokenizer
+        # Mock encoding to exist but encoding to fail
+        mock_encoding = Mock()
+        mock_encoding.encode_ordinary.side_effect = Exception("encoding error")
+        gatherer.tokenizer = TokenizerService()
+        gatherer.tokenizer._encodings[gatherer.tokenizer.encoding_name] = mock_encoding
         
         tokens = gatherer.count_tokens("test text")
         assert tokens == len("test text") // 4  # Falls back to approximation
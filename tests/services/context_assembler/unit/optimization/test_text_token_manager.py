@@ -5,7 +5,28 @@ import time
 import hashlib
 from unittest.mock import patch, MagicMock
 
-from src.services.context_assembly_service.optimization.text_token_manager import TextTokenManager
+from src.services.context_assembly_service.optimization.text_token_manager import (
+    TextTokenManager,
+    TokenCountCache,
+    shared_token_count_cache
+)
+from src.services.tokenizer_service import TokenizerService
+
+
+def _offline_tokenizer():
+    """Tokenizer whose encoding cannot be loaded."""
+    tokenizer = TokenizerService()
+    with patch('src.services.tokenizer_service.tiktoken.get_encoding', side_effect=Exception("No tiktoken")):
+        assert tokenizer.get_encoding() is None
+    return tokenizer
+
+
+@pytest.fixture(autouse=True)
+def clear_shared_cache():
+    """Keep the process-wide count cache from leaking between tests."""
+    shared_token_count_cache.clear()
+    yield
+    shared_token_count_cache.clear()
 
 
 class TestTextTokenManagerAccuracy:
@@ -170,37 +191,59 @@ class TestTextTokenManagerFallback:
     """Test fallback functionality."""
     
     def test_tiktoken_unavailable_fallback(self):
-        with patch('src.services.context_assembly_service.optimization.text_token_manager.tiktoken') as mock_tiktoken:
-            mock_tiktoken.encoding_for_model.side_effect = Exception("No tiktoken")
-            
-            manager = TextTokenManager()
-            count = manager.count_tokens("test content")
-            
-            # Should fallback to character estimation
-            assert count > 0
-            assert count == len("test content") // 4
+        manager = TextTokenManager(tokenizer=_offline_tokenizer())
+        count = manager.count_tokens("test content")
+        
+        # Should fallback to character estimation
+        assert count > 0
+        assert count == len("test content") // 4
     
     def test_encoding_error_fallback(self):
-        manager = TextTokenManager()
-        
-        # Mock encoding failure
-        if manager.tokenizer:
-            with patch.object(manager.tokenizer, 'encode', side_effect=Exception("Encoding error")):
-                count = manager.count_tokens("test content")
-                assert count == len("test content") // 4
+        tokenizer = TokenizerService()
+        encoding = MagicMock()
+        encoding.encode_ordinary.side_effect = Exception("Encoding error")
+        tokenizer._encodings[tokenizer.encoding_name] = encoding
+        manager = TextTokenManager(tokenizer=tokenizer)
+        
+        count = manager.count_tokens("test content")
+        assert count == len("test content") // 4
     
     def test_fallback_accuracy_approximation(self):
         # Test fallback provides reasonable approximation
-        with patch('src.services.context_assembly_service.optimization.text_token_manager.tiktoken') as mock_tiktoken:
-            mock_tiktoken.encoding_for_model.side_effect = Exception("No tiktoken")
-            
-            manager = TextTokenManager()
-            text = "This is a test sentence with multiple words"
-            count = manager.count_tokens(text)
-            
-            # Should be approximately 1 token per 4 characters
-            expected = len(text) // 4
-            assert count == expected
+        manager = TextTokenManager(tokenizer=_offline_tokenizer())
+        text = "This is a test sentence with multiple words"
+        count = manager.count_tokens(text)
+        
+        # Should be approximately 1 token per 4 characters
+        expected = len(text) // 4
+        assert count == expected
+    
+    def test_instances_share_tokenizer(self):
+        # Per-request managers reuse the process-wide encoder instead of loading their own
+        assert TextTokenManager().tokenizer is TextTokenManager().tokenizer
+
+
+class TestTextTokenManagerBatch:
+    """Test batch token counting."""
+    
+    def test_count_many_matches_single_counts(self):
+        manager = TextTokenManager()
+        texts = ["first text", "", "second, longer text here", "first text"]
+        
+        counts = manager.count_many(texts)
+        
+        assert counts == [TextTokenManager().count_tokens(text) for text in texts]
+        assert counts[1] == 0
+    
+    def test_count_many_uses_cache(self):
+        manager = TextTokenManager()
+        manager.count_tokens("cached text")
+        
+        with patch.object(manager.tokenizer, 'encode_batch', return_value=[[1, 2]]) as mock_batch:
+            counts = manager.count_many(["cached text", "new text"])
+        
+        mock_batch.assert_called_once_with(["new text"])
+        assert counts[1] == 2
 
 
 class TestTextTokenManagerPerformance:
@@ -277,3 +320,74 @@ class TestTextTokenManagerUtilityMethods:
         estimated_chars = manager.estimate_chars_from_tokens(token_count)
         
         assert estimated_chars == 1000  # 250 * 4
+
+
+class TestTokenCountCache:
+    """Test shared LRU count cache."""
+    
+    def test_shared_across_instances(self):
+        TextTokenManager().count_tokens("orchestrator one text")
+        
+        manager = TextTokenManager()
+        manager.count_tokens("orchestrator one text")
+        
+        assert manager.get_cache_stats()["cache_hits"] == 1
+        assert manager.get_cache_stats()["shared_cache"] is True
+    
+    def test_explicit_limit_uses_private_cache(self):
+        manager = TextTokenManager(cache_size_limit=10)
+        manager.count_tokens("private text")
+        
+        assert len(shared_token_count_cache) == 0
+        assert manager.get_cache_stats()["shared_cache"] is False
+    
+    def test_hit_refreshes_recency(self):
+        cache = TokenCountCache(max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)  # evicts b, the least recently used
+        
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+    
+    def test_bounded_by_bytes(self):
+        cache = TokenCountCache(max_bytes=10)
+        cache.set("12345", 1)
+        cache.set("67890", 2)
+        cache.set("abc", 3)  # 13 bytes > 10, evicts oldest
+        
+        stats = cache.get_stats()
+        assert cache.get("12345") is None
+        assert stats["bytes"] == 8
+        assert stats["evictions"] == 1
+    
+    def test_oversized_text_not_cached(self):
+        cache = TokenCountCache(max_bytes=4)
+        cache.set("too long", 2)
+        assert len(cache) == 0
+    
+    def test_large_input_uses_sampled_fingerprint(self):
+        cache = TokenCountCache(sample_threshold=100)
+        text = "x" * 1000
+        
+        with patch.object(cache, '_full_key', wraps=cache._full_key) as full_key:
+            cache.set(text, 250)
+            assert cache.get(text) == 250
+        
+        full_key.assert_not_called()
+    
+    def test_sampled_collision_falls_back_to_full_hash(self):
+        cache = TokenCountCache(sample_threshold=100)
+        original = "a" * 5000 + "b" * 5000
+        edited = "a" * 300 + "c" + "a" * 4699 + "b" * 5000  # Same length, change between sample windows
+        assert cache._sampled_key(original) == cache._sampled_key(edited)
+        
+        cache.set(original, 10)
+        assert cache.get(edited) is None
+        
+        cache.set(edited, 11)
+        assert cache.get(original) == 10
+        assert cache.get(edited) == 11
+        assert cache.get_stats()["fingerprint_collisions"] > 0
@@ -0,0 +1,255 @@
+"""
+Tests for ClaudeService
+
+Test Coverage:
+- Generation awaits the async Anthropic client (no executor threads)
+- Shared connection pool limits and timeouts come from settings
+- Error wrapping and test_connection results
+- Streaming yields text deltas as they arrive
+- Prompt caching: stable blocks sent as cache-marked system blocks, cache-hit accounting
+- Calls are admitted by the LLM scheduler (concurrency cap, priority order)
+"""
+
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from src.services.claude_service import ClaudeService
+from src.services.llm_scheduler import LLMScheduler, LLMPriority
+from src.services.prompt_service import CacheablePrompt
+
+
+def _usage(input_tokens=0, output_tokens=0, cache_creation_input_tokens=None, cache_read_input_tokens=None):
+    return MagicMock(
+        input_tokens=input_tokens,
+        output_tokens=output_tokens,
+        cache_creation_input_tokens=cache_creation_input_tokens,
+        cache_read_input_tokens=cache_read_input_tokens
+    )
+
+
+def _message(text, usage=None):
+    return MagicMock(content=[MagicMock(text=text)], usage=usage or _usage())
+
+
+class _FakeStream:
+    """Async context manager standing in for client.messages.stream(...)."""
+
+    def __init__(self, chunks, error=None, usage=None):
+        self.chunks = chunks
+        self.error = error
+        self.usage = usage or _usage()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    @property
+    async def text_stream(self):
+        for chunk in self.chunks:
+            yield chunk
+        if self.error:
+            raise self.error
+
+    async def get_final_message(self):
+        return _message("".join(self.chunks), self.usage)
+
+
+class TestClaudeService:
+    """Test suite for ClaudeService."""
+
+    @pytest.fixture
+    def service(self):
+        service = ClaudeService()
+        service.client = MagicMock()
+        service.client.messages.create = AsyncMock(return_value=_message("Generated text"))
+        return service
+
+    @pytest.mark.asyncio
+    async def test_generate_content_awaits_async_client(self, service):
+        with patch("asyncio.to_thread") as to_thread:
+            content = await service.generate_content("Write a post", max_tokens=200)
+
+        assert content == "Generated text"
+        to_thread.assert_not_called()
+        service.client.messages.create.assert_awaited_once_with(
+            model=service.model,
+            max_tokens=200,
+            messages=[{"role": "user", "content": "Write a post"}]
+        )
+
+    @pytest.mark.asyncio
+    async def test_concurrent_generations_share_the_event_loop(self, service):
+        """Many in-flight calls overlap (up to the scheduler cap) without consuming executor threads."""
+        in_flight = []
+        peak = []
+
+        async def create(**kwargs):
+            in_flight.append(1)
+            peak.append(len(in_flight))
+            await asyncio.sleep(0.01)
+            in_flight.pop()
+            return _message("ok")
+
+        service.client.messages.create = AsyncMock(side_effect=create)
+
+        results = await asyncio.gather(*(service.generate_content(f"prompt {i}") for i in range(50)))
+
+        assert results == ["ok"] * 50
+        assert max(peak) == service.scheduler.max_concurrent
+
+    @pytest.mark.asyncio
+    async def test_waiting_calls_are_admitted_by_priority(self, service):
+        service.scheduler = LLMScheduler(max_concurrent=1)
+        order = []
+
+        async def create(**kwargs):
+            order.append(kwargs["messages"][0]["content"])
+            await asyncio.sleep(0.01)
+            return _message("ok")
+
+        service.client.messages.create = AsyncMock(side_effect=create)
+
+        first = asyncio.create_task(service.generate_content("chat 1"))
+        await asyncio.sleep(0)
+        await asyncio.gather(
+            first,
+            service.generate_content("summary", priority=LLMPriority.BACKGROUND, advisor_id="advisor_a"),
+            service.generate_content("chat 2", advisor_id="advisor_b")
+        )
+
+        assert order == ["chat 1", "chat 2", "summary"]
+        assert service.get_scheduler_stats()["priorities"]["background"]["queued"] == 1
+
+    def test_pool_is_configured_from_settings(self):
+        with patch("src.services.claude_service.settings") as mock_settings, \
+             patch("src.services.claude_service.DefaultAsyncHttpxClient") as http_client, \
+             patch("src.services.claude_service.AsyncAnthropic") as client:
+            mock_settings.anthropic_max_connections = 64
+            mock_settings.anthropic_max_keepalive_connections = 16
+            mock_settings.anthropic_keepalive_expiry_seconds = 15.0
+            mock_settings.anthropic_read_timeout_seconds = 90.0
+            mock_settings.anthropic_connect_timeout_seconds = 5.0
+            mock_settings.anthropic_pool_timeout_seconds = 20.0
+            mock_settings.anthropic_max_retries = 3
+
+            service = ClaudeService()
+
+        limits = http_client.call_args.kwargs["limits"]
+        timeout = http_client.call_args.kwargs["timeout"]
+        assert (limits.max_connections, limits.max_keepalive_connections, limits.keepalive_expiry) == (64, 16, 15.0)
+        assert (timeout.read, timeout.connect, timeout.pool) == (90.0, 5.0, 20.0)
+        assert client.call_args.kwargs["http_client"] is service.http_client
+        assert client.call_args.kwargs["max_retries"] == 3
+
+    @pytest.mark.asyncio
+    async def test_api_errors_are_wrapped(self, service):
+        service.client.messages.create = AsyncMock(side_effect=RuntimeError("overloaded"))
+
+        with pytest.raises(Exception, match="Claude API error: overloaded"):
+            await service.generate_content("Write a post")
+
+        result = await service.test_connection()
+        assert result == {"status": "error", "error": "Claude API error: overloaded"}
+
+    @pytest.mark.asyncio
+    async def test_close_releases_the_pool(self, service):
+        service.client.close = AsyncMock()
+
+        await service.close()
+
+        service.client.close.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_stream_content_yields_text_deltas(self, service):
+        service.client.messages.stream = MagicMock(return_value=_FakeStream(["Saving ", "for ", "retirement"]))
+
+        chunks = [chunk async for chunk in service.stream_content("Write a post", max_tokens=300)]
+
+        assert chunks == ["Saving ", "for ", "retirement"]
+        service.client.messages.stream.assert_called_once_with(
+            model=service.model,
+            max_tokens=300,
+            messages=[{"role": "user", "content": "Write a post"}]
+        )
+
+    @pytest.mark.asyncio
+    async def test_stream_errors_are_wrapped(self, service):
+        service.client.messages.stream = MagicMock(
+            return_value=_FakeStream(["Saving "], error=RuntimeError("connection reset"))
+        )
+
+        chunks = []
+        with pytest.raises(Exception, match="Claude API error: connection reset"):
+            async for chunk in service.stream_content("Write a post"):
+                chunks.append(chunk)
+
+        assert chunks == ["Saving "]
+
+    @pytest.mark.asyncio
+    async def test_cacheable_prompt_sends_stable_blocks_as_cached_system(self, service):
+        prompt = CacheablePrompt(["Warren system prompt", "## REQUIRED DISCLAIMERS: ..."], "USER REQUEST: Roth IRA post")
+
+        await service.generate_content(prompt)
+
+        kwargs = service.client.messages.create.call_args.kwargs
+        assert kwargs["system"] == [
+            {"type": "text", "text": "Warren system prompt", "cache_control": {"type": "ephemeral"}},
+            {"type": "text", "text": "## REQUIRED DISCLAIMERS: ...", "cache_control": {"type": "ephemeral"}}
+        ]
+        assert kwargs["messages"] == [{"role": "user", "content": "USER REQUEST: Roth IRA post"}]
+
+    @pytest.mark.asyncio
+    async def test_caching_disabled_sends_single_message(self, service):
+        service.prompt_caching_enabled = False
+        prompt = CacheablePrompt(["Warren system prompt"], "USER REQUEST: Roth IRA post")
+
+        await service.generate_content(prompt)
+
+        kwargs = service.client.messages.create.call_args.kwargs
+        assert "system" not in kwargs
+        assert kwargs["messages"] == [{"role": "user", "content": "Warren system prompt\n\nUSER REQUEST: Roth IRA post"}]
+
+    @pytest.mark.asyncio
+    async def test_usage_reports_cache_hits_per_request(self, service):
+        service.client.messages.create = AsyncMock(side_effect=[
+            _message("first", _usage(input_tokens=300, output_tokens=50, cache_creation_input_tokens=1500)),
+            _message("second", _usage(input_tokens=280, output_tokens=60, cache_read_input_tokens=1500))
+        ])
+        prompt = CacheablePrompt(["Warren system prompt"], "USER REQUEST")
+
+        first_usage, second_usage = {}, {}
+        await service.generate_content(prompt, usage=first_usage)
+        await service.generate_content(prompt, usage=second_usage)
+
+        assert first_usage["cache_hit"] is False
+        assert first_usage["cache_creation_input_tokens"] == 1500
+        assert second_usage == {
+            "input_tokens": 280,
+            "output_tokens": 60,
+            "cache_creation_input_tokens": 0,
+            "cache_read_input_tokens": 1500,
+            "cache_hit": True
+        }
+        stats = service.get_prompt_cache_stats()
+        assert (stats["requests"], stats["cache_hits"], stats["cache_writes"]) == (2, 1, 1)
+        assert stats["hit_rate_percent"] == 50.0
+        assert stats["cached_input_percent"] == round(1500 / 3580 * 100, 2)
+
+    @pytest.mark.asyncio
+    async def test_stream_usage_is_filled_when_stream_ends(self, service):
+        service.client.messages.stream = MagicMock(
+            return_value=_FakeStream(["ok"], usage=_usage(input_tokens=200, cache_read_input_tokens=1500))
+        )
+        prompt = CacheablePrompt(["Warren system prompt"], "USER REQUEST")
+
+        usage = {}
+        chunks = [chunk async for chunk in service.stream_content(prompt, usage=usage)]
+
+        assert chunks == ["ok"]
+        assert usage["cache_hit"] is True
+        assert usage["cache_read_input_tokens"] == 1500
+        assert service.client.messages.stream.call_args.kwargs["messages"] == [{"role": "user", "content": "USER REQUEST"}]
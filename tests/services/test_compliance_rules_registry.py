@@ -0,0 +1,173 @@
+"""
+Tests for ComplianceRulesRegistry
+
+Test Coverage:
+- applies_to_content_types parsing (JSON arrays, single values, "all")
+- Vectorized similarity search with content type applicability
+- Text search and required disclaimer lookups
+- Version stamp checks, reloads and invalidation
+"""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from src.services.compliance_rules_registry import ComplianceRulesRegistry, parse_content_types
+
+
+def _rule(rule_id, embedding, applies_to=None, disclaimers=None, requirement="Communications must be fair."):
+    return MagicMock(
+        id=rule_id,
+        regulation_name=f"Rule {rule_id}",
+        rule_section="(d)(1)",
+        requirement_text=requirement,
+        required_disclaimers=disclaimers,
+        prohibition_type="performance_claims",
+        applies_to_content_types=applies_to,
+        applicability_scope="all_advisors",
+        embedding=embedding
+    )
+
+
+RULES = [
+    _rule(1, [1.0, 0.0, 0.0], applies_to='["LINKEDIN_POST", "X_POST"]', disclaimers="Social disclaimer"),
+    _rule(2, [0.8, 0.6, 0.0], applies_to="all", disclaimers="General disclaimer"),
+    _rule(3, [0.0, 1.0, 0.0], applies_to='["NEWSLETTER"]', requirement="Testimonials need disclosure."),
+    _rule(4, None, applies_to=None)
+]
+
+
+def _version_result(version):
+    result = MagicMock()
+    result.one.return_value = version
+    return result
+
+
+def _rows_result(rows):
+    result = MagicMock()
+    result.all.return_value = rows
+    return result
+
+
+def _session_factory(*responses):
+    """AsyncSessionLocal replacement returning the given execute results in order."""
+    session = AsyncMock()
+    session.execute.side_effect = list(responses)
+
+    factory = MagicMock()
+    factory.return_value.__aenter__.return_value = session
+    factory.return_value.__aexit__.return_value = False
+    return factory, session
+
+
+class TestParseContentTypes:
+    """Test suite for applies_to_content_types normalization."""
+
+    def test_json_array_is_lowercased(self):
+        assert parse_content_types('["LINKEDIN_POST", "X_POST"]') == ["linkedin_post", "x_post"]
+
+    def test_plain_value(self):
+        assert parse_content_types("retail_communications") == ["retail_communications"]
+
+    def test_universal_values(self):
+        assert parse_content_types(None) is None
+        assert parse_content_types("all") is None
+        assert parse_content_types("[]") is None
+
+
+class TestComplianceRulesRegistry:
+    """Test suite for ComplianceRulesRegistry."""
+
+    @pytest.fixture
+    def registry(self):
+        registry = ComplianceRulesRegistry()
+        registry.build(RULES)
+        return registry
+
+    def test_search_ranks_applicable_rules(self, registry):
+        """Scores are cosine similarities over rules applicable to the content type."""
+        results = registry.search([1.0, 0.0, 0.0], content_type="linkedin_post", similarity_threshold=0.0)
+
+        assert [rule["id"] for rule in results] == [1, 2]
+        assert results[0]["similarity_score"] == pytest.approx(1.0)
+        assert results[1]["similarity_score"] == pytest.approx(0.8)
+        assert results[0]["search_method"] == "vector"
+
+    def test_search_without_content_type_uses_all_embedded_rules(self, registry):
+        results = registry.search([0.0, 1.0, 0.0], similarity_threshold=0.5, limit=5)
+
+        assert [rule["id"] for rule in results] == [3, 2]
+
+    def test_unknown_content_type_matches_universal_rules(self, registry):
+        results = registry.search([1.0, 0.0, 0.0], content_type="youtube_video")
+
+        assert [rule["id"] for rule in results] == [2]
+
+    def test_text_search(self, registry):
+        results = registry.text_search("testimonials", content_type="NEWSLETTER")
+
+        assert [rule["id"] for rule in results] == [3]
+        assert registry.text_search("testimonials", content_type="linkedin_post") == []
+
+    def test_required_disclaimers_prefer_specific_rules(self, registry):
+        disclaimers = registry.get_required_disclaimers("linkedin_post")
+
+        assert [rule["required_disclaimers"] for rule in disclaimers] == ["Social disclaimer", "General disclaimer"]
+        assert [rule["id"] for rule in registry.get_required_disclaimers("newsletter")] == [2]
+
+    @pytest.mark.asyncio
+    async def test_version_checked_once_per_interval(self):
+        """Rules load once; within the interval no queries are made."""
+        registry = ComplianceRulesRegistry(version_check_interval=60)
+        factory, session = _session_factory(_version_result((4, "t1")), _rows_result(RULES))
+
+        with patch("src.services.compliance_rules_registry.AsyncSessionLocal", factory):
+            assert await registry.ensure_current() is True
+            assert await registry.ensure_current() is True
+
+        assert session.execute.await_count == 2
+        assert registry.get_stats()["rules"] == 4
+
+    @pytest.mark.asyncio
+    async def test_changed_version_triggers_reload(self):
+        """A new version stamp reloads; an unchanged one does not."""
+        registry = ComplianceRulesRegistry(version_check_interval=0)
+        factory, session = _session_factory(
+            _version_result((4, "t1")), _rows_result(RULES),
+            _version_result((4, "t1")),  # unchanged: rows are not re-read
+            _version_result((5, "t2")), _rows_result(RULES)
+        )
+
+        with patch("src.services.compliance_rules_registry.AsyncSessionLocal", factory):
+            await registry.ensure_current()
+            await registry.ensure_current()
+            await registry.ensure_current()
+
+        assert session.execute.await_count == 5
+        assert registry.get_stats()["reloads"] == 2
+
+    @pytest.mark.asyncio
+    async def test_invalidate_forces_reload(self):
+        registry = ComplianceRulesRegistry(version_check_interval=60)
+        factory, session = _session_factory(
+            _version_result((4, "t1")), _rows_result(RULES),
+            _version_result((4, "t1")), _rows_result(RULES)
+        )
+
+        with patch("src.services.compliance_rules_registry.AsyncSessionLocal", factory):
+            await registry.ensure_current()
+            registry.invalidate()
+            await registry.ensure_current()
+
+        assert registry.get_stats()["reloads"] == 2
+
+    @pytest.mark.asyncio
+    async def test_load_failure_reports_unavailable(self):
+        """Database errors leave the registry unloaded so callers fall back to Postgres."""
+        registry = ComplianceRulesRegistry(version_check_interval=60)
+        factory, session = _session_factory(Exception("db down"))
+
+        with patch("src.services.compliance_rules_registry.AsyncSessionLocal", factory):
+            assert await registry.ensure_current() is False
+            assert await registry.ensure_current() is False
+
+        session.execute.assert_awaited_once()
@@ -0,0 +1,218 @@
+"""
+Tests for ContentManagementService
+
+Test Coverage:
+- Title autocomplete uses trigram word similarity ordered by index distance
+- Autocomplete result mapping and error handling
+- Autocomplete endpoint approval_status filter parsing
+- Embedding vectors are deferred and never read by list/detail/delete paths
+- Create/update invalidate search caches even when re-embedding fails
+"""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import asyncpg
+
+from src.api.endpoints import autocomplete_content_titles
+from src.services.content_management_service import ContentManagementService
+from src.models.refactored_database import (
+    ApprovalStatus, AudienceType, ComplianceRules, ContentType, MarketingContent, SourceType
+)
+
+
+def _mock_session_factory(rows=None):
+    session = AsyncMock()
+    result = MagicMock()
+    result.all.return_value = rows or []
+    result.scalar.return_value = len(rows or [])
+    result.one_or_none.return_value = rows[0] if rows else None
+    session.execute.return_value = result
+
+    factory = MagicMock()
+    factory.return_value.__aenter__.return_value = session
+    factory.return_value.__aexit__.return_value = False
+    return factory, session
+
+
+class TestContentTitleAutocomplete:
+    """Test suite for ContentManagementService.autocomplete_titles."""
+
+    @pytest.fixture
+    def service(self):
+        return ContentManagementService()
+
+    @pytest.mark.asyncio
+    async def test_query_is_trigram_knn(self, service):
+        """Suggestions filter with %> and order by the <->> distance (GiST KNN)."""
+        factory, session = _mock_session_factory()
+
+        with patch("src.services.content_management_service.AsyncSessionLocal", factory):
+            await service.autocomplete_titles("retir", limit=5, approval_status=ApprovalStatus.APPROVED)
+
+        statement = session.execute.call_args.args[0]
+        sql = str(statement.compile(dialect=asyncpg.dialect()))
+        assert "marketing_content.title %> " in sql
+        assert "ORDER BY marketing_content.title <->> " in sql
+        assert "LIKE" not in sql
+        assert "marketing_content.approval_status = " in sql
+
+    @pytest.mark.asyncio
+    async def test_suggestions_are_scored(self, service):
+        row = MagicMock(id=4, title="Retirement Planning 101", content_type=ContentType.WEBSITE_BLOG, distance=0.25)
+        factory, _ = _mock_session_factory([row])
+
+        with patch("src.services.content_management_service.AsyncSessionLocal", factory):
+            result = await service.autocomplete_titles("retirement plan")
+
+        assert result == {
+            "status": "success",
+            "query": "retirement plan",
+            "suggestions": [
+                {"id": 4, "title": "Retirement Planning 101", "content_type": "WEBSITE_BLOG", "score": 0.75}
+            ]
+        }
+
+    @pytest.mark.asyncio
+    async def test_database_error(self, service):
+        factory, session = _mock_session_factory()
+        session.execute.side_effect = Exception("pg_trgm missing")
+
+        with patch("src.services.content_management_service.AsyncSessionLocal", factory):
+            result = await service.autocomplete_titles("retir")
+
+        assert result == {"status": "error", "error": "pg_trgm missing"}
+
+
+class TestAutocompleteEndpoint:
+    """approval_status query parameter of GET /content/autocomplete."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("approval_status", ["approved", "APPROVED", "Approved"])
+    async def test_approval_status_filter_is_parsed(self, approval_status):
+        with patch("src.api.endpoints.content_management_service.autocomplete_titles",
+                   new_callable=AsyncMock) as autocomplete:
+            autocomplete.return_value = {"status": "success", "query": "retir", "suggestions": []}
+            result = await autocomplete_content_titles("retir", limit=5, approval_status=approval_status)
+
+        assert result["status"] == "success"
+        autocomplete.assert_awaited_once_with("retir", limit=5, approval_status=ApprovalStatus.APPROVED)
+
+    @pytest.mark.asyncio
+    async def test_unknown_approval_status_is_rejected(self):
+        with patch("src.api.endpoints.content_management_service.autocomplete_titles",
+                   new_callable=AsyncMock) as autocomplete:
+            result = await autocomplete_content_titles("retir", limit=5, approval_status="published")
+
+        assert result == {"status": "error", "error": "Invalid approval_status: published"}
+        autocomplete.assert_not_awaited()
+
+
+def _content_row(row_id, has_embedding=True):
+    return MagicMock(
+        id=row_id,
+        title=f"Content {row_id}",
+        content_text="Planning for retirement...",
+        content_type=ContentType.LINKEDIN_POST,
+        audience_type=AudienceType.CLIENT_COMMUNICATION,
+        approval_status=ApprovalStatus.APPROVED,
+        source_type=SourceType.FIDUCIA_CREATED,
+        tags="retirement,planning",
+        created_at=None,
+        updated_at=None,
+        fiducia_approved_at=None,
+        has_embedding=has_embedding
+    )
+
+
+def _selected_columns(statement):
+    return {column.key for column in statement.selected_columns}
+
+
+class TestEmbeddingProjection:
+    """Test suite for reading content without transferring embedding vectors."""
+
+    @pytest.fixture
+    def service(self):
+        return ContentManagementService()
+
+    def test_embedding_columns_are_deferred(self):
+        """Plain entity selects leave the 1536-dim vectors unloaded."""
+        for model in (MarketingContent, ComplianceRules):
+            sql = str(select(model).compile(dialect=asyncpg.dialect()))
+            assert "embedding" not in sql
+
+    @pytest.mark.asyncio
+    async def test_list_projects_has_embedding(self, service):
+        factory, session = _mock_session_factory([_content_row(1), _content_row(2, has_embedding=False)])
+
+        with patch("src.services.content_management_service.AsyncSessionLocal", factory):
+            result = await service.get_all_content(search_query="retirement")
+
+        statement = session.execute.call_args.args[0]
+        assert "embedding" not in _selected_columns(statement)
+        assert "has_embedding" in _selected_columns(statement)
+        assert "marketing_content.embedding IS NOT NULL" in str(statement.compile(dialect=asyncpg.dialect()))
+        assert [item["has_embedding"] for item in result["content"]] == [True, False]
+
+    @pytest.mark.asyncio
+    async def test_detail_projects_has_embedding(self, service):
+        factory, session = _mock_session_factory([_content_row(5)])
+
+        with patch("src.services.content_management_service.AsyncSessionLocal", factory):
+            result = await service.get_content_by_id(5)
+
+        statement = session.execute.call_args.args[0]
+        assert "embedding" not in _selected_columns(statement)
+        assert result["content"]["has_embedding"] is True
+
+
+class TestContentChangeNotification:
+    """Writes invalidate cached searches, readiness and the memory index."""
+
+    @pytest.fixture
+    def service(self):
+        service = ContentManagementService()
+        service._generate_embedding_for_content = AsyncMock(
+            return_value={"status": "error", "embedding_generated": False, "error": "Failed to generate embedding"}
+        )
+        return service
+
+    @pytest.fixture
+    def vector_search(self):
+        with patch("src.services.content_management_service.vector_search_service") as vector_search:
+            yield vector_search
+
+    @pytest.mark.asyncio
+    async def test_update_notifies_when_re_embedding_fails(self, service, vector_search):
+        content_item = MagicMock(id=7, title="Old title", content_text="Old text", content_type=ContentType.LINKEDIN_POST)
+        factory, session = _mock_session_factory()
+        session.execute.return_value.scalar_one_or_none.return_value = content_item
+
+        with patch("src.services.content_management_service.AsyncSessionLocal", factory):
+            result = await service.update_content(7, {"title": "New title", "approval_status": "rejected"})
+
+        assert result["status"] == "success"
+        assert result["vectorization"]["embedding_generated"] is False
+        vector_search.notify_content_changed.assert_called_once_with([7])
+
+    @pytest.mark.asyncio
+    async def test_create_notifies_when_embedding_fails(self, service, vector_search):
+        factory, session = _mock_session_factory()
+        session.add = MagicMock()
+
+        async def assign_id(content):
+            content.id = 11
+
+        session.refresh.side_effect = assign_id
+
+        with patch("src.services.content_management_service.AsyncSessionLocal", factory):
+            result = await service.create_content({
+                "title": "Roth conversions",
+                "content_text": "Converting to a Roth IRA...",
+                "content_type": "linkedin_post",
+                "audience_type": "client_communication"
+            })
+
+        assert result["status"] == "success"
+        vector_search.notify_content_changed.assert_called_once_with([11])
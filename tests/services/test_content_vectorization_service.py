@@ -0,0 +1,198 @@
+"""
+Tests for ContentVectorizationService
+
+Test Coverage:
+- Bulk vectorization streams rows and writes each batch with one UPDATE ... FROM (VALUES ...)
+- Checkpoint advances over contiguous successful batches only
+- Resume starts after the stored checkpoint (forced runs only)
+- Regular runs select rows without embeddings and never use the checkpoint
+- Bulk runs bypass the query embedding cache; a failed stream cancels started batches
+"""
+
+import asyncio
+
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+from sqlalchemy.dialects import postgresql
+
+from src.services.content_vectorization_service import ContentVectorizationService, _PipelineRun
+
+
+def _row(row_id):
+    """Build a streamed marketing content row."""
+    return SimpleNamespace(
+        id=row_id,
+        title=f"Example {row_id}",
+        content_text="Planning for retirement is crucial...",
+        content_type=None,
+        audience_type=None,
+        tags="retirement"
+    )
+
+
+class _StreamResult:
+    """Stand-in for AsyncResult.partitions()."""
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    async def partitions(self, size):
+        for i in range(0, len(self.rows), size):
+            yield self.rows[i:i + size]
+
+
+def _mock_session_factory(rows):
+    """AsyncSessionLocal replacement: stream() yields rows, execute() is recorded."""
+    session = AsyncMock()
+    session.stream.return_value = _StreamResult(rows)
+
+    factory = MagicMock()
+    factory.return_value.__aenter__.return_value = session
+    factory.return_value.__aexit__.return_value = False
+    return factory, session
+
+
+class TestContentVectorizationService:
+    """Test suite for the bulk vectorization pipeline."""
+
+    @pytest.fixture
+    def service(self):
+        """Service with small batches and checkpoint storage mocked out."""
+        service = ContentVectorizationService()
+        service.batch_size = 2
+        service.max_concurrent_batches = 2
+        service._ensure_checkpoint_table = AsyncMock()
+        service._load_checkpoint = AsyncMock(return_value=0)
+        service._save_checkpoint = AsyncMock()
+        service._clear_checkpoint = AsyncMock()
+        return service
+
+    @pytest.fixture
+    def mock_embedding_service(self):
+        """Patch the shared embedding service."""
+        with patch("src.services.content_vectorization_service.embedding_service") as mock_service:
+            mock_service.dimensions = 3
+            mock_service.prepare_text_for_embedding.side_effect = lambda **kwargs: kwargs["title"]
+            mock_service.count_tokens_many.side_effect = lambda texts: [10] * len(texts)
+            mock_service.estimate_cost.return_value = 0.001
+            mock_service.generate_batch_embeddings = AsyncMock(
+                side_effect=lambda texts, use_cache=True: [[0.1, 0.2, 0.3] for _ in texts]
+            )
+            yield mock_service
+
+    @pytest.mark.asyncio
+    async def test_vectorize_streams_and_bulk_updates(self, service, mock_embedding_service):
+        """Every batch is embedded in one call and written with one bulk UPDATE."""
+        factory, session = _mock_session_factory([_row(i) for i in range(1, 6)])
+
+        with patch("src.services.content_vectorization_service.AsyncSessionLocal", factory):
+            result = await service.vectorize_existing_marketing_content()
+
+        assert result["status"] == "success"
+        assert result["processed"] == 5
+        assert result["total_items"] == 5
+        assert result["batch_count"] == 3
+        assert mock_embedding_service.generate_batch_embeddings.call_count == 3
+
+        updates = [call for call in session.execute.call_args_list if "UPDATE" in str(call[0][0])]
+        assert len(updates) == 3
+        sql = str(updates[0][0][0].compile(dialect=postgresql.dialect()))
+        assert "FROM (VALUES" in sql
+        assert updates[0][0][1]["id_0"] == 1
+        assert updates[0][0][1]["embedding_1"] == [0.1, 0.2, 0.3]
+
+        assert result["checkpoint_id"] == 5
+        for call in mock_embedding_service.generate_batch_embeddings.call_args_list:
+            assert call.kwargs["use_cache"] is False
+
+    @pytest.mark.asyncio
+    async def test_stream_failure_cancels_started_batches(self, service, mock_embedding_service):
+        """Batches already embedding are cancelled and awaited when the cursor fails."""
+        cancelled = []
+
+        async def hang(texts, use_cache=True):
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                cancelled.append(texts)
+                raise
+
+        mock_embedding_service.generate_batch_embeddings.side_effect = hang
+
+        class _FailingStream:
+            async def partitions(self, size):
+                yield [_row(1), _row(2)]
+                await asyncio.sleep(0)
+                raise ConnectionError("cursor lost")
+
+        factory, session = _mock_session_factory([])
+        session.stream.return_value = _FailingStream()
+
+        with patch("src.services.content_vectorization_service.AsyncSessionLocal", factory):
+            result = await service.vectorize_existing_marketing_content()
+
+        assert result["status"] == "error"
+        assert result["error"] == "cursor lost"
+        assert cancelled == [["Example 1", "Example 2"]]
+
+    @pytest.mark.asyncio
+    async def test_regular_run_ignores_checkpoint(self, service, mock_embedding_service):
+        """Rows without embeddings are selected regardless of any stored watermark."""
+        service._load_checkpoint.return_value = 42
+        factory, session = _mock_session_factory([_row(i) for i in range(1, 4)])
+
+        with patch("src.services.content_vectorization_service.AsyncSessionLocal", factory):
+            result = await service.vectorize_existing_marketing_content()
+
+        query = str(session.stream.call_args[0][0])
+        assert "marketing_content.embedding IS NULL" in query
+        assert "marketing_content.id >" not in query
+        assert result["processed"] == 3
+        service._load_checkpoint.assert_not_called()
+        service._save_checkpoint.assert_not_called()
+        service._clear_checkpoint.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_holds_checkpoint(self, service, mock_embedding_service):
+        """A batch with failures stops the watermark; the checkpoint is cleared once the run completes."""
+        mock_embedding_service.generate_batch_embeddings.side_effect = lambda texts, use_cache=True: [
+            None if text == "Example 3" else [0.1, 0.2, 0.3] for text in texts
+        ]
+        factory, _ = _mock_session_factory([_row(i) for i in range(1, 6)])
+
+        with patch("src.services.content_vectorization_service.AsyncSessionLocal", factory):
+            result = await service.vectorize_existing_marketing_content(force_update=True)
+
+        assert result["processed"] == 4
+        assert result["errors"] == 1
+        assert result["checkpoint_id"] == 2
+        assert service._save_checkpoint.await_args.args[:2] == ("marketing_content_force", 2)
+        service._clear_checkpoint.assert_awaited_once_with("marketing_content_force")
+
+    @pytest.mark.asyncio
+    async def test_resume_starts_after_checkpoint(self, service, mock_embedding_service):
+        """The stream query filters on ids after the stored checkpoint."""
+        service._load_checkpoint.return_value = 42
+        factory, session = _mock_session_factory([])
+
+        with patch("src.services.content_vectorization_service.AsyncSessionLocal", factory):
+            result = await service.vectorize_existing_marketing_content(force_update=True)
+
+        query = session.stream.call_args[0][0]
+        assert "marketing_content.id >" in str(query)
+        assert query.compile().params["id_1"] == 42
+        assert result["processed"] == 0
+
+    @pytest.mark.asyncio
+    async def test_checkpoint_advances_over_out_of_order_completion(self, service):
+        """Batches finishing out of order only advance the contiguous prefix."""
+        run = _PipelineRun("marketing_content")
+
+        await service._advance_checkpoint(run, 1, last_id=20, succeeded=True)
+        assert run.watermark == 0
+        service._save_checkpoint.assert_not_called()
+
+        await service._advance_checkpoint(run, 0, last_id=10, succeeded=True)
+        assert run.watermark == 20
+        service._save_checkpoint.assert_awaited_once_with("marketing_content", 20, 0)
@@ -0,0 +1,135 @@
+"""
+Tests for EmbeddingMicroBatcher
+
+Test Coverage:
+- Concurrent submissions coalesced into one batch call
+- Deduplication of identical texts within a window
+- Early flush at max batch size
+- Error fan-out to all waiters (including short batch results and cancelled batches)
+- EmbeddingService.generate_embedding routed through the batcher
+"""
+
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from src.services.embedding_batcher import EmbeddingMicroBatcher
+from src.services.embedding_service import EmbeddingService
+
+
+class TestEmbeddingMicroBatcher:
+    """Test suite for EmbeddingMicroBatcher."""
+
+    @pytest.fixture
+    def embed_batch(self):
+        """Batch embedder returning one vector per text, derived from its length."""
+        return AsyncMock(side_effect=lambda texts: [[float(len(text))] for text in texts])
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_share_one_call(self, embed_batch):
+        """Requests within the window are sent as a single batch."""
+        batcher = EmbeddingMicroBatcher(embed_batch, window_ms=5, max_batch_size=10)
+
+        results = await asyncio.gather(*(batcher.submit(text) for text in ["a", "bb", "ccc"]))
+
+        assert results == [[1.0], [2.0], [3.0]]
+        embed_batch.assert_awaited_once_with(["a", "bb", "ccc"])
+
+    @pytest.mark.asyncio
+    async def test_identical_texts_are_deduplicated(self, embed_batch):
+        """Identical texts in a window are embedded once and fanned out."""
+        batcher = EmbeddingMicroBatcher(embed_batch, window_ms=5)
+
+        results = await asyncio.gather(batcher.submit("same"), batcher.submit("same"), batcher.submit("other"))
+
+        assert results == [[4.0], [4.0], [5.0]]
+        embed_batch.assert_awaited_once_with(["same", "other"])
+        assert batcher.get_stats()["deduplicated"] == 1
+
+    @pytest.mark.asyncio
+    async def test_flushes_when_batch_is_full(self, embed_batch):
+        """A full batch is sent without waiting for the window."""
+        batcher = EmbeddingMicroBatcher(embed_batch, window_ms=10_000, max_batch_size=2)
+
+        results = await asyncio.wait_for(
+            asyncio.gather(batcher.submit("a"), batcher.submit("bb")), timeout=1
+        )
+
+        assert results == [[1.0], [2.0]]
+
+    @pytest.mark.asyncio
+    async def test_batch_error_reaches_every_waiter(self):
+        """A failed batch call raises in every waiting request."""
+        batcher = EmbeddingMicroBatcher(AsyncMock(side_effect=RuntimeError("rate limited")), window_ms=1)
+
+        results = await asyncio.gather(batcher.submit("a"), batcher.submit("b"), return_exceptions=True)
+
+        assert all(isinstance(result, RuntimeError) for result in results)
+
+    @pytest.mark.asyncio
+    async def test_short_batch_result_fails_every_waiter(self):
+        """A result list that does not match the texts fails the batch instead of hanging waiters."""
+        batcher = EmbeddingMicroBatcher(AsyncMock(return_value=[[1.0]]), window_ms=1)
+
+        results = await asyncio.wait_for(
+            asyncio.gather(batcher.submit("a"), batcher.submit("b"), return_exceptions=True), timeout=1
+        )
+
+        assert all(isinstance(result, ValueError) for result in results)
+
+    @pytest.mark.asyncio
+    async def test_cancelled_batch_cancels_waiters(self):
+        """Waiters do not hang when the batch call itself is cancelled."""
+        started = asyncio.Event()
+
+        async def slow_embed_batch(texts):
+            started.set()
+            await asyncio.sleep(10)
+
+        batcher = EmbeddingMicroBatcher(slow_embed_batch, window_ms=1)
+        waiter = asyncio.ensure_future(batcher.submit("a"))
+        await asyncio.wait_for(started.wait(), timeout=1)
+        for task in list(batcher._inflight):
+            task.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await asyncio.wait_for(waiter, timeout=1)
+
+    @pytest.mark.asyncio
+    async def test_stats(self, embed_batch):
+        """Stats report requests, batches and saved calls."""
+        batcher = EmbeddingMicroBatcher(embed_batch, window_ms=1)
+
+        await asyncio.gather(*(batcher.submit(str(i)) for i in range(4)))
+        await batcher.submit("later")
+
+        stats = batcher.get_stats()
+        assert stats["requests"] == 5
+        assert stats["batches_sent"] == 2
+        assert stats["api_calls_saved"] == 3
+
+
+class TestEmbeddingServiceBatching:
+    """Test suite for EmbeddingService request coalescing."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_generate_embedding_calls_are_batched(self):
+        """Concurrent single-text requests become one embeddings.create call."""
+        service = EmbeddingService()
+        service.cache = None
+        service.batcher = EmbeddingMicroBatcher(service._embed_coalesced_batch, window_ms=5)
+        service.client = MagicMock()
+
+        response = MagicMock()
+        response.data = [MagicMock(embedding=[0.1]), MagicMock(embedding=[0.2])]
+        response.usage.total_tokens = 8
+        service.client.embeddings.create = AsyncMock(return_value=response)
+
+        results = await asyncio.gather(
+            service.generate_embedding("first query"),
+            service.generate_embedding("second query")
+        )
+
+        assert results == [[0.1], [0.2]]
+        service.client.embeddings.create.assert_awaited_once()
+        assert service.client.embeddings.create.await_args.kwargs["input"] == ["first query", "second query"]
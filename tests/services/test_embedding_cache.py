@@ -0,0 +1,164 @@
+"""
+Tests for EmbeddingCache and EmbeddingService cache integration
+
+Test Coverage:
+- Cache key construction (model, dimensions, normalized text hash)
+- LRU eviction and recency updates
+- float32 storage bounded by bytes
+- Redis tier reads/writes and failure handling
+- generate_embedding / generate_batch_embeddings served from cache
+- use_cache=False bypasses the cache (bulk document vectorization)
+"""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from src.services.embedding_cache import EmbeddingCache
+from src.services.embedding_service import EmbeddingService
+
+
+def _embedding_response(embeddings, total_tokens=10):
+    """Build an OpenAI embeddings.create response."""
+    response = MagicMock()
+    response.data = [MagicMock(embedding=embedding) for embedding in embeddings]
+    response.usage.total_tokens = total_tokens
+    return response
+
+
+class TestEmbeddingCache:
+    """Test suite for EmbeddingCache."""
+
+    @pytest.fixture
+    def cache(self):
+        """Create a small in-process cache."""
+        return EmbeddingCache(model="text-embedding-3-large", dimensions=1536, max_entries=2)
+
+    def test_key_includes_model_and_dimensions(self, cache):
+        """Different models or dimensions never share entries."""
+        other_model = EmbeddingCache(model="text-embedding-3-small", dimensions=1536)
+        other_dims = EmbeddingCache(model="text-embedding-3-large", dimensions=256)
+
+        keys = {cache.make_key("hello"), other_model.make_key("hello"), other_dims.make_key("hello")}
+        assert len(keys) == 3
+
+    def test_key_uses_normalized_text(self, cache):
+        """Outer whitespace and Unicode composition do not change the key."""
+        assert cache.make_key("  café ") == cache.make_key("café")
+
+    @pytest.mark.asyncio
+    async def test_hit_and_miss_metrics(self, cache):
+        """Lookups are counted as hits or misses."""
+        await cache.set("a", [0.5, 0.25])
+
+        assert await cache.get("a") == [0.5, 0.25]
+        assert await cache.get("b") is None
+
+        stats = cache.get_stats()
+        assert stats["memory_hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate_percent"] == 50.0
+
+    @pytest.mark.asyncio
+    async def test_lru_eviction_respects_recency(self, cache):
+        """Recently read entries survive eviction."""
+        await cache.set("a", [1.0])
+        await cache.set("b", [2.0])
+        await cache.get("a")  # "b" is now least recently used
+        await cache.set("c", [3.0])
+
+        assert await cache.get_many(["a", "b", "c"]) == [[1.0], None, [3.0]]
+        assert cache.get_stats()["evictions"] == 1
+
+    @pytest.mark.asyncio
+    async def test_vectors_are_float32_and_bounded_by_bytes(self):
+        """Entries cost 4 bytes per dimension and the oldest go once max_bytes is exceeded."""
+        cache = EmbeddingCache(model="m", dimensions=1536, max_bytes=2 * 1536 * 4)
+        for text in ("a", "b", "c"):
+            await cache.set(text, [0.1] * 1536)
+
+        stats = cache.get_stats()
+        assert stats["memory_entries"] == 2
+        assert stats["memory_bytes"] == 2 * 1536 * 4
+        assert stats["evictions"] == 1
+        assert await cache.get("a") is None
+        assert await cache.get("c") == pytest.approx([0.1] * 1536, rel=1e-6)
+
+    @pytest.mark.asyncio
+    async def test_redis_tier_backfills_memory(self):
+        """Redis hits are decoded and promoted into the LRU tier."""
+        cache = EmbeddingCache(model="m", dimensions=2)
+        cache._redis = MagicMock()
+        cache._redis.mget = AsyncMock(return_value=[EmbeddingCache._encode([0.5, 0.25]), None])
+
+        results = await cache.get_many(["shared", "unknown"])
+
+        assert results == [[0.5, 0.25], None]
+        assert cache.get_stats()["redis_hits"] == 1
+        assert await cache.get("shared") == [0.5, 0.25]
+        assert cache.get_stats()["memory_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_redis_failure_degrades_to_memory(self):
+        """Redis errors are counted and never raised to callers."""
+        cache = EmbeddingCache(model="m", dimensions=2)
+        cache._redis = MagicMock()
+        cache._redis.mget = AsyncMock(side_effect=ConnectionError("redis down"))
+
+        assert await cache.get("text") is None
+        assert cache.get_stats()["redis_errors"] == 1
+
+
+class TestEmbeddingServiceCaching:
+    """Test suite for EmbeddingService cache integration."""
+
+    @pytest.fixture
+    def service(self):
+        """Create EmbeddingService with a mocked OpenAI client and memory cache."""
+        service = EmbeddingService()
+        service.cache = EmbeddingCache(model=service.model, dimensions=service.dimensions)
+        service.client = MagicMock()
+        service.client.embeddings.create = AsyncMock()
+        return service
+
+    @pytest.mark.asyncio
+    async def test_generate_embedding_uses_cache(self, service):
+        """Repeated texts are embedded once."""
+        service.client.embeddings.create.return_value = _embedding_response([[0.5, 0.25]])
+
+        first = await service.generate_embedding("linkedin_post compliance rules disclaimer")
+        second = await service.generate_embedding("linkedin_post compliance rules disclaimer")
+
+        assert first == second == [0.5, 0.25]
+        service.client.embeddings.create.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_batch_only_embeds_unique_misses(self, service):
+        """Batch requests send only uncached, deduplicated texts to the API."""
+        await service.cache.set("cached", [9.0])
+        service.client.embeddings.create.return_value = _embedding_response([[1.0], [2.0]])
+
+        results = await service.generate_batch_embeddings(["a", "cached", "b", "a"])
+
+        assert results == [[1.0], [9.0], [2.0], [1.0]]
+        service.client.embeddings.create.assert_awaited_once()
+        assert service.client.embeddings.create.await_args.kwargs["input"] == ["a", "b"]
+
+    @pytest.mark.asyncio
+    async def test_bulk_batches_bypass_the_cache(self, service):
+        """use_cache=False neither reads nor fills the cache."""
+        await service.cache.set("cached", [9.0])
+        service.client.embeddings.create.return_value = _embedding_response([[1.0], [2.0]])
+
+        results = await service.generate_batch_embeddings(["cached", "document"], use_cache=False)
+
+        assert results == [[1.0], [2.0]]
+        assert service.client.embeddings.create.await_args.kwargs["input"] == ["cached", "document"]
+        assert await service.cache.get("document") is None
+
+    @pytest.mark.asyncio
+    async def test_failed_embeddings_are_not_cached(self, service):
+        """API failures are retried on the next call instead of being cached."""
+        service.client.embeddings.create.side_effect = [Exception("rate limited"), _embedding_response([[0.3]])]
+
+        assert await service.generate_embedding("retry me") is None
+        assert await service.generate_embedding("retry me") == [0.3]
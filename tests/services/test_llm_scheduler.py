@@ -0,0 +1,139 @@
+"""
+Tests for LLMScheduler
+
+Test Coverage:
+- Concurrency cap and admission on release
+- Priority classes (interactive before compliance review before background)
+- Round-robin fairness between advisors inside a class
+- Token budget waits and charging actual usage
+- Cancelled waiters and queue/wait metrics
+"""
+
+import asyncio
+
+import pytest
+
+from src.services.llm_scheduler import LLMScheduler, LLMPriority
+
+
+async def _settle():
+    """Let queued tasks run up to their next await."""
+    for _ in range(3):
+        await asyncio.sleep(0)
+
+
+class TestLLMScheduler:
+    """Test suite for LLMScheduler."""
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_capped(self):
+        scheduler = LLMScheduler(max_concurrent=2)
+        in_flight = []
+        peak = []
+
+        async def call():
+            async with scheduler.slot():
+                in_flight.append(1)
+                peak.append(len(in_flight))
+                await asyncio.sleep(0.01)
+                in_flight.pop()
+
+        await asyncio.gather(*(call() for _ in range(6)))
+
+        assert max(peak) == 2
+        stats = scheduler.get_stats()
+        assert stats["in_flight"] == 0
+        assert stats["priorities"]["interactive"]["admitted"] == 6
+        assert stats["priorities"]["interactive"]["queued"] == 4
+
+    @pytest.mark.asyncio
+    async def test_higher_priority_waiters_are_admitted_first(self):
+        scheduler = LLMScheduler(max_concurrent=1)
+        await scheduler.acquire()
+        order = []
+
+        async def call(name, priority):
+            await scheduler.acquire(priority, advisor_id=name)
+            order.append(name)
+            scheduler.release()
+
+        tasks = [
+            asyncio.create_task(call("summary", LLMPriority.BACKGROUND)),
+            asyncio.create_task(call("review", LLMPriority.COMPLIANCE_REVIEW)),
+            asyncio.create_task(call("chat", LLMPriority.INTERACTIVE))
+        ]
+        await _settle()
+        assert scheduler.queue_depth == 3
+
+        scheduler.release()
+        await asyncio.gather(*tasks)
+
+        assert order == ["chat", "review", "summary"]
+
+    @pytest.mark.asyncio
+    async def test_advisors_are_served_round_robin(self):
+        scheduler = LLMScheduler(max_concurrent=1)
+        await scheduler.acquire()
+        order = []
+
+        async def call(advisor_id, n):
+            await scheduler.acquire(LLMPriority.BACKGROUND, advisor_id=advisor_id)
+            order.append(f"{advisor_id}-{n}")
+            scheduler.release()
+
+        # One advisor uploads a burst of documents before another advisor's single upload
+        tasks = [asyncio.create_task(call("advisor_a", n)) for n in range(3)]
+        tasks.append(asyncio.create_task(call("advisor_b", 0)))
+        await _settle()
+        assert scheduler.get_stats()["priorities"]["background"]["waiting_advisors"] == 2
+
+        scheduler.release()
+        await asyncio.gather(*tasks)
+
+        assert order == ["advisor_a-0", "advisor_b-0", "advisor_a-1", "advisor_a-2"]
+
+    @pytest.mark.asyncio
+    async def test_waits_for_token_budget(self):
+        scheduler = LLMScheduler(max_concurrent=4, tokens_per_minute=60000)  # 1000 tokens/second
+        assert await scheduler.acquire(tokens=60000) < 0.01
+        scheduler.release()
+
+        waited = await scheduler.acquire(tokens=100)
+        scheduler.release()
+
+        assert waited >= 0.05
+
+    @pytest.mark.asyncio
+    async def test_charge_spends_budget_beyond_the_estimate(self):
+        scheduler = LLMScheduler(tokens_per_minute=60000)
+        async with scheduler.slot(tokens=1000):
+            pass
+        scheduler.charge(4000)
+        scheduler.charge(-500)  # Over-estimates are not refunded
+
+        assert scheduler.get_stats()["tokens_available"] == pytest.approx(55000, abs=50)
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_leaves_the_queue(self):
+        scheduler = LLMScheduler(max_concurrent=1)
+        await scheduler.acquire()
+
+        waiting = asyncio.create_task(scheduler.acquire(advisor_id="advisor_a"))
+        await _settle()
+        waiting.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+
+        assert scheduler.queue_depth == 0
+        scheduler.release()
+        assert await asyncio.wait_for(scheduler.acquire(), timeout=1) >= 0.0
+        assert scheduler.get_stats()["in_flight"] == 1
+
+    @pytest.mark.asyncio
+    async def test_disabled_scheduler_admits_immediately(self):
+        scheduler = LLMScheduler(max_concurrent=1, enabled=False)
+
+        for _ in range(3):
+            assert await scheduler.acquire() == 0.0
+
+        assert scheduler.get_stats()["in_flight"] == 0
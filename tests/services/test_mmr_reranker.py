@@ -0,0 +1,91 @@
+"""
+Tests for maximal_marginal_relevance
+
+Test Coverage:
+- lambda 1.0 reproduces relevance order
+- Near-duplicates are skipped in favour of diverse candidates
+- Precomputed relevance scores, limits and empty input
+- Rerank cost for 100 candidates
+"""
+
+import time
+
+import numpy as np
+
+from src.services.mmr_reranker import maximal_marginal_relevance
+
+
+def _reference_mmr(query, candidates, limit, lambda_mult):
+    """Straightforward loop implementation to compare against."""
+    unit = candidates / np.linalg.norm(candidates, axis=1)[:, None]
+    relevance = unit @ (query / np.linalg.norm(query))
+    selected = []
+    while len(selected) < min(limit, len(candidates)):
+        best, best_score = None, -np.inf
+        for index in range(len(candidates)):
+            if index in selected:
+                continue
+            redundancy = max((float(unit[index] @ unit[other]) for other in selected), default=0.0)
+            score = lambda_mult * relevance[index] - (1 - lambda_mult) * redundancy
+            if score > best_score:
+                best, best_score = index, score
+        selected.append(best)
+    return selected
+
+
+class TestMaximalMarginalRelevance:
+    """Test suite for MMR selection."""
+
+    def test_lambda_one_is_relevance_order(self):
+        query = [1.0, 0.0, 0.0]
+        candidates = [[0.5, 0.5, 0.0], [1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.9, 0.1, 0.0]]
+
+        assert maximal_marginal_relevance(query, candidates, 3, lambda_mult=1.0) == [1, 3, 0]
+
+    def test_near_duplicates_are_skipped(self):
+        query = [1.0, 0.2, 0.0]
+        candidates = [
+            [1.0, 0.01, 0.0],
+            [1.0, 0.0, 0.0],  # near-duplicate of the top result
+            [0.6, 0.0, 0.8]
+        ]
+
+        assert maximal_marginal_relevance(query, candidates, 2, lambda_mult=0.5) == [0, 2]
+        assert maximal_marginal_relevance(query, candidates, 2, lambda_mult=1.0) == [0, 1]
+
+    def test_matches_reference_implementation(self):
+        rng = np.random.default_rng(3)
+        query = rng.normal(size=64).astype(np.float32)
+        candidates = rng.normal(size=(40, 64)).astype(np.float32)
+
+        for lambda_mult in (0.3, 0.7):
+            assert maximal_marginal_relevance(query, candidates, 8, lambda_mult) == \
+                _reference_mmr(query, candidates, 8, lambda_mult)
+
+    def test_precomputed_relevance_scores_are_used(self):
+        candidates = [[1.0, 0.0], [0.0, 1.0]]
+
+        selected = maximal_marginal_relevance(
+            [1.0, 0.0], candidates, 2, lambda_mult=1.0, relevance_scores=[0.1, 0.9]
+        )
+
+        assert selected == [1, 0]
+
+    def test_limit_and_empty_input(self):
+        assert maximal_marginal_relevance([1.0, 0.0], [[1.0, 0.0]], 5) == [0]
+        assert maximal_marginal_relevance([1.0, 0.0], [], 5) == []
+        assert maximal_marginal_relevance([1.0, 0.0], [[1.0, 0.0]], 0) == []
+
+    def test_rerank_100_candidates_is_fast(self):
+        rng = np.random.default_rng(11)
+        query = rng.normal(size=1536).astype(np.float32)
+        candidates = rng.normal(size=(100, 1536)).astype(np.float32)
+        maximal_marginal_relevance(query, candidates, 10)  # warm up
+
+        started = time.perf_counter()
+        for _ in range(20):
+            maximal_marginal_relevance(query, candidates, 10)
+        per_call = (time.perf_counter() - started) / 20
+
+        # Target is well under 1 ms; the bound leaves room for slow CI machines
+        assert per_call < 0.01
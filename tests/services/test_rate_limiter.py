@@ -0,0 +1,75 @@
+"""
+Tests for RateLimiter
+
+Test Coverage:
+- TokenBucket refill and wait-time calculation
+- RateLimiter passes through within budget
+- RateLimiter waits when the token budget is exhausted
+"""
+
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from src.services.rate_limiter import TokenBucket, RateLimiter
+
+
+class TestTokenBucket:
+    """Test suite for TokenBucket."""
+
+    def test_starts_full(self):
+        """A new bucket allows a full burst."""
+        bucket = TokenBucket(capacity=10, refill_per_second=1)
+        assert bucket.wait_time(10) == 0.0
+
+    def test_wait_time_after_consume(self):
+        """Wait time reflects the deficit at the refill rate."""
+        bucket = TokenBucket(capacity=10, refill_per_second=2)
+        bucket.consume(10)
+        assert bucket.wait_time(4) == pytest.approx(2.0, abs=0.01)
+
+    def test_oversized_request_is_capped_at_capacity(self):
+        """Requests larger than the bucket only wait for a full bucket."""
+        bucket = TokenBucket(capacity=10, refill_per_second=10)
+        bucket.consume(10)
+        assert bucket.wait_time(1000) == pytest.approx(1.0, abs=0.01)
+
+
+class TestRateLimiter:
+    """Test suite for RateLimiter."""
+
+    @pytest.mark.asyncio
+    async def test_acquire_within_budget_does_not_wait(self):
+        """Calls inside both budgets go straight through."""
+        limiter = RateLimiter(requests_per_minute=60, tokens_per_minute=6000)
+
+        with patch("src.services.rate_limiter.asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
+            waited = await limiter.acquire(tokens=1000)
+
+        assert waited == 0.0
+        mock_sleep.assert_not_called()
+        assert limiter.get_stats()["throttled"] == 0
+
+    @pytest.mark.asyncio
+    async def test_acquire_waits_for_token_budget(self):
+        """Exhausting the token budget makes the next call wait for refill."""
+        limiter = RateLimiter(requests_per_minute=1000, tokens_per_minute=600)
+        await limiter.acquire(tokens=600)
+
+        sleeps = []
+
+        async def fake_sleep(seconds):
+            sleeps.append(seconds)
+            limiter.tokens._tokens += seconds * limiter.tokens.refill_per_second
+
+        with patch("src.services.rate_limiter.asyncio.sleep", side_effect=fake_sleep):
+            waited = await limiter.acquire(tokens=100)
+
+        assert sleeps
+        assert waited == pytest.approx(10.0, abs=0.1)
+        assert limiter.get_stats()["throttled"] == 1
+
+    @pytest.mark.asyncio
+    async def test_unlimited_budgets(self):
+        """No configured budgets means no throttling."""
+        limiter = RateLimiter()
+        assert await limiter.acquire(tokens=10 ** 9) == 0.0
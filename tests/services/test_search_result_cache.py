@@ -0,0 +1,183 @@
+"""
+Tests for SearchResultCache
+
+Test Coverage:
+- Keys normalize query text and enum arguments
+- TTL expiry, version invalidation and LRU eviction
+- Empty results are not cached; cached results are copied
+- cached_search decorator (ignored arguments, per-method metrics)
+- Content writes bump the marketing content version
+"""
+
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from src.services.search_result_cache import (
+    SearchResultCache, cached_search, MARKETING_CONTENT, COMPLIANCE_RULES
+)
+from src.services.vector_search_service import VectorSearchService
+from src.models.refactored_database import ContentType
+
+
+RESULTS = [{"id": 1, "title": "Retirement basics"}]
+
+
+class TestSearchResultCache:
+    """Test suite for SearchResultCache."""
+
+    @pytest.fixture
+    def cache(self):
+        return SearchResultCache(ttl_seconds=60, max_entries=2)
+
+    @pytest.mark.asyncio
+    async def test_normalized_query_hits(self, cache):
+        """Case, Unicode form and whitespace differences share one entry."""
+        search = AsyncMock(return_value=RESULTS)
+
+        await cache.get_or_search("m", [MARKETING_CONTENT], {"query_text": "Retirement  Planning ", "limit": 5}, search)
+        results = await cache.get_or_search("m", [MARKETING_CONTENT], {"query_text": "retirement planning", "limit": 5}, search)
+
+        assert results == RESULTS
+        search.assert_awaited_once()
+        assert cache.get_stats()["hit_rate_percent"] == 50.0
+
+    def test_enum_and_string_arguments_share_keys(self, cache):
+        assert cache.make_key("m", {"content_type": ContentType.LINKEDIN_POST}) == \
+            cache.make_key("m", {"content_type": "linkedin_post"})
+
+    @pytest.mark.asyncio
+    async def test_different_parameters_miss(self, cache):
+        search = AsyncMock(return_value=RESULTS)
+
+        await cache.get_or_search("m", [MARKETING_CONTENT], {"query_text": "q", "limit": 5}, search)
+        await cache.get_or_search("m", [MARKETING_CONTENT], {"query_text": "q", "limit": 10}, search)
+
+        assert search.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_version_bump_invalidates_dependents_only(self, cache):
+        marketing = AsyncMock(return_value=RESULTS)
+        rules = AsyncMock(return_value=RESULTS)
+        await cache.get_or_search("marketing", [MARKETING_CONTENT], {"q": "x"}, marketing)
+        await cache.get_or_search("rules", [COMPLIANCE_RULES], {"q": "x"}, rules)
+
+        cache.bump_version(MARKETING_CONTENT)
+        await cache.get_or_search("marketing", [MARKETING_CONTENT], {"q": "x"}, marketing)
+        await cache.get_or_search("rules", [COMPLIANCE_RULES], {"q": "x"}, rules)
+
+        assert marketing.await_count == 2
+        assert rules.await_count == 1
+        assert cache.get_stats()["invalidated"] == 1
+
+    @pytest.mark.asyncio
+    async def test_write_during_search_is_not_served(self, cache):
+        """An entry stored by a search that overlapped a write is already stale."""
+        async def racing_search():
+            cache.bump_version(MARKETING_CONTENT)
+            return RESULTS
+
+        await cache.get_or_search("m", [MARKETING_CONTENT], {"q": "x"}, racing_search)
+        search = AsyncMock(return_value=RESULTS)
+        await cache.get_or_search("m", [MARKETING_CONTENT], {"q": "x"}, search)
+
+        search.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_ttl_expiry(self, cache):
+        search = AsyncMock(return_value=RESULTS)
+        now = [0.0]
+        with patch("src.services.search_result_cache.time.monotonic", side_effect=lambda: now[0]):
+            await cache.get_or_search("m", [MARKETING_CONTENT], {"q": "x"}, search)
+            now[0] = 59.0
+            await cache.get_or_search("m", [MARKETING_CONTENT], {"q": "x"}, search)
+            now[0] = 61.0
+            await cache.get_or_search("m", [MARKETING_CONTENT], {"q": "x"}, search)
+
+        assert search.await_count == 2
+        assert cache.get_stats()["expired"] == 1
+
+    @pytest.mark.asyncio
+    async def test_lru_eviction(self, cache):
+        search = AsyncMock(return_value=RESULTS)
+        for query in ("a", "b", "a", "c"):  # "a" refreshed, so "b" is evicted
+            await cache.get_or_search("m", [MARKETING_CONTENT], {"q": query}, search)
+
+        await cache.get_or_search("m", [MARKETING_CONTENT], {"q": "a"}, search)
+        assert search.await_count == 3
+        await cache.get_or_search("m", [MARKETING_CONTENT], {"q": "b"}, search)
+        assert search.await_count == 4
+        assert cache.get_stats()["evictions"] >= 1
+
+    @pytest.mark.asyncio
+    async def test_empty_results_not_cached(self, cache):
+        search = AsyncMock(return_value=[])
+
+        await cache.get_or_search("m", [MARKETING_CONTENT], {"q": "x"}, search)
+        await cache.get_or_search("m", [MARKETING_CONTENT], {"q": "x"}, search)
+
+        assert search.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_cached_results_are_copies(self, cache):
+        search = AsyncMock(return_value=[{"id": 1}])
+        first = await cache.get_or_search("m", [MARKETING_CONTENT], {"q": "x"}, search)
+        first[0]["rrf_score"] = 1.0
+
+        second = await cache.get_or_search("m", [MARKETING_CONTENT], {"q": "x"}, search)
+
+        assert second == [{"id": 1}]
+
+    @pytest.mark.asyncio
+    async def test_disabled_cache_always_searches(self):
+        cache = SearchResultCache(enabled=False)
+        search = AsyncMock(return_value=RESULTS)
+
+        await cache.get_or_search("m", [MARKETING_CONTENT], {"q": "x"}, search)
+        await cache.get_or_search("m", [MARKETING_CONTENT], {"q": "x"}, search)
+
+        assert search.await_count == 2
+
+
+class _Searcher:
+    def __init__(self):
+        self.calls = 0
+
+    @cached_search(MARKETING_CONTENT)
+    async def search(self, query_text, limit=5, query_embedding=None):
+        self.calls += 1
+        return [{"id": self.calls}]
+
+
+class TestCachedSearchDecorator:
+    """Test suite for the cached_search decorator."""
+
+    @pytest.fixture
+    def cache(self):
+        cache = SearchResultCache()
+        with patch("src.services.search_result_cache.search_result_cache", cache), \
+                patch("src.services.vector_search_service.search_result_cache", cache):
+            yield cache
+
+    @pytest.mark.asyncio
+    async def test_positional_and_keyword_calls_share_entries(self, cache):
+        searcher = _Searcher()
+
+        first = await searcher.search("Retirement", 5)
+        second = await searcher.search(query_text="retirement", query_embedding=[0.1, 0.2])
+
+        assert first == second == [{"id": 1}]
+        assert cache.get_stats()["by_method"]["_Searcher.search"] == {
+            "hits": 1, "misses": 1, "hit_rate_percent": 50.0
+        }
+
+    @pytest.mark.asyncio
+    async def test_content_change_invalidates_vector_search_results(self, cache):
+        service = VectorSearchService()
+        service.invalidate_readiness = lambda: None
+        searcher = _Searcher()
+
+        await searcher.search("retirement")
+        service.notify_content_changed([1])
+        await searcher.search("retirement")
+
+        assert searcher.calls == 2
@@ -0,0 +1,108 @@
+"""
+Tests for TokenizerService
+
+Test Coverage:
+- Encodings load once and failures fall back to the character approximation
+- Token-count LRU (hits, recency, bounded size)
+- count_many batch encodes only cache misses
+- truncate with and without an encoding
+"""
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+from src.services.tokenizer_service import TokenizerService
+
+
+def _fake_encoding():
+    """Encoding that yields one token per whitespace-separated word."""
+    encoding = MagicMock()
+    encoding.encode_ordinary.side_effect = lambda text: list(range(len(text.split())))
+    encoding.encode_ordinary_batch.side_effect = lambda texts, num_threads=1: [
+        list(range(len(text.split()))) for text in texts
+    ]
+    encoding.decode.side_effect = lambda tokens: " ".join(["word"] * len(tokens))
+    return encoding
+
+
+class TestTokenizerService:
+    """Test suite for TokenizerService."""
+
+    @pytest.fixture
+    def encoding(self):
+        return _fake_encoding()
+
+    @pytest.fixture
+    def service(self, encoding):
+        """Service with a fake encoding already loaded."""
+        service = TokenizerService(cache_max_entries=2)
+        service._encodings[service.encoding_name] = encoding
+        return service
+
+    def test_encoding_loaded_once(self):
+        """Concurrent callers share a single loaded encoding."""
+        service = TokenizerService()
+        with patch("src.services.tokenizer_service.tiktoken.get_encoding", return_value=_fake_encoding()) as mock_get:
+            first = service.get_encoding()
+            second = service.get_encoding()
+
+        assert first is second
+        mock_get.assert_called_once_with("cl100k_base")
+
+    def test_load_failure_falls_back_without_retrying(self):
+        """A failed load is remembered and counting uses the 4-characters approximation."""
+        service = TokenizerService()
+        with patch("src.services.tokenizer_service.tiktoken.get_encoding", side_effect=Exception("offline")) as mock_get:
+            assert service.count_tokens("twelve chars") == 3
+            assert service.count_tokens("another text") == 3
+
+        mock_get.assert_called_once()
+        assert service.get_stats()["encodings_failed"] == ["cl100k_base"]
+
+    def test_count_tokens_cached(self, service, encoding):
+        """Repeated text is served from the cache."""
+        assert service.count_tokens("one two three") == 3
+        assert service.count_tokens("one two three") == 3
+
+        assert encoding.encode_ordinary.call_count == 1
+        assert service.get_stats()["cache_hits"] == 1
+
+    def test_cache_is_lru_bounded(self, service, encoding):
+        """Least recently used entries are evicted first."""
+        service.count_tokens("a")
+        service.count_tokens("b")
+        service.count_tokens("a")  # refresh a
+        service.count_tokens("c")  # evicts b
+
+        encoding.encode_ordinary.reset_mock()
+        service.count_tokens("a")
+        assert encoding.encode_ordinary.call_count == 0
+        service.count_tokens("b")
+        assert encoding.encode_ordinary.call_count == 1
+        assert service.get_stats()["cache_size"] == 2
+
+    def test_count_many_batches_misses(self, service, encoding):
+        """Only uncached, unique texts go to the batch encoder."""
+        service.count_tokens("cached text")
+
+        counts = service.count_many(["cached text", "new one here", "", "new one here"])
+
+        assert counts == [2, 3, 0, 3]
+        encoding.encode_ordinary_batch.assert_called_once_with(["new one here"], num_threads=service.batch_threads)
+
+    def test_truncate(self, service):
+        """Text over the limit is cut to max_tokens tokens."""
+        assert service.truncate("one two", 5) == "one two"
+        assert service.truncate("one two three four", 2) == "word word"
+
+    def test_truncate_without_encoding(self):
+        """Without an encoding, truncation falls back to 4 characters per token."""
+        service = TokenizerService()
+        service._failed_encodings.add(service.encoding_name)
+        assert service.truncate("x" * 100, 10) == "x" * 40
+
+    def test_relative_cache_dir_resolves_to_project_root(self):
+        """Vendored encoding directory is resolved relative to the project root."""
+        service = TokenizerService(cache_dir="data/tiktoken")
+        assert service.cache_dir.endswith("data/tiktoken")
+        assert service.cache_dir.startswith("/")
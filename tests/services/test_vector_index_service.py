@@ -0,0 +1,178 @@
+"""
+Tests for VectorIndexService
+
+Test Coverage:
+- CREATE INDEX statement construction for HNSW and IVFFlat
+- Target and method validation
+- Approved-rows partial indexes per content type
+- Invalid indexes left by failed concurrent builds are dropped and rebuilt
+- Per-query ef_search / probes settings
+"""
+
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from src.services.vector_index_service import VectorIndexService
+from src.models.refactored_database import ContentType
+
+
+class TestVectorIndexService:
+    """Test suite for VectorIndexService."""
+
+    @pytest.fixture
+    def service(self):
+        """Create VectorIndexService with explicit build defaults."""
+        service = VectorIndexService()
+        service.default_method = "hnsw"
+        service.hnsw_m = 16
+        service.hnsw_ef_construction = 64
+        service.ivfflat_lists = 100
+        service._find_invalid_indexes = AsyncMock(return_value=[])
+        return service
+
+    def test_build_hnsw_index_sql(self, service):
+        """HNSW index uses cosine ops and configured build parameters."""
+        sql = service.build_create_index_sql("marketing_content", m=24, ef_construction=128)
+
+        assert sql == (
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_marketing_content_embedding_hnsw_cosine "
+            "ON marketing_content USING hnsw (embedding vector_cosine_ops) "
+            "WITH (m = 24, ef_construction = 128)"
+        )
+
+    def test_build_ivfflat_index_sql_defaults(self, service):
+        """IVFFlat index falls back to the configured number of lists."""
+        sql = service.build_create_index_sql("compliance_rules", method="ivfflat", concurrently=False)
+
+        assert sql == (
+            "CREATE INDEX IF NOT EXISTS ix_compliance_rules_embedding_ivfflat_cosine "
+            "ON compliance_rules USING ivfflat (embedding vector_cosine_ops) "
+            "WITH (lists = 100)"
+        )
+
+    def test_unknown_target_rejected(self, service):
+        """Only known embedding columns can be indexed."""
+        with pytest.raises(ValueError, match="Unknown vector index target"):
+            service.build_create_index_sql("users")
+
+    def test_unknown_method_rejected(self, service):
+        """Only HNSW and IVFFlat are supported."""
+        with pytest.raises(ValueError, match="Unknown vector index method"):
+            service.build_create_index_sql("marketing_content", method="btree")
+
+    def test_build_partial_index_sql(self, service):
+        """Partial indexes cover approved rows, optionally of one content type."""
+        sql = service.build_create_partial_index_sql(ContentType.LINKEDIN_POST)
+
+        assert sql == (
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_marketing_content_embedding_hnsw_approved_linkedin_post "
+            "ON marketing_content USING hnsw (embedding vector_cosine_ops) "
+            "WITH (m = 16, ef_construction = 64) "
+            "WHERE approval_status = 'APPROVED' AND content_type = 'LINKEDIN_POST'"
+        )
+        assert service.build_create_partial_index_sql(method="ivfflat").endswith(
+            "WITH (lists = 100) WHERE approval_status = 'APPROVED'"
+        )
+
+    @pytest.mark.asyncio
+    async def test_create_partial_indexes(self, service):
+        """One approved index for all content types plus one per content type."""
+        with patch.object(service, "_execute_autocommit", AsyncMock()) as mock_execute:
+            result = await service.create_partial_indexes(
+                content_types=[ContentType.NEWSLETTER, ContentType.X_POST]
+            )
+
+        assert result["status"] == "success"
+        assert result["index_names"] == [
+            "ix_marketing_content_embedding_hnsw_approved",
+            "ix_marketing_content_embedding_hnsw_approved_newsletter",
+            "ix_marketing_content_embedding_hnsw_approved_x_post",
+        ]
+        assert len(mock_execute.await_args[0][0]) == 3
+
+    @pytest.mark.asyncio
+    async def test_create_index_rebuilds_invalid_index(self, service):
+        """An invalid index is dropped before CREATE INDEX IF NOT EXISTS runs."""
+        index_name = "ix_marketing_content_embedding_hnsw_cosine"
+        service._find_invalid_indexes.return_value = [index_name]
+        with patch.object(service, "_execute_autocommit", AsyncMock()) as mock_execute:
+            result = await service.create_index("marketing_content")
+
+        service._find_invalid_indexes.assert_awaited_once_with([index_name])
+        statements = mock_execute.await_args[0][0]
+        assert statements[0] == f"DROP INDEX CONCURRENTLY IF EXISTS {index_name}"
+        assert statements[1].startswith(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {index_name}")
+        assert result["rebuilt_invalid"] == [index_name]
+
+    @pytest.mark.asyncio
+    async def test_create_index_leaves_valid_index_alone(self, service):
+        """A valid or missing index only gets the idempotent CREATE statement."""
+        with patch.object(service, "_execute_autocommit", AsyncMock()) as mock_execute:
+            result = await service.create_index("marketing_content", concurrently=False)
+
+        assert len(mock_execute.await_args[0][0]) == 1
+        assert result["rebuilt_invalid"] == []
+
+    @pytest.mark.asyncio
+    async def test_create_partial_indexes_rebuilds_invalid_ones(self, service):
+        """Only the invalid partial indexes are dropped."""
+        service._find_invalid_indexes.return_value = ["ix_marketing_content_embedding_hnsw_approved_newsletter"]
+        with patch.object(service, "_execute_autocommit", AsyncMock()) as mock_execute:
+            await service.create_partial_indexes(content_types=[ContentType.NEWSLETTER])
+
+        statements = mock_execute.await_args[0][0]
+        assert statements[0] == "DROP INDEX CONCURRENTLY IF EXISTS ix_marketing_content_embedding_hnsw_approved_newsletter"
+        assert len(statements) == 3
+
+    @pytest.mark.asyncio
+    async def test_rebuild_without_parameters_reindexes(self, service):
+        """Rebuild without new parameters reindexes in place."""
+        with patch.object(service, "_execute_autocommit", AsyncMock()) as mock_execute:
+            result = await service.rebuild_index("marketing_content")
+
+        assert result["status"] == "success"
+        mock_execute.assert_awaited_once_with(
+            ["REINDEX INDEX CONCURRENTLY ix_marketing_content_embedding_hnsw_cosine"]
+        )
+
+    @pytest.mark.asyncio
+    async def test_rebuild_with_parameters_recreates(self, service):
+        """Rebuild with new build parameters drops and recreates the index."""
+        with patch.object(service, "_execute_autocommit", AsyncMock()) as mock_execute:
+            await service.rebuild_index("marketing_content", m=32)
+
+        statements = mock_execute.await_args[0][0]
+        assert statements[0].startswith("DROP INDEX CONCURRENTLY IF EXISTS")
+        assert "m = 32" in statements[1]
+
+    @pytest.mark.asyncio
+    async def test_create_index_error_is_reported(self, service):
+        """Database errors are returned as error results."""
+        with patch.object(service, "_execute_autocommit", AsyncMock(side_effect=Exception("access method \"hnsw\" does not exist"))):
+            result = await service.create_index("marketing_content")
+
+        assert result["status"] == "error"
+        assert "hnsw" in result["error"]
+
+    @pytest.mark.asyncio
+    async def test_apply_search_settings(self, service):
+        """ef_search and probes are set transaction-locally via set_config."""
+        db = AsyncMock()
+
+        await service.apply_search_settings(db, ef_search=100, probes=8)
+
+        calls = db.execute.await_args_list
+        assert len(calls) == 2
+        assert "hnsw.ef_search" in str(calls[0][0][0])
+        assert calls[0][0][1] == {"value": "100"}
+        assert "ivfflat.probes" in str(calls[1][0][0])
+        assert calls[1][0][1] == {"value": "8"}
+
+    @pytest.mark.asyncio
+    async def test_apply_search_settings_noop_by_default(self, service):
+        """No extra round trips when no per-query settings are configured."""
+        db = AsyncMock()
+
+        await service.apply_search_settings(db)
+
+        db.execute.assert_not_called()
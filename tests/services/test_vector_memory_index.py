@@ -0,0 +1,137 @@
+"""
+Tests for InMemoryVectorIndex
+
+Test Coverage:
+- Exact top-k ordering matches brute-force cosine similarity
+- Similarity threshold filtering
+- upsert (insert, replace, capacity growth) and remove
+- Unnormalized storage and int8 quantization
+- Metadata filters
+"""
+
+import numpy as np
+import pytest
+
+from src.services.vector_memory_index import InMemoryVectorIndex
+
+
+DIMENSIONS = 32
+
+
+def _corpus(count, seed=7):
+    rng = np.random.default_rng(seed)
+    return rng.normal(size=(count, DIMENSIONS)).astype(np.float32)
+
+
+def _brute_force(vectors, query, limit):
+    scores = (vectors @ query) / (np.linalg.norm(vectors, axis=1) * np.linalg.norm(query))
+    order = np.argsort(-scores)[:limit]
+    return [int(i) for i in order], scores
+
+
+def _build(vectors, **kwargs):
+    index = InMemoryVectorIndex(dimensions=DIMENSIONS, **kwargs)
+    index.replace_all(
+        ids=list(range(len(vectors))),
+        embeddings=vectors,
+        metadata=[{"id": i} for i in range(len(vectors))]
+    )
+    return index
+
+
+class TestInMemoryVectorIndex:
+    """Test suite for InMemoryVectorIndex."""
+
+    @pytest.mark.parametrize("normalize", [True, False])
+    def test_top_k_matches_brute_force(self, normalize):
+        """Results are the exact cosine top-k, most similar first."""
+        vectors = _corpus(200)
+        query = _corpus(1, seed=11)[0]
+        index = _build(vectors, normalize=normalize)
+
+        results = index.search(query, limit=10, similarity_threshold=-1.0)
+        expected_ids, scores = _brute_force(vectors, query, 10)
+
+        assert [metadata["id"] for metadata, _ in results] == expected_ids
+        for metadata, score in results:
+            assert score == pytest.approx(float(scores[metadata["id"]]), abs=1e-5)
+
+    def test_threshold_filters_results(self):
+        """Only scores above the threshold are returned."""
+        vectors = np.eye(DIMENSIONS, dtype=np.float32)[:3]
+        index = _build(vectors)
+
+        results = index.search(vectors[0], limit=3, similarity_threshold=0.5)
+
+        assert [(metadata["id"], round(score, 5)) for metadata, score in results] == [(0, 1.0)]
+
+    def test_upsert_grows_and_replaces(self):
+        """New ids extend the matrix past its capacity; known ids are overwritten."""
+        vectors = np.eye(DIMENSIONS, dtype=np.float32)
+        index = InMemoryVectorIndex(dimensions=DIMENSIONS, initial_capacity=2)
+        for i in range(5):
+            index.upsert(100 + i, vectors[i], {"id": 100 + i})
+
+        index.upsert(100, vectors[9], {"id": 100, "title": "updated"})
+
+        assert len(index) == 5
+        assert index.get_stats()["capacity"] == 8
+        metadata, score = index.search(vectors[9], limit=1)[0]
+        assert metadata == {"id": 100, "title": "updated"}
+        assert score == pytest.approx(1.0)
+
+    def test_remove_moves_last_row(self):
+        """Removing a row keeps the remaining ids searchable."""
+        vectors = np.eye(DIMENSIONS, dtype=np.float32)[:4]
+        index = _build(vectors)
+
+        assert index.remove(1) is True
+        assert index.remove(1) is False
+
+        assert len(index) == 3
+        assert 1 not in index
+        assert index.search(vectors[3], limit=1)[0][0]["id"] == 3
+        assert index.search(vectors[1], limit=3, similarity_threshold=0.5) == []
+
+    def test_quantized_scores_are_close(self):
+        """int8 rows approximate float scores and use a quarter of the memory."""
+        vectors = _corpus(100)
+        query = _corpus(1, seed=3)[0]
+        exact = _build(vectors)
+        quantized = _build(vectors, quantize=True)
+
+        exact_results = exact.search(query, limit=5, similarity_threshold=-1.0)
+        quantized_results = quantized.search(query, limit=5, similarity_threshold=-1.0)
+
+        assert quantized.get_stats()["matrix_bytes"] * 4 == exact.get_stats()["matrix_bytes"]
+        assert exact_results[0][0]["id"] == quantized_results[0][0]["id"]
+        for (_, exact_score), (_, quantized_score) in zip(exact_results, quantized_results):
+            assert quantized_score == pytest.approx(exact_score, abs=0.02)
+
+    def test_empty_index(self):
+        """Searching an empty index returns nothing."""
+        index = InMemoryVectorIndex(dimensions=DIMENSIONS)
+        index.replace_all([], [], [])
+
+        assert index.loaded is True
+        assert index.search(np.ones(DIMENSIONS), limit=5) == []
+
+    def test_metadata_filters_restrict_candidates(self):
+        """Only rows matching every filter are ranked; masks follow writes."""
+        vectors = _corpus(20)
+        index = InMemoryVectorIndex(dimensions=DIMENSIONS)
+        index.replace_all(
+            ids=list(range(20)),
+            embeddings=vectors,
+            metadata=[{"id": i, "content_type": "NEWSLETTER" if i % 2 else "LINKEDIN_POST"} for i in range(20)]
+        )
+
+        results = index.search(vectors[3], limit=5, similarity_threshold=-1.0, filters={"content_type": "NEWSLETTER"})
+        assert results[0][0]["id"] == 3
+        assert all(metadata["id"] % 2 for metadata, _ in results)
+
+        index.upsert(3, vectors[3], {"id": 3, "content_type": "LINKEDIN_POST"})
+        results = index.search(vectors[3], limit=5, similarity_threshold=-1.0, filters={"content_type": "NEWSLETTER"})
+        assert 3 not in [metadata["id"] for metadata, _ in results]
+
+        assert index.search(vectors[0], limit=5, filters={"content_type": "X_POST"}) == []
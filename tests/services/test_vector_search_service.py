@@ -0,0 +1,774 @@
+"""
+Tests for VectorSearchService
+
+Test Coverage:
+- search_compliance_rules query construction (bound pgvector parameters)
+- search_marketing_content top_k and threshold search modes
+- per-query ANN settings (ef_search)
+- precomputed (batched) query embeddings
+- cached readiness/stats snapshot (VectorSearchStatsCache)
+- in-process memory index routing, loading and incremental refresh
+- memory index auto-load back-off after skipped or failed loads
+- compliance rules served from the in-memory registry
+- full-text search clauses and reciprocal rank fusion hybrid search
+- maximal marginal relevance rerank (pgvector and memory index paths)
+- content/audience type filters matching the approved partial ANN indexes
+"""
+
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects.postgresql import asyncpg
+
+from src.services.vector_search_service import (
+    VectorSearchService, VectorSearchStatsCache, marketing_full_text_clauses
+)
+from src.services.vector_memory_index import InMemoryVectorIndex
+from src.models.refactored_database import ApprovalStatus, SourceType, ContentType, AudienceType
+
+
+QUERY_EMBEDDING = [0.125] * 1536
+
+
+def _mock_session_factory(rows=None):
+    """Build an AsyncSessionLocal replacement that records executed statements."""
+    session = AsyncMock()
+    result = MagicMock()
+    result.all.return_value = rows or []
+    session.execute.return_value = result
+
+    factory = MagicMock()
+    factory.return_value.__aenter__.return_value = session
+    factory.return_value.__aexit__.return_value = False
+    return factory, session
+
+
+def _marketing_row(row_id, similarity, approval_status=ApprovalStatus.APPROVED):
+    """Build a marketing content search row."""
+    return MagicMock(
+        id=row_id,
+        title=f"Example {row_id}",
+        content_text="Planning for retirement is crucial...",
+        content_type=ContentType.LINKEDIN_POST,
+        audience_type=AudienceType.GENERAL_EDUCATION,
+        tags="retirement",
+        usage_count=0,
+        compliance_score=1.0,
+        source_type=SourceType.FIDUCIA_CREATED,
+        approval_status=approval_status,
+        similarity_score=similarity
+    )
+
+
+def _compile(statement) -> str:
+    """Compile a statement for PostgreSQL without inlining bound values."""
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+class TestVectorSearchService:
+    """Test suite for VectorSearchService."""
+
+    @pytest.fixture
+    def service(self):
+        """Create VectorSearchService instance for testing (pgvector paths)."""
+        service = VectorSearchService()
+        service.rules_registry_enabled = False
+        return service
+
+    @pytest.fixture
+    def mock_embedding_service(self):
+        """Patch the shared embedding service with a fixed query embedding."""
+        with patch("src.services.vector_search_service.embedding_service") as mock_service:
+            mock_service.generate_embedding = AsyncMock(return_value=QUERY_EMBEDDING)
+            yield mock_service
+
+    @pytest.mark.asyncio
+    async def test_search_compliance_rules_binds_query_vector(self, service, mock_embedding_service):
+        """Query vector is sent as a bound parameter instead of SQL literal text."""
+        factory, session = _mock_session_factory()
+
+        with patch("src.services.vector_search_service.AsyncSessionLocal", factory):
+            await service.search_compliance_rules("performance claims", similarity_threshold=0.2)
+
+        statement = session.execute.call_args[0][0]
+        sql = _compile(statement)
+
+        assert "0.125" not in sql
+        assert "compliance_rules.embedding <=> %(embedding_1)s" in sql
+        assert sql.count("%(embedding_1)s") == 3  # One bind shared by score, filter and order
+
+    @pytest.mark.asyncio
+    async def test_search_compliance_rules_statement_text_is_stable(self, service, mock_embedding_service):
+        """Different query vectors produce identical statement text (prepared statement reuse)."""
+        factory, session = _mock_session_factory()
+
+        with patch("src.services.vector_search_service.AsyncSessionLocal", factory):
+            await service.search_compliance_rules("first query", content_type="linkedin_post")
+            mock_embedding_service.generate_embedding.return_value = [0.5] * 1536
+            await service.search_compliance_rules("second query", content_type="linkedin_post")
+
+        first_sql, second_sql = (_compile(call[0][0]) for call in session.execute.call_args_list)
+        assert first_sql == second_sql
+
+    @pytest.mark.asyncio
+    async def test_search_compliance_rules_maps_rows(self, service, mock_embedding_service):
+        """Rows are converted to result dictionaries with similarity scores."""
+        row = MagicMock(
+            id=7,
+            regulation_name="FINRA 2210",
+            rule_section="(d)(1)",
+            requirement_text="Communications must be fair and balanced.",
+            required_disclaimers=None,
+            prohibition_type="performance_claims",
+            applies_to_content_types=None,
+            applicability_scope="all_advisors",
+            similarity_score=0.82
+        )
+        factory, _ = _mock_session_factory(rows=[row])
+
+        with patch("src.services.vector_search_service.AsyncSessionLocal", factory):
+            results = await service.search_compliance_rules("fair and balanced")
+
+        assert len(results) == 1
+        assert results[0]["id"] == 7
+        assert results[0]["similarity_score"] == pytest.approx(0.82)
+        assert results[0]["search_method"] == "vector"
+
+    @pytest.mark.asyncio
+    async def test_search_compliance_rules_no_embedding(self, service, mock_embedding_service):
+        """Missing query embedding short-circuits without touching the database."""
+        mock_embedding_service.generate_embedding.return_value = None
+        factory, session = _mock_session_factory()
+
+        with patch("src.services.vector_search_service.AsyncSessionLocal", factory):
+            results = await service.search_compliance_rules("anything")
+
+        assert results == []
+        session.execute.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_search_marketing_content_top_k_is_index_friendly(self, service, mock_embedding_service):
+        """Top-k mode orders by raw distance with a LIMIT and no threshold predicate."""
+        factory, session = _mock_session_factory()
+
+        with patch("src.services.vector_search_service.AsyncSessionLocal", factory):
+            await service.search_marketing_content("roth conversions", similarity_threshold=0.3, limit=4)
+
+        statement = session.execute.call_args[0][0]
+        sql = _compile(statement)
+        order_by = sql.split("ORDER BY")[1]
+
+        assert "marketing_content.embedding <=> %(embedding_1)s" in order_by
+        assert "DESC" not in order_by
+        assert "LIMIT" in order_by
+        assert "marketing_content.approval_status = " in sql
+        assert statement._limit == 4
+
+    @pytest.mark.asyncio
+    async def test_search_marketing_content_top_k_applies_threshold_in_python(self, service, mock_embedding_service):
+        """Rows at or below the threshold are dropped after the nearest-first fetch."""
+        rows = [_marketing_row(1, 0.9), _marketing_row(2, 0.45), _marketing_row(3, 0.2)]
+        factory, _ = _mock_session_factory(rows=rows)
+
+        with patch("src.services.vector_search_service.AsyncSessionLocal", factory):
+            results = await service.search_marketing_content("retirement", similarity_threshold=0.4, limit=3)
+
+        assert [r["id"] for r in results] == [1, 2]
+
+    @pytest.mark.asyncio
+    async def test_search_marketing_content_overfetch_post_filters_approval(self, service, mock_embedding_service):
+        """Over-fetch drops the approval predicate, fetches k*N and filters in Python."""
+        rows = [
+            _marketing_row(1, 0.9, ApprovalStatus.PENDING),
+            _marketing_row(2, 0.8),
+            _marketing_row(3, 0.7, ApprovalStatus.REJECTED),
+            _marketing_row(4, 0.6),
+            _marketing_row(5, 0.5),
+        ]
+        factory, session = _mock_session_factory(rows=rows)
+
+        with patch("src.services.vector_search_service.AsyncSessionLocal", factory):
+            results = await service.search_marketing_content(
+                "retirement", similarity_threshold=0.1, limit=2, overfetch_factor=4
+            )
+
+        statement = session.execute.call_args[0][0]
+        assert "marketing_content.approval_status = " not in _compile(statement)
+        assert statement._limit == 8
+        assert [r["id"] for r in results] == [2, 4]
+
+    @pytest.mark.asyncio
+    async def test_search_marketing_content_threshold_mode(self, service, mock_embedding_service):
+        """Threshold mode keeps the similarity predicate in the WHERE clause."""
+        factory, session = _mock_session_factory(rows=[_marketing_row(1, 0.9)])
+
+        with patch("src.services.vector_search_service.AsyncSessionLocal", factory):
+            results = await service.search_marketing_content(
+                "retirement", limit=3, search_mode=VectorSearchService.SEARCH_MODE_THRESHOLD
+            )
+
+        sql = _compile(session.execute.call_args[0][0])
+        where_clause = sql.split("WHERE")[1].split("ORDER BY")[0]
+        assert "<=>" in where_clause
+        assert len(results) == 1
+        assert results[0]["similarity_score"] == pytest.approx(0.9)
+
+    @pytest.mark.asyncio
+    async def test_search_marketing_content_applies_ef_search(self, service, mock_embedding_service):
+        """A per-query ef_search is set on the session before the vector query."""
+        factory, session = _mock_session_factory()
+
+        with patch("src.services.vector_search_service.AsyncSessionLocal", factory):
+            await service.search_marketing_content("retirement", ef_search=80)
+
+        first_statement, second_statement = (call[0][0] for call in session.execute.call_args_list)
+        assert "hnsw.ef_search" in str(first_statement)
+        assert "<=>" in _compile(second_statement)
+
+    @pytest.mark.asyncio
+    async def test_precomputed_query_embedding_skips_embedding_call(self, service, mock_embedding_service):
+        """A batched query embedding from the caller is used as-is."""
+        factory, session = _mock_session_factory()
+
+        with patch("src.services.vector_search_service.AsyncSessionLocal", factory):
+            await service.search_marketing_content("retirement", query_embedding=[0.5] * 1536)
+            await service.search_compliance_rules("fair and balanced", query_embedding=[0.5] * 1536)
+
+        mock_embedding_service.generate_embedding.assert_not_called()
+        assert session.execute.call_count == 2
+
+
+def _stats(with_embeddings):
+    """Stats snapshot as produced by _load_vector_search_stats."""
+    return {
+        "marketing_content": {"total": 10, "with_embeddings": with_embeddings, "embedding_percentage": 0},
+        "compliance_rules": {"total": 0, "with_embeddings": 0, "embedding_percentage": 0},
+        "vector_search_ready": with_embeddings > 0
+    }
+
+
+class TestVectorSearchReadinessCache:
+    """Test suite for the cached readiness/stats snapshot."""
+
+    @pytest.fixture
+    def stats_cache(self):
+        """Fresh shared cache for each test."""
+        cache = VectorSearchStatsCache(refresh_interval=60)
+        with patch("src.services.vector_search_service.vector_search_stats_cache", cache):
+            yield cache
+
+    @pytest.fixture
+    def service(self, stats_cache):
+        service = VectorSearchService()
+        service._load_vector_search_stats = AsyncMock(return_value=_stats(5))
+        return service
+
+    @pytest.mark.asyncio
+    async def test_readiness_served_from_snapshot(self, service):
+        """Repeated readiness checks count rows once."""
+        first = await service.check_readiness()
+        second = await service.check_readiness()
+        await service.get_vector_search_stats()
+
+        assert first == second == {
+            "ready": True,
+            "reason": "vector_search_operational",
+            "marketing_content_count": 5
+        }
+        service._load_vector_search_stats.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_snapshot_shared_across_instances(self, service):
+        """Warren's own VectorSearchService instances read the same snapshot."""
+        await service.check_readiness()
+
+        other = VectorSearchService()
+        other._load_vector_search_stats = AsyncMock(return_value=_stats(0))
+        result = await other.check_readiness()
+
+        assert result["ready"] is True
+        other._load_vector_search_stats.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_invalidate_forces_recount(self, service):
+        """Embedding writes invalidate the snapshot immediately."""
+        service._load_vector_search_stats.side_effect = [_stats(0), _stats(3)]
+
+        assert (await service.check_readiness())["ready"] is False
+        service.invalidate_readiness()
+        assert (await service.check_readiness())["ready"] is True
+
+    @pytest.mark.asyncio
+    async def test_stale_snapshot_refreshes_in_background(self, service, stats_cache):
+        """An old snapshot is returned immediately while a refresh runs."""
+        service._load_vector_search_stats.side_effect = [_stats(1), _stats(2)]
+        await service.check_readiness()
+        stats_cache._fetched_at -= 120
+
+        stale = await service.check_readiness()
+        await asyncio.sleep(0)
+        await stats_cache._refresh_task
+        fresh = await service.check_readiness()
+
+        assert stale["marketing_content_count"] == 1
+        assert fresh["marketing_content_count"] == 2
+
+    @pytest.mark.asyncio
+    async def test_errors_are_not_cached(self, service):
+        """A failed count reports not-ready and is retried on the next call."""
+        service._load_vector_search_stats.side_effect = [Exception("db down"), _stats(4)]
+
+        failed = await service.check_readiness()
+        recovered = await service.check_readiness()
+
+        assert failed == {"ready": False, "reason": "database_error: db down"}
+        assert recovered["ready"] is True
+
+
+def _embedded_row(row_id, embedding):
+    """Marketing content row as selected for the memory index."""
+    row = _marketing_row(row_id, similarity=None)
+    row.embedding = embedding
+    return row
+
+
+class TestVectorSearchMemoryIndex:
+    """Test suite for the in-process marketing content index."""
+
+    @pytest.fixture
+    def memory_index(self):
+        index = InMemoryVectorIndex(dimensions=4)
+        with patch("src.services.vector_search_service.marketing_memory_index", index), \
+             patch.object(VectorSearchService, "_memory_index_retry_at", 0.0):
+            yield index
+
+    @pytest.fixture
+    def service(self, memory_index):
+        service = VectorSearchService()
+        service.memory_index_enabled = True
+        return service
+
+    @pytest.mark.asyncio
+    async def test_load_and_search_without_database(self, service, memory_index):
+        """A loaded index answers searches without touching pgvector."""
+        factory, session = _mock_session_factory([
+            _embedded_row(1, [1.0, 0.0, 0.0, 0.0]),
+            _embedded_row(2, [0.0, 1.0, 0.0, 0.0])
+        ])
+        session.execute.return_value.scalar.return_value = 2
+        with patch("src.services.vector_search_service.AsyncSessionLocal", factory):
+            loaded = await service.load_memory_index()
+
+        assert loaded["status"] == "success"
+        assert loaded["items"] == 2
+
+        with patch("src.services.vector_search_service.AsyncSessionLocal") as db_factory:
+            results = await service.search_marketing_content(
+                "ignored", limit=5, similarity_threshold=0.5, query_embedding=[0.9, 0.1, 0.0, 0.0]
+            )
+
+        db_factory.assert_not_called()
+        assert [result["id"] for result in results] == [1]
+        assert results[0]["search_method"] == "vector"
+        assert results[0]["similarity_score"] > 0.9
+
+    @pytest.mark.asyncio
+    async def test_large_corpus_stays_on_pgvector(self, service, memory_index):
+        """Corpora above the item limit are not loaded."""
+        service.memory_index_max_items = 1
+        factory, session = _mock_session_factory()
+        session.execute.return_value.scalar.return_value = 5
+        with patch("src.services.vector_search_service.AsyncSessionLocal", factory):
+            result = await service.load_memory_index()
+
+        assert result["status"] == "skipped"
+        assert memory_index.loaded is False
+        assert session.execute.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_cold_index_falls_back_and_schedules_load(self, service, memory_index):
+        """Searches on a cold index use pgvector while a load starts in the background."""
+        service.load_memory_index = AsyncMock(return_value={"status": "success"})
+        factory, session = _mock_session_factory([_marketing_row(1, 0.9)])
+        with patch("src.services.vector_search_service.AsyncSessionLocal", factory):
+            results = await service.search_marketing_content(
+                "retirement", query_embedding=QUERY_EMBEDDING
+            )
+        await VectorSearchService._memory_index_load_task
+
+        assert [result["id"] for result in results] == [1]
+        session.execute.assert_awaited()
+        service.load_memory_index.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_refresh_upserts_and_removes(self, service, memory_index):
+        """Changed rows are re-read; rows no longer approved/embedded are dropped."""
+        memory_index.replace_all(
+            ids=[1, 2],
+            embeddings=[[1.0, 0.0, 0.0, 0.0], [0.0, 1.0, 0.0, 0.0]],
+            metadata=[{"id": 1}, {"id": 2}]
+        )
+        factory, _ = _mock_session_factory([_embedded_row(3, [0.0, 0.0, 1.0, 0.0])])
+        with patch("src.services.vector_search_service.AsyncSessionLocal", factory):
+            result = await service.refresh_memory_index([2, 3])
+
+        assert result == {"status": "success", "updated": 1, "removed": 1}
+        assert 1 in memory_index and 3 in memory_index and 2 not in memory_index
+
+    @pytest.mark.asyncio
+    async def test_notify_content_changed_refreshes_loaded_index(self, service, memory_index):
+        """Content writes invalidate readiness and refresh the affected ids."""
+        memory_index.replace_all([], [], [])
+        service.invalidate_readiness = MagicMock()
+        service.refresh_memory_index = AsyncMock()
+
+        service.notify_content_changed([7])
+        await asyncio.gather(*VectorSearchService._background_tasks)
+
+        service.invalidate_readiness.assert_called_once()
+        service.refresh_memory_index.assert_awaited_once_with([7])
+
+    async def _search_cold(self, service, query):
+        factory, _ = _mock_session_factory([_marketing_row(1, 0.9)])
+        with patch("src.services.vector_search_service.AsyncSessionLocal", factory):
+            await service.search_marketing_content(query, query_embedding=QUERY_EMBEDDING)
+        await asyncio.gather(*VectorSearchService._background_tasks)
+
+    @pytest.mark.asyncio
+    async def test_skipped_load_is_not_retried_by_searches(self, service, memory_index):
+        """An oversized corpus stays on pgvector until an explicit reload."""
+        service.memory_index_max_items = 1
+        factory, session = _mock_session_factory()
+        session.execute.return_value.scalar.return_value = 5
+        with patch("src.services.vector_search_service.AsyncSessionLocal", factory):
+            await service.load_memory_index()
+
+        service.load_memory_index = AsyncMock(return_value={"status": "skipped"})
+        for query in ("retirement", "annuities", "estate planning"):
+            await self._search_cold(service, query)
+
+        service.load_memory_index.assert_not_awaited()
+        assert service.get_memory_index_stats()["auto_load"] == "disabled_until_reload"
+
+    @pytest.mark.asyncio
+    async def test_failed_load_backs_off(self, service, memory_index):
+        """Searches retry a failed load only after the retry interval."""
+        factory, session = _mock_session_factory()
+        session.execute.side_effect = Exception("connection reset")
+        with patch("src.services.vector_search_service.AsyncSessionLocal", factory):
+            result = await service.load_memory_index()
+        assert result["status"] == "error"
+        assert service.get_memory_index_stats()["auto_load"] == "backing_off"
+
+        load = AsyncMock(return_value={"status": "success"})
+        with patch.object(service, "load_memory_index", load):
+            await self._search_cold(service, "retirement")
+        load.assert_not_awaited()
+
+        VectorSearchService._memory_index_retry_at = 0.0
+        with patch.object(service, "load_memory_index", load):
+            await self._search_cold(service, "annuities")
+        load.assert_awaited_once()
+
+
+class TestVectorSearchRulesRegistry:
+    """Test suite for compliance rule searches answered by the registry."""
+
+    @pytest.mark.asyncio
+    async def test_search_compliance_rules_uses_registry(self):
+        """A current registry answers the search without a database query."""
+        registry = MagicMock()
+        registry.ensure_current = AsyncMock(return_value=True)
+        registry.search.return_value = [{"id": 1, "similarity_score": 0.9}]
+        service = VectorSearchService()
+        service.rules_registry_enabled = True
+
+        with patch("src.services.vector_search_service.compliance_rules_registry", registry), \
+                patch("src.services.vector_search_service.AsyncSessionLocal") as db_factory:
+            results = await service.search_compliance_rules(
+                "testimonials", content_type="linkedin_post", similarity_threshold=0.3, query_embedding=QUERY_EMBEDDING
+            )
+
+        assert results == [{"id": 1, "similarity_score": 0.9}]
+        registry.search.assert_called_once_with(QUERY_EMBEDDING, "linkedin_post", 0.3, 5)
+        db_factory.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_unavailable_registry_falls_back_to_pgvector(self):
+        """When the registry cannot load, pgvector answers the search."""
+        registry = MagicMock()
+        registry.ensure_current = AsyncMock(return_value=False)
+        service = VectorSearchService()
+        service.rules_registry_enabled = True
+        factory, session = _mock_session_factory()
+
+        with patch("src.services.vector_search_service.compliance_rules_registry", registry), \
+                patch("src.services.vector_search_service.AsyncSessionLocal", factory):
+            await service.search_compliance_rules("testimonials", query_embedding=QUERY_EMBEDDING)
+
+        session.execute.assert_awaited_once()
+        registry.search.assert_not_called()
+
+
+def _hit(row_id, method):
+    return {"id": row_id, "title": f"Example {row_id}", "search_method": method}
+
+
+class TestHybridSearch:
+    """Test suite for full-text + vector hybrid search."""
+
+    @pytest.fixture
+    def service(self):
+        service = VectorSearchService()
+        service.rrf_k = 60
+        return service
+
+    def test_full_text_clauses_or_query_terms(self):
+        """Request words are OR-ed into one tsquery against the generated column."""
+        match, rank = marketing_full_text_clauses("Retirement planning, retirement tips!")
+
+        match_sql = _compile(match)
+        assert "marketing_content.search_vector @@ to_tsquery" in match_sql
+        assert "ts_rank_cd(marketing_content.search_vector" in _compile(rank)
+        assert match.right.clauses.clauses[1].value == "retirement | planning | tips"
+
+    def test_full_text_clauses_without_words(self):
+        assert marketing_full_text_clauses("?!") is None
+
+    @pytest.mark.asyncio
+    async def test_full_text_search_is_ranked_and_filtered(self, service):
+        """Full-text search ranks approved content by ts_rank_cd."""
+        row = _marketing_row(3, similarity=None)
+        row.text_rank = 0.4
+        factory, session = _mock_session_factory([row])
+
+        with patch("src.services.vector_search_service.AsyncSessionLocal", factory):
+            results = await service._full_text_search_marketing_content("retirement income", limit=4)
+
+        sql = _compile(session.execute.call_args.args[0])
+        assert "LIKE" not in sql
+        assert "marketing_content.approval_status = " in sql
+        assert "ORDER BY ts_rank_cd(" in sql
+        assert results[0]["id"] == 3
+        assert results[0]["text_rank"] == pytest.approx(0.4)
+        assert results[0]["search_method"] == "full_text"
+
+    def test_reciprocal_rank_fusion(self, service):
+        """Items ranked by both methods beat items ranked highly by only one."""
+        vector = [_hit(1, "vector"), _hit(2, "vector"), _hit(3, "vector")]
+        text = [_hit(3, "full_text"), _hit(2, "full_text"), _hit(4, "full_text")]
+
+        fused = service._reciprocal_rank_fusion([vector, text], max_results=3)
+
+        assert [result["id"] for result in fused] == [3, 2, 1]
+        assert fused[0]["search_method"] == "hybrid"
+        assert fused[0]["rrf_score"] == pytest.approx(1 / 63 + 1 / 61)
+        assert fused[2]["search_method"] == "vector"
+
+    @pytest.mark.asyncio
+    async def test_hybrid_search_runs_methods_concurrently(self, service):
+        """Vector and full-text searches are in flight at the same time."""
+        started = []
+        both_started = asyncio.Event()
+
+        async def search(method):
+            started.append(method)
+            if len(started) == 2:
+                both_started.set()
+            await asyncio.wait_for(both_started.wait(), timeout=1)
+            return [_hit(1, method)]
+
+        async def vector_search(**kwargs):
+            return await search("vector")
+
+        async def full_text_search(**kwargs):
+            return await search("full_text")
+
+        service.search_marketing_content = AsyncMock(side_effect=vector_search)
+        service._full_text_search_marketing_content = AsyncMock(side_effect=full_text_search)
+
+        results = await service.hybrid_search_marketing_content("retirement", limit=5)
+
+        assert [result["id"] for result in results] == [1]
+        assert results[0]["search_method"] == "hybrid"
+        assert service.search_marketing_content.call_args.kwargs["limit"] == service.hybrid_candidates
+
+    @pytest.mark.asyncio
+    async def test_hybrid_search_is_not_cached_on_top_of_vector_search(self, service):
+        """Only the vector candidates are cached; fusion reruns on every call."""
+        service.search_marketing_content = AsyncMock(return_value=[_hit(1, "vector")])
+        service._full_text_search_marketing_content = AsyncMock(return_value=[_hit(2, "full_text")])
+
+        for _ in range(2):
+            await service.hybrid_search_marketing_content("hybrid cache layering", limit=5)
+
+        assert service.search_marketing_content.await_count == 2
+        assert service._full_text_search_marketing_content.await_count == 2
+
+
+class TestMarketingSearchDiversity:
+    """Test suite for the maximal marginal relevance rerank of marketing results."""
+
+    @pytest.fixture
+    def service(self):
+        service = VectorSearchService()
+        service.memory_index_enabled = False
+        service.mmr_lambda = 0.5
+        service.mmr_candidates = 10
+        return service
+
+    @pytest.mark.asyncio
+    async def test_pgvector_search_overfetches_and_diversifies(self, service):
+        """Candidates are fetched with embeddings and near-duplicates are skipped."""
+        rows = [
+            _embedded_row(1, [1.0, 0.01, 0.0, 0.0]),
+            _embedded_row(2, [1.0, 0.0, 0.0, 0.0]),
+            _embedded_row(3, [0.6, 0.0, 0.8, 0.0])
+        ]
+        for row, similarity in zip(rows, (0.95, 0.94, 0.7)):
+            row.similarity_score = similarity
+        factory, session = _mock_session_factory(rows)
+
+        with patch("src.services.vector_search_service.AsyncSessionLocal", factory), \
+             patch("src.services.vector_search_service.vector_index_service.apply_search_settings", AsyncMock()):
+            results = await service.search_marketing_content(
+                "retirement", limit=2, similarity_threshold=0.5,
+                query_embedding=[1.0, 0.2, 0.0, 0.0], diversify=True
+            )
+
+        sql = _compile(session.execute.call_args[0][0])
+        assert "marketing_content.embedding," in sql
+        assert 10 in session.execute.call_args[0][0].compile().params.values()
+        assert [result["id"] for result in results] == [1, 3]
+        assert "embedding" not in results[0]
+
+    @pytest.mark.asyncio
+    async def test_plain_search_does_not_select_embeddings(self, service):
+        """Without diversification the embedding column stays deferred."""
+        factory, session = _mock_session_factory([_marketing_row(1, 0.9)])
+
+        with patch("src.services.vector_search_service.AsyncSessionLocal", factory), \
+             patch("src.services.vector_search_service.vector_index_service.apply_search_settings", AsyncMock()):
+            await service.search_marketing_content(
+                "retirement", limit=2, query_embedding=QUERY_EMBEDDING, diversify=False
+            )
+
+        sql = _compile(session.execute.call_args[0][0])
+        assert "marketing_content.embedding," not in sql
+
+    @pytest.mark.asyncio
+    async def test_memory_index_search_diversifies(self, service):
+        """The in-process index reranks using its stored vectors."""
+        index = InMemoryVectorIndex(dimensions=4)
+        index.replace_all(
+            ids=[1, 2, 3],
+            embeddings=[[1.0, 0.0, 0.0, 0.0], [1.0, 0.01, 0.0, 0.0], [0.6, 0.0, 0.8, 0.0]],
+            metadata=[{"id": 1}, {"id": 2}, {"id": 3}]
+        )
+        service.memory_index_enabled = True
+
+        with patch("src.services.vector_search_service.marketing_memory_index", index):
+            diverse = await service.search_marketing_content(
+                "retirement", limit=2, similarity_threshold=0.1,
+                query_embedding=[1.0, 0.2, 0.0, 0.0], diversify=True
+            )
+            plain = await service.search_marketing_content(
+                "retirement", limit=2, similarity_threshold=0.1,
+                query_embedding=[1.0, 0.2, 0.0, 0.0], diversify=False
+            )
+
+        assert [result["id"] for result in diverse] == [2, 3]
+        assert [result["id"] for result in plain] == [2, 1]
+
+
+class TestFilteredMarketingSearch:
+    """Test suite for metadata-filtered marketing vector search."""
+
+    @pytest.fixture
+    def service(self):
+        service = VectorSearchService()
+        service.memory_index_enabled = False
+        service.mmr_enabled = False
+        return service
+
+    @staticmethod
+    def _executed_sql(session) -> str:
+        # Inlined (literal_execute) values are rendered the way asyncpg receives them
+        statement = session.execute.call_args[0][0]
+        return str(statement.compile(
+            dialect=asyncpg.dialect(), compile_kwargs={"render_postcompile": True}
+        ))
+
+    @pytest.mark.asyncio
+    async def test_filters_are_inlined_to_match_partial_indexes(self, service):
+        """Approval and content type appear as literals, like the partial index predicates."""
+        factory, session = _mock_session_factory([_marketing_row(1, 0.9)])
+
+        with patch("src.services.vector_search_service.AsyncSessionLocal", factory):
+            results = await service.search_marketing_content(
+                "retirement", content_type=ContentType.LINKEDIN_POST,
+                audience_type="general_education", query_embedding=QUERY_EMBEDDING
+            )
+
+        sql = self._executed_sql(session)
+        assert "marketing_content.approval_status = 'APPROVED'" in sql
+        assert "marketing_content.content_type = 'LINKEDIN_POST'" in sql
+        assert "marketing_content.audience_type = 'GENERAL_EDUCATION'" in sql
+        assert results[0]["content_type"] == "LINKEDIN_POST"
+        assert results[0]["audience_type"] == "GENERAL_EDUCATION"
+
+    @pytest.mark.asyncio
+    async def test_threshold_mode_applies_filters(self, service):
+        factory, session = _mock_session_factory()
+
+        with patch("src.services.vector_search_service.AsyncSessionLocal", factory):
+            await service.search_marketing_content(
+                "retirement", content_type=ContentType.NEWSLETTER,
+                search_mode="threshold", query_embedding=QUERY_EMBEDDING
+            )
+
+        sql = self._executed_sql(session)
+        assert "marketing_content.content_type = 'NEWSLETTER'" in sql
+        assert "marketing_content.approval_status = 'APPROVED'" in sql
+
+    @pytest.mark.asyncio
+    async def test_unknown_audience_is_not_filtered(self, service):
+        """Free-form audience labels (e.g. "retail_investors") do not filter results away."""
+        factory, session = _mock_session_factory()
+
+        with patch("src.services.vector_search_service.AsyncSessionLocal", factory):
+            await service.search_marketing_content(
+                "retirement", audience_type="retail_investors", query_embedding=QUERY_EMBEDDING
+            )
+
+        sql = self._executed_sql(session)
+        assert "marketing_content.audience_type =" not in sql
+        assert "marketing_content.content_type =" not in sql
+
+    @pytest.mark.asyncio
+    async def test_memory_index_applies_filters(self, service):
+        index = InMemoryVectorIndex(dimensions=4)
+        index.replace_all(
+            ids=[1, 2, 3],
+            embeddings=[[1.0, 0.0, 0.0, 0.0], [0.9, 0.1, 0.0, 0.0], [0.8, 0.2, 0.0, 0.0]],
+            metadata=[
+                {"id": 1, "content_type": "NEWSLETTER", "audience_type": "GENERAL_EDUCATION"},
+                {"id": 2, "content_type": "LINKEDIN_POST", "audience_type": "GENERAL_EDUCATION"},
+                {"id": 3, "content_type": "LINKEDIN_POST", "audience_type": "NEW_PROSPECTS"}
+            ]
+        )
+        service.memory_index_enabled = True
+
+        with patch("src.services.vector_search_service.marketing_memory_index", index):
+            by_type = await service.search_marketing_content(
+                "retirement", content_type=ContentType.LINKEDIN_POST,
+                similarity_threshold=0.1, query_embedding=[1.0, 0.0, 0.0, 0.0]
+            )
+            by_audience = await service.search_marketing_content(
+                "retirement", content_type=ContentType.LINKEDIN_POST, audience_type=AudienceType.NEW_PROSPECTS,
+                similarity_threshold=0.1, query_embedding=[1.0, 0.0, 0.0, 0.0]
+            )
+
+        assert [result["id"] for result in by_type] == [2, 3]
+        assert [result["id"] for result in by_audience] == [3]
@@ -7,6 +7,7 @@ Test Coverage:
 - Error handling patterns
 - Result population logic
 - Input validation
+- Subclasses must implement _prepare_generation
 """
 
 import pytest
@@ -14,6 +15,7 @@ import time
 from unittest.mock import patch, MagicMock
 from src.services.warren.strategies.base_generation_strategy import BaseGenerationStrategy
 from src.services.warren.strategies.content_generation_strategy import GenerationResult
+from src.services.prompt_service import CacheablePrompt
 
 
 class ConcreteBaseStrategy(BaseGenerationStrategy):
@@ -30,6 +32,10 @@ class ConcreteBaseStrategy(BaseGenerationStrategy):
     def get_strategy_name(self):
         """Minimal implementation for testing."""
         return "test_base"
+    
+    async def _prepare_generation(self, context_data, user_request, content_type, *args, **kwargs):
+        """Minimal implementation for testing."""
+        return CacheablePrompt([], user_request), {}
 
 
 class TestBaseGenerationStrategy:
@@ -230,6 +236,21 @@ class TestBaseGenerationStrategyInheritance:
             # This should fail because BaseGenerationStrategy is still abstract
             BaseGenerationStrategy()
     
+    def test_prepare_generation_is_required(self):
+        """A strategy without _prepare_generation fails at instantiation, not mid-stream."""
+        class MissingPrepareStrategy(BaseGenerationStrategy):
+            async def generate_content(self, context_data, user_request, content_type, **kwargs):
+                return GenerationResult()
+            
+            def can_handle(self, context_data):
+                return True
+            
+            def get_strategy_name(self):
+                return "missing_prepare"
+        
+        with pytest.raises(TypeError, match="_prepare_generation"):
+            MissingPrepareStrategy()
+    
     def test_concrete_implementation_works(self):
         """Test that concrete implementation can be instantiated."""
         strategy = ConcreteBaseStrategy()
@@ -10,6 +10,7 @@ from src.services.warren.strategies import (
     LegacyGenerationStrategy,
     GenerationResult
 )
+from src.services.prompt_service import CacheablePrompt
 
 
 class TestAdvancedGenerationStrategy:
@@ -175,6 +176,48 @@ class TestAdvancedGenerationStrategy:
                 assert "Context assembler failed" in result.error_message
                 assert result.metadata["error_type"] == "advanced_generation_failure"
                 assert result.generation_time > 0
+    
+    @pytest.mark.asyncio
+    async def test_stream_content_reports_assembled_context(self, strategy, sample_context_data):
+        """Test streaming generation reports the assembled context before tokens."""
+        async def stream(prompt, usage=None, **kwargs):
+            yield "Streamed content"
+        
+        with patch('src.services.warren.strategies.advanced_generation_strategy.BasicContextAssemblyOrchestrator') as mock_assembler_class:
+            with patch('src.services.warren.strategies.advanced_generation_strategy.AsyncSessionLocal'):
+                with patch('src.services.warren.strategies.advanced_generation_strategy.prompt_service') as mock_prompt:
+                    with patch('src.services.warren.strategies.base_generation_strategy.claude_service') as mock_claude:
+                        
+                        mock_assembler = AsyncMock()
+                        mock_assembler_class.return_value = mock_assembler
+                        mock_assembler.build_warren_context.return_value = {
+                            "context": "Advanced assembled context...",
+                            "total_tokens": 1500,
+                            "request_type": "creation_mode",
+                            "optimization_applied": True,
+                            "context_breakdown": {}
+                        }
+                        mock_prompt.get_warren_system_prompt.return_value = "System prompt..."
+                        mock_claude.stream_content = stream
+                        
+                        # Execute
+                        events = [event async for event in strategy.stream_content(
+                            context_data=sample_context_data,
+                            user_request="Create LinkedIn post about retirement planning",
+                            content_type="linkedin_post"
+                        )]
+                        
+                        # Verify
+                        assert events[0] == {
+                            "event": "context_assembled",
+                            "strategy": "advanced",
+                            "phase": "Phase_2_Advanced",
+                            "total_tokens": 1500
+                        }
+                        result = events[-1]["result"]
+                        assert result.success is True
+                        assert result.content == "Streamed content"
+                        assert "assembly_result" in result.metadata
 
 
 class TestLegacyGenerationStrategy:
@@ -255,6 +298,38 @@ class TestLegacyGenerationStrategy:
                 assert result.metadata["context_building"] == "manual"
                 assert result.metadata["refinement"] is False
     
+    @pytest.mark.asyncio
+    async def test_generate_content_puts_stable_blocks_first(self, strategy, sample_context_data):
+        """Test prompt layout for provider-side prompt caching and per-request usage."""
+        async def generate_content(prompt, usage=None, **kwargs):
+            usage.update({"cache_read_input_tokens": 1500, "cache_hit": True})
+            return "Legacy generated content..."
+        
+        with patch('src.services.warren.strategies.legacy_generation_strategy.prompt_service') as mock_prompt:
+            with patch('src.services.warren.strategies.legacy_generation_strategy.claude_service') as mock_claude:
+                
+                mock_prompt.get_warren_system_prompt.return_value = "System prompt..."
+                mock_claude.generate_content = AsyncMock(side_effect=generate_content)
+                
+                # Execute
+                result = await strategy.generate_content(
+                    context_data=sample_context_data,
+                    user_request="Create social media post",
+                    content_type="social_media"
+                )
+                
+                # Verify
+                prompt = mock_claude.generate_content.call_args[0][0]
+                assert isinstance(prompt, CacheablePrompt)
+                assert prompt.stable_blocks[0].startswith("System prompt...")
+                assert "GENERATION REQUIREMENTS" in prompt.stable_blocks[0]
+                assert prompt.stable_blocks[1].startswith("## REQUIRED DISCLAIMERS:")
+                assert "Past performance" in prompt.stable_blocks[1]
+                assert "Create social media post" in prompt.request
+                assert "System prompt..." not in prompt.request
+                assert "REQUIRED DISCLAIMERS" not in prompt.request
+                assert result.token_usage == {"cache_read_input_tokens": 1500, "cache_hit": True}
+    
     @pytest.mark.asyncio
     async def test_generate_content_refinement(self, strategy, sample_context_data):
         """Test refinement content generation."""
@@ -342,6 +417,64 @@ class TestLegacyGenerationStrategy:
                 assert result.metadata["error_type"] == "legacy_generation_failure"
                 assert result.generation_time > 0
     
+    @pytest.mark.asyncio
+    async def test_stream_content_yields_stage_and_token_events(self, strategy, sample_context_data):
+        """Test streaming generation event sequence."""
+        async def stream(prompt, usage=None, **kwargs):
+            for text in ["Plan ", "ahead."]:
+                yield text
+        
+        with patch('src.services.warren.strategies.legacy_generation_strategy.prompt_service') as mock_prompt:
+            with patch('src.services.warren.strategies.base_generation_strategy.claude_service') as mock_claude:
+                
+                mock_prompt.get_warren_system_prompt.return_value = "System prompt..."
+                mock_claude.stream_content = stream
+                
+                # Execute
+                events = [event async for event in strategy.stream_content(
+                    context_data=sample_context_data,
+                    user_request="Create social media post",
+                    content_type="social_media"
+                )]
+                
+                # Verify
+                assert [event["event"] for event in events] == [
+                    "context_assembled", "token", "token", "generation_complete"
+                ]
+                assert events[0]["strategy"] == "legacy"
+                assert events[0]["phase"] == "Legacy_Fallback"
+                result = events[-1]["result"]
+                assert result.success is True
+                assert result.content == "Plan ahead."
+                assert result.metadata["context_building"] == "manual"
+    
+    @pytest.mark.asyncio
+    async def test_stream_content_failure_keeps_partial_content(self, strategy, sample_context_data):
+        """Test a stream interrupted by Claude ends with a failed result."""
+        async def stream(prompt, usage=None, **kwargs):
+            yield "Plan "
+            raise Exception("Claude API error: connection reset")
+        
+        with patch('src.services.warren.strategies.legacy_generation_strategy.prompt_service') as mock_prompt:
+            with patch('src.services.warren.strategies.base_generation_strategy.claude_service') as mock_claude:
+                
+                mock_prompt.get_warren_system_prompt.return_value = "System prompt..."
+                mock_claude.stream_content = stream
+                
+                # Execute
+                events = [event async for event in strategy.stream_content(
+                    context_data=sample_context_data,
+                    user_request="Test request",
+                    content_type="linkedin_post"
+                )]
+                
+                # Verify
+                assert [event["event"] for event in events] == ["context_assembled", "token", "generation_complete"]
+                result = events[-1]["result"]
+                assert result.success is False
+                assert "connection reset" in result.error_message
+                assert result.metadata["partial_content"] == "Plan "
+    
     def test_add_youtube_context_full_transcript(self, strategy):
         """Test YouTube context addition with full transcript."""
         context_parts = ["Existing context..."]
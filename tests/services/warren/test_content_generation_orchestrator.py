@@ -13,6 +13,21 @@ from src.services.warren.strategies.content_generation_strategy import Generatio
 from src.models.refactored_database import ContentType
 
 
+def _strategy_stream(*texts, success=True, strategy="advanced", error=None):
+    """Stand-in for a strategy's stream_content: tokens, then the GenerationResult."""
+    async def stream_content(**kwargs):
+        yield {"event": "context_assembled", "strategy": strategy}
+        for text in texts:
+            yield {"event": "token", "text": text}
+        result = GenerationResult()
+        result.success = success
+        result.content = "".join(texts) if success else None
+        result.error_message = error
+        result.strategy_used = strategy
+        yield {"event": "generation_complete", "result": result}
+    return stream_content
+
+
 class TestContentGenerationOrchestrator:
     """Test suite for ContentGenerationOrchestrator."""
     
@@ -384,6 +399,18 @@ class TestContentGenerationOrchestrator:
             assert result["session_documents_available"] == False
             assert result["session_id"] is None
         
+        def test_token_usage_is_reported(self, orchestrator):
+            """Test per-request token usage (prompt cache accounting) in response metadata."""
+            token_usage = {"input_tokens": 280, "cache_read_input_tokens": 1500, "cache_hit": True}
+            metadata = {
+                "context_data": {},
+                "generation_metadata": {"strategy_used": "legacy", "token_usage": token_usage}
+            }
+            
+            result = orchestrator._assemble_response("content", metadata)
+            
+            assert result["metadata"]["token_usage"] == token_usage
+        
         def test_document_title_handling(self, orchestrator):
             """Test handling of session documents without titles."""
             metadata = {
@@ -625,3 +652,62 @@ class TestContentGenerationOrchestrator:
             assert "disclaimers" in call_args
             assert "conversation_context" in call_args
             assert "session_documents" in call_args
+    
+    class TestStreamContentWithEnhancedContext:
+        """Test streaming generation."""
+        
+        async def _events(self, orchestrator, **params):
+            return [event async for event in orchestrator.stream_content_with_enhanced_context(**params)]
+        
+        @pytest.mark.asyncio
+        async def test_stage_events_then_tokens_then_response(self, orchestrator, mock_strategy_factory, basic_request_params):
+            """Test the event sequence of a successful stream."""
+            mock_strategy_factory.get_strategy.return_value.stream_content = _strategy_stream("Plan ", "ahead.")
+            
+            events = await self._events(orchestrator, **basic_request_params)
+            
+            assert [event["event"] for event in events] == [
+                "retrieval_complete", "context_assembled", "token", "token", "complete"
+            ]
+            assert events[0]["marketing_examples_count"] == 2
+            assert events[0]["compliance_rules_count"] == 1
+            response = events[-1]["response"]
+            assert response["status"] == "success"
+            assert response["content"] == "Plan ahead."
+            assert response["session_documents_count"] == 1
+        
+        @pytest.mark.asyncio
+        async def test_failure_before_tokens_falls_back_to_legacy(self, orchestrator, mock_strategy_factory, basic_request_params):
+            """Test the legacy strategy takes over when nothing was streamed yet."""
+            advanced = Mock()
+            advanced.get_strategy_name.return_value = "advanced"
+            advanced.stream_content = _strategy_stream(success=False, error="assembly failed")
+            legacy = Mock()
+            legacy.stream_content = _strategy_stream("Legacy content", strategy="legacy")
+            mock_strategy_factory.get_strategy.side_effect = lambda name: {"advanced": advanced, "legacy": legacy}[name]
+            
+            events = await self._events(orchestrator, **basic_request_params)
+            
+            assert events[-1]["event"] == "complete"
+            assert events[-1]["response"]["content"] == "Legacy content"
+            assert [event["strategy"] for event in events if event["event"] == "context_assembled"] == ["advanced", "legacy"]
+        
+        @pytest.mark.asyncio
+        async def test_failure_after_tokens_ends_with_error(self, orchestrator, mock_strategy_factory, basic_request_params):
+            """Test a stream interrupted mid-content is not restarted."""
+            mock_strategy_factory.get_strategy.return_value.stream_content = _strategy_stream(
+                "Plan ", success=False, error="connection reset"
+            )
+            
+            events = await self._events(orchestrator, **basic_request_params)
+            
+            assert events[-1] == {"event": "error", "error": "connection reset"}
+            assert mock_strategy_factory.get_strategy.call_count == 1
+        
+        @pytest.mark.asyncio
+        async def test_invalid_request_yields_error(self, orchestrator, mock_search_orchestrator):
+            """Test validation errors end the stream before retrieval."""
+            events = await self._events(orchestrator, user_request="", content_type="linkedin_post")
+            
+            assert events == [{"event": "error", "error": "User request cannot be empty"}]
+            mock_search_orchestrator.execute_search_with_fallback.assert_not_called()
@@ -3,11 +3,14 @@ Tests for ContextRetrievalService
 
 Test Coverage:
 - get_vector_search_context (direct port of _get_vector_search_context)
+- concurrent retrieval fan-out (batched query embeddings, per-branch timeouts, partial failures)
+- backup disclaimer search only when no compliance rules are found
 - get_text_search_context (direct port of _get_text_search_context)
-- combine_contexts (direct port of _combine_contexts)
+- combine_contexts (direct port of _combine_contexts, disclaimers deduped per source table)
 - assess_context_quality (direct port of _assess_context_quality)
 """
 
+import asyncio
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 from src.services.warren.context_retrieval_service import ContextRetrievalService
@@ -104,7 +107,7 @@ class TestContextRetrievalService:
         # Verify
         expected = {
             "marketing_examples": sample_marketing_examples,
-            "disclaimers": sample_disclaimers,
+            "disclaimers": [{**d, "source": "compliance_rule"} for d in sample_disclaimers],
             "vector_available": True,
             "search_method": "vector",
             "vector_results_count": 2,
@@ -169,6 +172,125 @@ class TestContextRetrievalService:
         assert result["vector_available"] == False
         assert "error" in result
     
+    @pytest.mark.asyncio
+    async def test_get_vector_search_context_embeds_queries_once(self, service, mock_vector_search_service):
+        """Request and compliance queries are embedded in one call and passed to each search."""
+        embeddings = [[0.1] * 3, [0.2] * 3]
+        mock_vector_search_service.embed_queries.return_value = embeddings
+        
+        await service.get_vector_search_context(
+            user_request="retirement planning",
+            content_type="linkedin_post",
+            content_type_enum=ContentType.LINKEDIN_POST
+        )
+        
+        mock_vector_search_service.embed_queries.assert_awaited_once_with([
+            "retirement planning",
+            "linkedin_post compliance rules disclaimer"
+        ])
+        marketing_calls = mock_vector_search_service.search_marketing_content.call_args_list
+        assert marketing_calls[0].kwargs["query_embedding"] == embeddings[0]
+        compliance_call = mock_vector_search_service.search_compliance_rules.call_args
+        assert compliance_call.kwargs["query_embedding"] == embeddings[1]
+    
+    @pytest.mark.asyncio
+    async def test_get_vector_search_context_branches_run_concurrently(self, service, mock_vector_search_service):
+        """Latency is the slowest branch, not the sum of branches."""
+        async def slow_search(*args, **kwargs):
+            await asyncio.sleep(0.1)
+            return []
+        
+        mock_vector_search_service.search_marketing_content.side_effect = slow_search
+        mock_vector_search_service.search_compliance_rules.side_effect = slow_search
+        
+        start = asyncio.get_running_loop().time()
+        result = await service.get_vector_search_context(
+            user_request="test",
+            content_type="linkedin_post",
+            content_type_enum=ContentType.LINKEDIN_POST
+        )
+        elapsed = asyncio.get_running_loop().time() - start
+        
+        assert result["vector_available"] is True
+        assert elapsed < 0.25
+    
+    @pytest.mark.asyncio
+    async def test_get_vector_search_context_compliance_timeout_is_partial(self, service, mock_vector_search_service, sample_marketing_examples, sample_disclaimers):
+        """A timed-out compliance branch falls back to disclaimer-like marketing content."""
+        service.branch_timeout = 0.05
+        
+        async def hanging_search(*args, **kwargs):
+            await asyncio.sleep(1)
+        
+        mock_vector_search_service.search_compliance_rules.side_effect = hanging_search
+        mock_vector_search_service.search_marketing_content.side_effect = [
+            sample_marketing_examples,
+            sample_disclaimers
+        ]
+        
+        result = await service.get_vector_search_context(
+            user_request="test",
+            content_type="linkedin_post",
+            content_type_enum=ContentType.LINKEDIN_POST
+        )
+        
+        assert result["vector_available"] is True
+        assert result["marketing_examples"] == sample_marketing_examples
+        assert [d["id"] for d in result["disclaimers"]] == ["disclaimer_1", "disclaimer_2"]
+        assert result["failed_branches"] == ["compliance_rules: timed out"]
+    
+    @pytest.mark.asyncio
+    async def test_backup_disclaimer_search_skipped_when_rules_found(self, service, mock_vector_search_service, sample_disclaimers):
+        """Marketing content is only searched for disclaimers when no compliance rules match."""
+        mock_vector_search_service.search_compliance_rules.return_value = sample_disclaimers
+        
+        await service.get_vector_search_context(
+            user_request="test",
+            content_type="linkedin_post",
+            content_type_enum=ContentType.LINKEDIN_POST
+        )
+        
+        queries = [call.kwargs["query_text"] for call in mock_vector_search_service.search_marketing_content.call_args_list]
+        assert queries == ["test"]
+    
+    @pytest.mark.asyncio
+    async def test_backup_disclaimer_search_runs_when_no_rules(self, service, mock_vector_search_service):
+        """An empty compliance result triggers the backup disclaimer search."""
+        await service.get_vector_search_context(
+            user_request="test",
+            content_type="linkedin_post",
+            content_type_enum=ContentType.LINKEDIN_POST
+        )
+        
+        queries = [call.kwargs["query_text"] for call in mock_vector_search_service.search_marketing_content.call_args_list]
+        assert queries == ["test", "linkedin_post disclaimer risk disclosure"]
+    
+    @pytest.mark.asyncio
+    async def test_backup_disclaimer_search_skipped_when_not_ready(self, service, mock_vector_search_service):
+        """No backup search runs when vector search is unavailable."""
+        mock_vector_search_service.check_readiness.return_value = {"ready": False, "reason": "Not initialized"}
+        
+        await service.get_vector_search_context(
+            user_request="test",
+            content_type="linkedin_post",
+            content_type_enum=ContentType.LINKEDIN_POST
+        )
+        
+        assert mock_vector_search_service.search_marketing_content.await_count == 1
+    
+    @pytest.mark.asyncio
+    async def test_get_vector_search_context_readiness_failure(self, service, mock_vector_search_service):
+        """A failed readiness branch reports vector search unavailable."""
+        mock_vector_search_service.check_readiness.side_effect = Exception("db down")
+        
+        result = await service.get_vector_search_context(
+            user_request="test",
+            content_type="linkedin_post",
+            content_type_enum=ContentType.LINKEDIN_POST
+        )
+        
+        assert result == {"marketing_examples": [], "disclaimers": [], "vector_available": False}
+    
     # Test get_text_search_context method
     @pytest.mark.asyncio
     async def test_get_text_search_context_success(self, service, mock_warren_db_service, sample_marketing_examples, sample_disclaimers):
@@ -279,6 +401,27 @@ class TestContextRetrievalService:
         disclaimer_ids = [d["id"] for d in result["disclaimers"]]
         assert "text_disclaimer_1" not in disclaimer_ids
     
+    def test_combine_contexts_disclaimer_ids_are_per_source(self, service):
+        """A compliance rule and a marketing disclaimer sharing an id are both kept."""
+        vector_results = {
+            "marketing_examples": [],
+            "disclaimers": [{"id": 7, "title": "FINRA 2210", "source": "compliance_rule"}],
+            "vector_available": True
+        }
+        text_results = {
+            "marketing_examples": [],
+            "disclaimers": [
+                {"id": 7, "title": "Risk disclosure", "source": "marketing_content"},
+                {"id": 7, "title": "FINRA 2210", "source": "compliance_rule"}
+            ]
+        }
+        
+        result = service.combine_contexts(vector_results, text_results)
+        
+        assert [(d["source"], d["id"]) for d in result["disclaimers"]] == [
+            ("compliance_rule", 7), ("marketing_content", 7)
+        ]
+    
     # Integration test
     @pytest.mark.asyncio
     async def test_full_workflow(self, service, mock_vector_search_service, mock_warren_db_service, sample_marketing_examples, sample_disclaimers):
@@ -3,8 +3,11 @@ Tests for SearchOrchestrator
 
 Test Coverage:
 - execute_search_with_fallback (direct port of enhanced_warren_service orchestration logic)
+- Speculative text search fallback (delayed/immediate start, cancellation, stats)
 """
 
+import asyncio
+
 import pytest
 from unittest.mock import AsyncMock, MagicMock
 from src.services.warren.search_orchestrator import SearchOrchestrator
@@ -234,3 +237,191 @@ class TestSearchOrchestrator:
         assert hasattr(orchestrator, 'execute_search_with_fallback')
         assert callable(getattr(orchestrator, 'execute_search_with_fallback'))
 
+
+class TestSpeculativeFallback:
+    """Speculative text search fallback running alongside slow vector searches."""
+    
+    @pytest.fixture
+    def text_search_calls(self):
+        return {"started": 0, "finished": 0, "cancelled": 0}
+    
+    @pytest.fixture
+    def mock_context_retrieval_service(self, text_search_calls):
+        mock_service = AsyncMock()
+        mock_service.vector_delay = 0.0
+        mock_service.text_delay = 0.05
+        
+        async def vector_search(*args):
+            await asyncio.sleep(mock_service.vector_delay)
+            return {"marketing_examples": [{"id": "ex1"}], "disclaimers": []}
+        
+        async def text_search(*args):
+            text_search_calls["started"] += 1
+            try:
+                await asyncio.sleep(mock_service.text_delay)
+            except asyncio.CancelledError:
+                text_search_calls["cancelled"] += 1
+                raise
+            text_search_calls["finished"] += 1
+            return {"marketing_examples": [{"id": "ex2"}], "disclaimers": [{"id": "disc1"}]}
+        
+        mock_service.get_vector_search_context.side_effect = vector_search
+        mock_service.get_text_search_context.side_effect = text_search
+        mock_service.combine_contexts = MagicMock(side_effect=lambda vector, text: {
+            "marketing_examples": vector["marketing_examples"] + text["marketing_examples"],
+            "disclaimers": text["disclaimers"],
+            "search_strategy": "hybrid"
+        })
+        return mock_service
+    
+    @pytest.fixture
+    def mock_context_quality_assessor(self):
+        mock_assessor = MagicMock()
+        mock_assessor.assess_context_quality.return_value = {"sufficient": True, "score": 1.0, "reason": "sufficient_quality"}
+        return mock_assessor
+    
+    def _orchestrator(self, retrieval, assessor, **kwargs):
+        return SearchOrchestrator(
+            context_retrieval_service=retrieval,
+            context_quality_assessor=assessor,
+            speculative_fallback=kwargs.pop("speculative_fallback", True),
+            speculative_fallback_delay=kwargs.pop("delay", 0.01),
+            speculative_fallback_immediate=kwargs.pop("immediate", False)
+        )
+    
+    async def _search(self, orchestrator):
+        return await orchestrator.execute_search_with_fallback(
+            user_request="retirement planning post",
+            content_type="linkedin_post",
+            content_type_enum=ContentType.LINKEDIN_POST
+        )
+    
+    @pytest.mark.asyncio
+    async def test_fast_sufficient_vector_search_never_starts_text_search(
+        self, mock_context_retrieval_service, mock_context_quality_assessor, text_search_calls
+    ):
+        orchestrator = self._orchestrator(mock_context_retrieval_service, mock_context_quality_assessor, delay=0.5)
+        
+        result = await self._search(orchestrator)
+        
+        assert result["fallback_used"] is False
+        assert text_search_calls["started"] == 0
+        assert orchestrator.get_fallback_stats()["speculative_started"] == 0
+    
+    @pytest.mark.asyncio
+    async def test_slow_sufficient_vector_search_cancels_started_text_search(
+        self, mock_context_retrieval_service, mock_context_quality_assessor, text_search_calls
+    ):
+        mock_context_retrieval_service.vector_delay = 0.03
+        mock_context_retrieval_service.text_delay = 1.0
+        orchestrator = self._orchestrator(mock_context_retrieval_service, mock_context_quality_assessor)
+        
+        result = await self._search(orchestrator)
+        
+        assert result["fallback_used"] is False
+        assert result["search_strategy"] == "vector"
+        assert text_search_calls == {"started": 1, "finished": 0, "cancelled": 1}
+        mock_context_retrieval_service.combine_contexts.assert_not_called()
+        stats = orchestrator.get_fallback_stats()
+        assert stats["speculative_started"] == 1
+        assert stats["speculative_wasted"] == 1
+        assert stats["speculative_used"] == 0
+    
+    @pytest.mark.asyncio
+    async def test_insufficient_vector_search_overlaps_with_text_search(
+        self, mock_context_retrieval_service, mock_context_quality_assessor, text_search_calls
+    ):
+        mock_context_retrieval_service.vector_delay = 0.1
+        mock_context_retrieval_service.text_delay = 0.1
+        mock_context_quality_assessor.assess_context_quality.return_value = {"sufficient": False, "score": 0.4, "reason": "no_disclaimers_found"}
+        orchestrator = self._orchestrator(mock_context_retrieval_service, mock_context_quality_assessor, immediate=True)
+        
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        result = await self._search(orchestrator)
+        elapsed = loop.time() - started
+        
+        # Concurrent: roughly max(vector, text), not their sum
+        assert elapsed < 0.18
+        assert result["fallback_used"] is True
+        assert result["fallback_reason"] == "no_disclaimers_found"
+        assert [ex["id"] for ex in result["marketing_examples"]] == ["ex1", "ex2"]
+        mock_context_retrieval_service.get_text_search_context.assert_called_once_with(
+            "retirement planning post", "linkedin_post", ContentType.LINKEDIN_POST
+        )
+        assert orchestrator.get_fallback_stats()["speculative_used"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_insufficient_verdict_before_delay_starts_text_search_at_once(
+        self, mock_context_retrieval_service, mock_context_quality_assessor, text_search_calls
+    ):
+        mock_context_retrieval_service.text_delay = 0.0
+        mock_context_quality_assessor.assess_context_quality.return_value = {"sufficient": False, "score": 0.1, "reason": "no_relevant_content_found"}
+        orchestrator = self._orchestrator(mock_context_retrieval_service, mock_context_quality_assessor, delay=5.0)
+        
+        result = await asyncio.wait_for(self._search(orchestrator), timeout=1.0)
+        
+        assert result["fallback_used"] is True
+        assert text_search_calls["finished"] == 1
+        # Not speculative: the vector verdict came first
+        assert orchestrator.get_fallback_stats()["speculative_started"] == 0
+    
+    @pytest.mark.asyncio
+    async def test_vector_search_error_cancels_text_search(
+        self, mock_context_retrieval_service, mock_context_quality_assessor, text_search_calls
+    ):
+        mock_context_retrieval_service.text_delay = 1.0
+        
+        async def failing_vector_search(*args):
+            await asyncio.sleep(0.01)
+            raise RuntimeError("boom")
+        
+        mock_context_retrieval_service.get_vector_search_context.side_effect = failing_vector_search
+        orchestrator = self._orchestrator(mock_context_retrieval_service, mock_context_quality_assessor, immediate=True)
+        
+        with pytest.raises(RuntimeError):
+            await self._search(orchestrator)
+        
+        assert text_search_calls["cancelled"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_caller_cancelled_while_text_search_unwinds(
+        self, mock_context_retrieval_service, mock_context_quality_assessor, text_search_calls
+    ):
+        """Cancelling the search while the fallback unwinds is not swallowed."""
+        unwinding = asyncio.Event()
+        
+        async def slow_to_unwind_text_search(*args):
+            try:
+                await asyncio.sleep(1.0)
+            except asyncio.CancelledError:
+                unwinding.set()
+                await asyncio.sleep(1.0)
+                raise
+        
+        mock_context_retrieval_service.vector_delay = 0.01
+        mock_context_retrieval_service.get_text_search_context.side_effect = slow_to_unwind_text_search
+        orchestrator = self._orchestrator(mock_context_retrieval_service, mock_context_quality_assessor, immediate=True)
+        
+        search = asyncio.create_task(self._search(orchestrator))
+        await asyncio.wait_for(unwinding.wait(), timeout=1.0)
+        search.cancel()
+        
+        with pytest.raises(asyncio.CancelledError):
+            await asyncio.wait_for(search, timeout=1.0)
+        assert orchestrator.get_fallback_stats()["speculative_wasted"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_speculation_disabled_runs_fallback_sequentially(
+        self, mock_context_retrieval_service, mock_context_quality_assessor, text_search_calls
+    ):
+        mock_context_quality_assessor.assess_context_quality.return_value = {"sufficient": False, "score": 0.4, "reason": "no_disclaimers_found"}
+        orchestrator = self._orchestrator(
+            mock_context_retrieval_service, mock_context_quality_assessor, speculative_fallback=False
+        )
+        
+        result = await self._search(orchestrator)
+        
+        assert result["fallback_used"] is True
+        assert text_search_calls["finished"] == 1
+        assert orchestrator.get_fallback_stats()["speculative_started"] == 0
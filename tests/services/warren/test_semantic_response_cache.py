@@ -0,0 +1,233 @@
+"""
+Tests for SemanticResponseCache
+
+Test Coverage:
+- Near-duplicate match (similarity threshold, content/audience type, retrieved sources)
+- Expiry (TTL, marketing/compliance data changes) and LRU entry cap
+- Orchestrator integration (repeat requests skip generation, bypass for refinements/documents/conversations)
+"""
+
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+
+from src.services.search_result_cache import SearchResultCache, COMPLIANCE_RULES
+from src.services.warren.semantic_response_cache import SemanticResponseCache
+from src.services.warren.session_retrieval_memo import SessionRetrievalMemo
+from src.services.warren.content_generation_orchestrator import ContentGenerationOrchestrator
+from src.services.warren.strategies.content_generation_strategy import GenerationResult
+
+
+GENERATION = {"content": "Roth IRA conversion post", "metadata": {"strategy_used": "advanced"}}
+SOURCES = [101, 102, "disc-1"]
+
+
+@pytest.fixture
+def result_cache():
+    """Isolated version counters for cache invalidation."""
+    cache = SearchResultCache()
+    with patch("src.services.warren.semantic_response_cache.search_result_cache", cache):
+        yield cache
+
+
+@pytest.fixture
+def cache(result_cache):
+    return SemanticResponseCache(similarity_threshold=0.95, ttl_seconds=60, max_entries=2, enabled=True)
+
+
+class TestSemanticResponseCache:
+    """Test suite for SemanticResponseCache."""
+
+    def test_near_duplicate_request_hits(self, cache):
+        cache.store([1.0, 0.0], "linkedin_post", "retirees", SOURCES, GENERATION)
+
+        hit = cache.lookup([0.99, 0.05], "linkedin_post", "retirees", ["disc-1", 102, 101])
+
+        assert hit is not None
+        generation, similarity = hit
+        assert generation == GENERATION
+        assert similarity > 0.95
+        assert cache.get_stats()["hits"] == 1
+
+    def test_dissimilar_request_misses(self, cache):
+        cache.store([1.0, 0.0], "linkedin_post", "retirees", SOURCES, GENERATION)
+
+        assert cache.lookup([0.8, 0.6], "linkedin_post", "retirees", SOURCES) is None
+        assert cache.get_stats()["misses"] == 1
+
+    def test_best_match_in_bucket_is_returned(self, cache):
+        cache.store([1.0, 0.0], "linkedin_post", None, SOURCES, {"content": "first"})
+        cache.store([0.0, 1.0], "linkedin_post", None, SOURCES, {"content": "second"})
+
+        generation, _ = cache.lookup([0.02, 1.0], "linkedin_post", None, SOURCES)
+
+        assert generation["content"] == "second"
+
+    def test_content_audience_or_sources_change_misses(self, cache):
+        cache.store([1.0, 0.0], "linkedin_post", "retirees", SOURCES, GENERATION)
+
+        assert cache.lookup([1.0, 0.0], "newsletter", "retirees", SOURCES) is None
+        assert cache.lookup([1.0, 0.0], "linkedin_post", "millennials", SOURCES) is None
+        assert cache.lookup([1.0, 0.0], "linkedin_post", "retirees", [101, 103, "disc-1"]) is None
+
+    def test_expired_entry_is_dropped(self, cache):
+        now = [1000.0]
+        with patch("src.services.warren.semantic_response_cache.time.monotonic", lambda: now[0]):
+            cache.store([1.0, 0.0], "linkedin_post", None, SOURCES, GENERATION)
+            now[0] += 61
+
+            assert cache.lookup([1.0, 0.0], "linkedin_post", None, SOURCES) is None
+
+        stats = cache.get_stats()
+        assert stats["stale"] == 1
+        assert stats["entries"] == 0
+
+    def test_compliance_rule_change_invalidates_cache(self, cache, result_cache):
+        cache.store([1.0, 0.0], "linkedin_post", None, SOURCES, GENERATION)
+        result_cache.bump_version(COMPLIANCE_RULES)
+
+        assert cache.lookup([1.0, 0.0], "linkedin_post", None, SOURCES) is None
+        assert cache.get_stats()["stale"] == 1
+
+    def test_least_recently_used_entry_is_evicted(self, cache):
+        cache.store([1.0, 0.0], "linkedin_post", None, [1], {"content": "a"})
+        cache.store([1.0, 0.0], "linkedin_post", None, [2], {"content": "b"})
+        cache.lookup([1.0, 0.0], "linkedin_post", None, [1])
+        cache.store([1.0, 0.0], "linkedin_post", None, [3], {"content": "c"})
+
+        assert cache.lookup([1.0, 0.0], "linkedin_post", None, [2]) is None
+        assert cache.lookup([1.0, 0.0], "linkedin_post", None, [1]) is not None
+
+    def test_disabled_cache_never_hits(self, result_cache):
+        cache = SemanticResponseCache()
+        cache.store([1.0, 0.0], "linkedin_post", None, SOURCES, GENERATION)
+
+        assert cache.lookup([1.0, 0.0], "linkedin_post", None, SOURCES) is None
+
+
+class TestOrchestratorResponseCache:
+    """Response cache in front of the strategy layer of ContentGenerationOrchestrator."""
+
+    @pytest.fixture
+    def search_orchestrator(self):
+        mock = AsyncMock()
+        mock.embed_query.side_effect = lambda text: {
+            "LinkedIn post about Roth IRA conversions for retirees": [1.0, 0.0],
+            "LinkedIn post on Roth IRA conversions for retirees": [0.99, 0.05],
+            "LinkedIn post about market volatility": [0.0, 1.0]
+        }[text]
+        mock.execute_search_with_fallback.side_effect = lambda *args: {
+            "marketing_examples": [{"id": 101}],
+            "disclaimers": [{"id": "disc-1"}],
+            "vector_available": True,
+            "search_strategy": "vector"
+        }
+        return mock
+
+    @pytest.fixture
+    def strategy(self):
+        generation_result = GenerationResult()
+        generation_result.success = True
+        generation_result.content = "Generated content"
+        generation_result.strategy_used = "advanced"
+        strategy = AsyncMock()
+        strategy.generate_content.return_value = generation_result
+        strategy.get_strategy_name = Mock(return_value="advanced")
+        return strategy
+
+    @pytest.fixture
+    def orchestrator(self, search_orchestrator, strategy, cache):
+        conversation_service = AsyncMock()
+        conversation_service.get_session_context.return_value = {"conversation_context": "", "session_documents": []}
+
+        quality_assessor = Mock()
+        quality_assessor.assess_context_quality.return_value = {"sufficient": True, "score": 0.8, "reason": "sufficient_quality"}
+
+        strategy_factory = Mock()
+        strategy_factory.get_strategy.return_value = strategy
+
+        return ContentGenerationOrchestrator(
+            search_orchestrator=search_orchestrator,
+            conversation_service=conversation_service,
+            quality_assessor=quality_assessor,
+            prompt_service=AsyncMock(),
+            strategy_factory=strategy_factory,
+            retrieval_memo=SessionRetrievalMemo(enabled=False),
+            response_cache=cache
+        )
+
+    async def _generate(self, orchestrator, user_request, **kwargs):
+        return await orchestrator.generate_content_with_enhanced_context(
+            user_request=user_request,
+            content_type="linkedin_post",
+            audience_type="retirees",
+            **kwargs
+        )
+
+    @pytest.mark.asyncio
+    async def test_repeat_request_skips_generation(self, orchestrator, strategy):
+        first = await self._generate(orchestrator, "LinkedIn post about Roth IRA conversions for retirees")
+        second = await self._generate(orchestrator, "LinkedIn post on Roth IRA conversions for retirees")
+
+        assert strategy.generate_content.await_count == 1
+        assert second["content"] == first["content"] == "Generated content"
+        assert first["metadata"]["response_cache_hit"] is False
+        assert second["metadata"]["response_cache_hit"] is True
+
+    @pytest.mark.asyncio
+    async def test_different_request_generates(self, orchestrator, strategy):
+        await self._generate(orchestrator, "LinkedIn post about Roth IRA conversions for retirees")
+        await self._generate(orchestrator, "LinkedIn post about market volatility")
+
+        assert strategy.generate_content.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_refinements_bypass_the_cache(self, orchestrator, strategy, search_orchestrator):
+        for _ in range(2):
+            await self._generate(
+                orchestrator, "LinkedIn post about Roth IRA conversions for retirees",
+                current_content="Draft", is_refinement=True
+            )
+
+        assert strategy.generate_content.await_count == 2
+        search_orchestrator.embed_query.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_uploaded_documents_bypass_the_cache(self, orchestrator, strategy):
+        for _ in range(2):
+            await self._generate(
+                orchestrator, "LinkedIn post about Roth IRA conversions for retirees",
+                session_documents=[{"title": "Firm brochure"}]
+            )
+
+        assert strategy.generate_content.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_conversation_context_bypasses_the_cache(self, orchestrator, strategy, search_orchestrator):
+        await self._generate(orchestrator, "LinkedIn post about Roth IRA conversions for retirees")
+
+        # Same request, but as a follow-up turn in a different session's conversation
+        orchestrator.conversation_service.get_session_context.return_value = {
+            "conversation_context": "user: My clients are all doctors in their 40s",
+            "session_documents": []
+        }
+        result = await self._generate(
+            orchestrator, "LinkedIn post about Roth IRA conversions for retirees", session_id="session-b"
+        )
+
+        assert strategy.generate_content.await_count == 2
+        assert result["metadata"]["response_cache_hit"] is False
+        assert search_orchestrator.embed_query.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_streamed_repeat_is_served_from_cache(self, orchestrator, strategy):
+        await self._generate(orchestrator, "LinkedIn post about Roth IRA conversions for retirees")
+
+        events = [event async for event in orchestrator.stream_content_with_enhanced_context(
+            user_request="LinkedIn post on Roth IRA conversions for retirees",
+            content_type="linkedin_post",
+            audience_type="retirees"
+        )]
+
+        assert [event["event"] for event in events] == ["retrieval_complete", "token", "complete"]
+        assert events[1]["text"] == "Generated content"
+        assert events[-1]["response"]["metadata"]["response_cache_hit"] is True
@@ -0,0 +1,211 @@
+"""
+Tests for SessionRetrievalMemo
+
+Test Coverage:
+- Reuse decision (similarity threshold, content/audience type match)
+- Expiry (TTL, marketing/compliance data changes) and LRU session cap
+- Orchestrator integration (reuse on refinement turns, re-query on drift)
+"""
+
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+
+from src.services.search_result_cache import SearchResultCache, MARKETING_CONTENT
+from src.services.warren.session_retrieval_memo import SessionRetrievalMemo
+from src.services.warren.content_generation_orchestrator import ContentGenerationOrchestrator
+from src.services.warren.strategies.content_generation_strategy import GenerationResult
+
+
+CONTEXT = {
+    "marketing_examples": [{"id": "ex1"}],
+    "disclaimers": [{"id": "disc1"}],
+    "vector_available": True,
+    "search_strategy": "vector",
+    "fallback_used": False
+}
+
+
+@pytest.fixture
+def result_cache():
+    """Isolated version counters for memo invalidation."""
+    cache = SearchResultCache()
+    with patch("src.services.warren.session_retrieval_memo.search_result_cache", cache):
+        yield cache
+
+
+@pytest.fixture
+def memo(result_cache):
+    return SessionRetrievalMemo(similarity_threshold=0.9, ttl_seconds=60, max_sessions=2)
+
+
+class TestSessionRetrievalMemo:
+    """Test suite for SessionRetrievalMemo."""
+
+    def test_similar_query_reuses_context(self, memo):
+        memo.store("s1", [1.0, 0.0], "linkedin_post", "retail", CONTEXT)
+
+        reused = memo.lookup("s1", [0.99, 0.1], "linkedin_post", "retail")
+
+        assert reused is not None
+        context, similarity = reused
+        assert context == CONTEXT
+        assert similarity > 0.9
+        assert memo.get_stats()["reused"] == 1
+
+    def test_reused_context_is_a_copy(self, memo):
+        memo.store("s1", [1.0, 0.0], "linkedin_post", None, CONTEXT)
+
+        context, _ = memo.lookup("s1", [1.0, 0.0], "linkedin_post")
+        context["conversation_context"] = "turn 2"
+        context["marketing_examples"].append({"id": "ex9"})
+
+        context, _ = memo.lookup("s1", [1.0, 0.0], "linkedin_post")
+        assert "conversation_context" not in context
+        assert context["marketing_examples"] == [{"id": "ex1"}]
+
+    def test_drifted_query_is_not_reused(self, memo):
+        memo.store("s1", [1.0, 0.0], "linkedin_post", None, CONTEXT)
+
+        assert memo.lookup("s1", [0.5, 0.5], "linkedin_post") is None
+        assert memo.get_stats()["drifted"] == 1
+
+    def test_content_or_audience_change_is_not_reused(self, memo):
+        memo.store("s1", [1.0, 0.0], "linkedin_post", "retail", CONTEXT)
+
+        assert memo.lookup("s1", [1.0, 0.0], "newsletter", "retail") is None
+        assert memo.lookup("s1", [1.0, 0.0], "linkedin_post", "high_net_worth") is None
+        assert memo.get_stats()["mismatched"] == 2
+
+    def test_sessions_are_isolated(self, memo):
+        memo.store("s1", [1.0, 0.0], "linkedin_post", None, CONTEXT)
+
+        assert memo.lookup("s2", [1.0, 0.0], "linkedin_post") is None
+        assert memo.lookup(None, [1.0, 0.0], "linkedin_post") is None
+
+    def test_missing_embedding_is_ignored(self, memo):
+        memo.store("s1", None, "linkedin_post", None, CONTEXT)
+
+        assert memo.get_stats()["sessions"] == 0
+        assert memo.lookup("s1", None, "linkedin_post") is None
+
+    def test_expired_entry_is_dropped(self, memo):
+        now = [1000.0]
+        with patch("src.services.warren.session_retrieval_memo.time.monotonic", lambda: now[0]):
+            memo.store("s1", [1.0, 0.0], "linkedin_post", None, CONTEXT)
+            now[0] += 61
+
+            assert memo.lookup("s1", [1.0, 0.0], "linkedin_post") is None
+
+        stats = memo.get_stats()
+        assert stats["stale"] == 1
+        assert stats["sessions"] == 0
+
+    def test_content_change_invalidates_entry(self, memo, result_cache):
+        memo.store("s1", [1.0, 0.0], "linkedin_post", None, CONTEXT)
+        result_cache.bump_version(MARKETING_CONTENT)
+
+        assert memo.lookup("s1", [1.0, 0.0], "linkedin_post") is None
+        assert memo.get_stats()["stale"] == 1
+
+    def test_least_recently_used_session_is_evicted(self, memo):
+        memo.store("s1", [1.0, 0.0], "linkedin_post", None, CONTEXT)
+        memo.store("s2", [1.0, 0.0], "linkedin_post", None, CONTEXT)
+        memo.lookup("s1", [1.0, 0.0], "linkedin_post")
+        memo.store("s3", [1.0, 0.0], "linkedin_post", None, CONTEXT)
+
+        assert memo.lookup("s2", [1.0, 0.0], "linkedin_post") is None
+        assert memo.lookup("s1", [1.0, 0.0], "linkedin_post") is not None
+
+    def test_disabled_memo_never_reuses(self, result_cache):
+        memo = SessionRetrievalMemo(enabled=False)
+        memo.store("s1", [1.0, 0.0], "linkedin_post", None, CONTEXT)
+
+        assert memo.lookup("s1", [1.0, 0.0], "linkedin_post") is None
+
+
+class TestOrchestratorRetrievalReuse:
+    """Retrieval reuse across turns of a ContentGenerationOrchestrator session."""
+
+    @pytest.fixture
+    def search_orchestrator(self):
+        mock = AsyncMock()
+        mock.embed_query.side_effect = lambda text: {
+            "retirement post": [1.0, 0.0],
+            "retirement post, shorter": [0.98, 0.05],
+            "crypto volatility post": [0.0, 1.0]
+        }[text]
+        mock.execute_search_with_fallback.side_effect = lambda *args: dict(CONTEXT)
+        return mock
+
+    @pytest.fixture
+    def orchestrator(self, search_orchestrator, memo):
+        conversation_service = AsyncMock()
+        conversation_service.get_session_context.return_value = {"conversation_context": "", "session_documents": []}
+
+        quality_assessor = Mock()
+        quality_assessor.assess_context_quality.return_value = {"sufficient": True, "score": 0.8, "reason": "sufficient_quality"}
+
+        generation_result = GenerationResult()
+        generation_result.success = True
+        generation_result.content = "Generated content"
+        generation_result.strategy_used = "advanced"
+        strategy = AsyncMock()
+        strategy.generate_content.return_value = generation_result
+        strategy.get_strategy_name = Mock(return_value="advanced")
+        strategy_factory = Mock()
+        strategy_factory.get_strategy.return_value = strategy
+
+        return ContentGenerationOrchestrator(
+            search_orchestrator=search_orchestrator,
+            conversation_service=conversation_service,
+            quality_assessor=quality_assessor,
+            prompt_service=AsyncMock(),
+            strategy_factory=strategy_factory,
+            retrieval_memo=memo
+        )
+
+    async def _turn(self, orchestrator, user_request, session_id="session-1"):
+        return await orchestrator.generate_content_with_enhanced_context(
+            user_request=user_request,
+            content_type="linkedin_post",
+            session_id=session_id,
+            is_refinement=True
+        )
+
+    @pytest.mark.asyncio
+    async def test_refinement_turn_reuses_retrieval(self, orchestrator, search_orchestrator):
+        first = await self._turn(orchestrator, "retirement post")
+        second = await self._turn(orchestrator, "retirement post, shorter")
+
+        assert search_orchestrator.execute_search_with_fallback.await_count == 1
+        assert first["metadata"]["search_details"]["retrieval_reused"] is False
+        assert second["metadata"]["search_details"]["retrieval_reused"] is True
+        assert second["marketing_examples_count"] == 1
+
+    @pytest.mark.asyncio
+    async def test_drifted_turn_searches_again(self, orchestrator, search_orchestrator):
+        await self._turn(orchestrator, "retirement post")
+        result = await self._turn(orchestrator, "crypto volatility post")
+
+        assert search_orchestrator.execute_search_with_fallback.await_count == 2
+        assert result["metadata"]["search_details"]["retrieval_reused"] is False
+
+    @pytest.mark.asyncio
+    async def test_failed_retrieval_is_not_remembered(self, orchestrator, search_orchestrator):
+        search_orchestrator.execute_search_with_fallback.side_effect = lambda *args: {
+            "marketing_examples": [], "disclaimers": [], "vector_available": False, "error": "db down"
+        }
+        await self._turn(orchestrator, "retirement post")
+        search_orchestrator.execute_search_with_fallback.side_effect = lambda *args: dict(CONTEXT)
+        await self._turn(orchestrator, "retirement post")
+
+        assert search_orchestrator.execute_search_with_fallback.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_without_session_nothing_is_embedded(self, orchestrator, search_orchestrator):
+        await orchestrator.generate_content_with_enhanced_context(
+            user_request="retirement post",
+            content_type="linkedin_post"
+        )
+
+        search_orchestrator.embed_query.assert_not_called()